@@ -3,127 +3,322 @@ YC AI Healthtech Startup Tracker - Data Analyzer
 Analyzes scraped startup data to identify trends and patterns
 """
 
+import json
+from itertools import combinations
 import pandas as pd
-import matplotlib.pyplot as plt
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import seaborn as sns
 from collections import Counter
 import os
 
+from healthtech_shared.charts import ChartRenderer
+
+from startup_store import StartupStore, batch_dimension, parse_batch
+
+
+def _tag_pairs(tags):
+    """Unordered pairs of distinct tags on one startup"""
+    return combinations(sorted(set(tags)), 2)
+
+
+def draw_batch_distribution(fig, batch_counts):
+    """Draw startups per YC batch"""
+    ax = fig.subplots()
+    batch_counts.plot(kind='bar', color='skyblue', ax=ax)
+    ax.set_title('YC AI Healthtech Startups by Batch', fontsize=14, fontweight='bold')
+    ax.set_xlabel('YC Batch')
+    ax.set_ylabel('Number of Startups')
+    ax.tick_params(axis='x', rotation=45)
+
+
+def draw_tag_distribution(fig, top_tags):
+    """Draw the most common healthcare tags"""
+    ax = fig.subplots()
+    ax.barh(list(top_tags.keys()), list(top_tags.values()), color='coral')
+    ax.set_title('Most Common Tags in AI Healthtech Startups', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Number of Startups')
+    ax.set_ylabel('Tag')
+
+
+def draw_tag_cooccurrence(fig, matrix):
+    """Draw the tag co-occurrence heatmap"""
+    ax = fig.subplots()
+    sns.heatmap(matrix, annot=True, fmt='d', cmap='Blues', ax=ax)
+    ax.set_title('Tag Co-occurrence in AI Healthtech Startups', fontsize=14, fontweight='bold')
+
+
+def draw_growth_trends(fig, yearly_counts):
+    """Draw healthcare startups per year"""
+    ax = fig.subplots()
+    yearly_counts.plot(kind='line', marker='o', color='green', linewidth=2, ax=ax)
+    ax.set_title('AI Healthtech Startup Growth Over Time', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Number of Startups')
+    ax.grid(True, alpha=0.3)
+
 
 class StartupAnalyzer:
     """Analyzer for YC startup data"""
 
-    def __init__(self, data_file='data/yc_startups.csv'):
-        """Initialize analyzer with data file"""
+    def __init__(self, data_file='data/yc_startups.db', renderer=None):
+        """
+        Initialize analyzer with data file
+
+        Nothing beyond the row count is read here; each analysis loads the
+        columns or counts it needs on first use.
+
+        Args:
+            data_file: Startup store written by scraper.py, a Parquet export
+                (--export), or a legacy CSV export
+            renderer: ChartRenderer for the charts (defaults to visualizations/)
+        """
         self.data_file = data_file
-        self.df = None
+        self.renderer = renderer or ChartRenderer('visualizations')
+        self.store = None
+        self.parquet = None
+        self.total = 0
+        self._columns = {}
+        self._counts = {}
         self.load_data()
 
     def load_data(self):
-        """Load startup data from CSV"""
-        try:
-            self.df = pd.read_csv(self.data_file)
-            print(f"Loaded {len(self.df)} startups from {self.data_file}")
-        except FileNotFoundError:
+        """Open the startup store or Parquet export"""
+        if not os.path.exists(self.data_file):
             print(f"Data file {self.data_file} not found. Run scraper.py first.")
-            self.df = pd.DataFrame()
+            return
+
+        if self.data_file.endswith('.parquet'):
+            self.parquet = pq.ParquetFile(self.data_file)
+            self.total = self.parquet.metadata.num_rows
+        else:
+            if self.data_file.endswith('.csv'):
+                self.store = StartupStore(':memory:')
+                self.store.import_csv(self.data_file)
+            else:
+                self.store = StartupStore(self.data_file)
+            self.total = len(self.store)
+
+        print(f"Loaded {self.total} startups from {self.data_file}")
+
+    def column(self, name):
+        """One column, read on first use and cached (tags as lists, year and season derived at ingest)"""
+        if name not in self._columns:
+            if self.parquet is not None:
+                self._columns[name] = self.parquet.read(columns=[name]).column(0).to_pandas()
+            else:
+                self._columns[name] = self.store.load([name])[name]
+        return self._columns[name]
+
+    @property
+    def batch_counts(self):
+        """Counter of startups per batch"""
+        return self._count('batches')
+
+    @property
+    def tag_counts(self):
+        """Counter of startups per tag"""
+        return self._count('tags')
+
+    @property
+    def tag_pair_counts(self):
+        """Counter of startups per (tag, tag) pair"""
+        return self._count('pairs')
+
+    def _count(self, kind):
+        if kind not in self._counts:
+            if self.store is not None:
+                self.refresh()
+            elif self.parquet is None:
+                self._counts[kind] = Counter()
+            elif kind == 'batches':
+                self._counts[kind] = Counter(self.column('batch').dropna().value_counts().to_dict())
+            elif kind == 'tags':
+                # Count the flattened Arrow list column without building per-row Python lists
+                tags = pc.list_flatten(self.parquet.read(columns=['tags']).column(0))
+                counts = pc.value_counts(tags)
+                self._counts[kind] = Counter(dict(zip(
+                    counts.field('values').to_pylist(), counts.field('counts').to_pylist()
+                )))
+            else:
+                self._counts[kind] = Counter(pair for tags in self.column('tags') for pair in _tag_pairs(tags))
+        return self._counts[kind]
+
+    def refresh(self):
+        """
+        Apply store changes logged since the last analysis to the batch, tag and tag pair counts
+
+        The counts and the last applied revision are kept in the store, so a
+        run only reads the changes made by scrapes since the previous run.
+        Tags are decoded only for the startups whose tags changed.
+
+        Returns:
+            Number of change records applied
+        """
+        empty = {'revision': 0, 'batches': {}, 'tags': {}, 'pairs': []}
+        state = self.store.get_state('analyzer', empty)
+        if state['revision'] > self.store.revision or 'pairs' not in state:
+            # Store was rebuilt or the state predates pair counts; start over
+            state = empty
+
+        batch_counts = Counter(state['batches'])
+        tag_counts = Counter(state['tags'])
+        pair_counts = Counter({(a, b): count for a, b, count in state['pairs']})
+        changes = self.store.changes(state['revision'])
+
+        for field, old, new in changes[['field', 'old_value', 'new_value']].itertuples(index=False):
+            if field == 'batch':
+                if old is not None:
+                    batch_counts[old] -= 1
+                if new is not None:
+                    batch_counts[new] += 1
+            elif field == 'tags':
+                old, new = json.loads(old or '[]'), json.loads(new or '[]')
+                tag_counts.subtract(old)
+                tag_counts.update(new)
+                pair_counts.subtract(_tag_pairs(old))
+                pair_counts.update(_tag_pairs(new))
+
+        # Unary + drops batches, tags and pairs no startup has any more
+        self._counts = {'batches': +batch_counts, 'tags': +tag_counts, 'pairs': +pair_counts}
+        self.total = len(self.store)
+
+        self.store.set_state('analyzer', {
+            'revision': self.store.revision,
+            'batches': dict(self._counts['batches']),
+            'tags': dict(self._counts['tags']),
+            'pairs': [[a, b, count] for (a, b), count in self._counts['pairs'].items()]
+        })
+        return len(changes)
+
+    def batch_table(self):
+        """Startups per batch joined to the batch dimension (year, season, ordinal), in chronological order"""
+        counts = pd.Series(self.batch_counts, name='startups', dtype=int).rename_axis('code').reset_index()
+        if self.store is not None:
+            dimension = self.store.batch_dimension()
+        else:
+            dimension = batch_dimension(self.batch_counts)
+        return dimension.merge(counts, on='code').sort_values('ordinal', ignore_index=True)
+
+    def yearly_counts(self):
+        """Startups per batch year"""
+        return self.batch_table().groupby('year')['startups'].sum().rename(None)
+
+    def startups_in_batches(self, first=None, last=None, columns=('name', 'batch', 'description')):
+        """Startups from first to last batch inclusive, filtered on the integer batch ordinal"""
+        if self.store is not None:
+            return self.store.in_batches(first, last, list(columns))
+
+        filters = []
+        for code, op in ((first, '>='), (last, '<=')):
+            if code:
+                ordinal = parse_batch(code)[2]
+                if ordinal is None:
+                    raise ValueError(f"Unrecognized batch code {code!r}")
+                filters.append(('batch_ordinal', op, ordinal))
+        table = pq.read_table(self.data_file, columns=list(columns) + ['batch_ordinal'], filters=filters or None)
+        return table.to_pandas().sort_values('batch_ordinal', kind='stable')[list(columns)].reset_index(drop=True)
+
+    def sample(self, columns=('name', 'batch', 'description'), n=10):
+        """First n startups, reading only the given columns"""
+        if self.parquet is not None:
+            batch = next(self.parquet.iter_batches(batch_size=n, columns=list(columns)), None)
+            return batch.to_pandas() if batch is not None else pd.DataFrame(columns=list(columns))
+        return self.store.load(list(columns), limit=n)
+
+    def tag_cooccurrence(self, top_n=15):
+        """
+        Co-occurrence matrix of the most common tags
+
+        The diagonal holds each tag's count; off-diagonal cells hold the
+        number of startups carrying both tags.
+        """
+        tags = [tag for tag, _ in self.tag_counts.most_common(top_n)]
+        matrix = pd.DataFrame(0, index=tags, columns=tags)
+        for tag in tags:
+            matrix.loc[tag, tag] = self.tag_counts[tag]
+        for (a, b), count in self.tag_pair_counts.items():
+            if a in matrix.index and b in matrix.index:
+                matrix.loc[a, b] = matrix.loc[b, a] = count
+        return matrix
+
+    def startups_with_tags(self, *tags, columns=('name', 'batch', 'description', 'tags')):
+        """Startups carrying every given tag, from the store's tag index"""
+        if self.parquet is not None:
+            required = set(tags)
+            mask = self.column('tags').map(lambda startup_tags: required <= set(startup_tags))
+            return pd.DataFrame({column: self.column(column)[mask] for column in columns}).reset_index(drop=True)
+        return self.store.with_tags(tags, list(columns))
 
     def analyze_batch_distribution(self):
         """Analyze distribution of startups by batch"""
-        if self.df.empty:
+        if not self.batch_counts:
             return
 
-        batch_counts = self.df['batch'].value_counts()
+        batch_counts = pd.Series(dict(self.batch_counts.most_common()), name='count')
         print("\n=== Batch Distribution ===")
         print(batch_counts)
 
-        plt.figure(figsize=(12, 6))
-        batch_counts.plot(kind='bar', color='skyblue')
-        plt.title('YC AI Healthtech Startups by Batch', fontsize=14, fontweight='bold')
-        plt.xlabel('YC Batch')
-        plt.ylabel('Number of Startups')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig('visualizations/batch_distribution.png', dpi=300)
-        print("Saved visualization: visualizations/batch_distribution.png")
+        self.renderer.add('batch_distribution.png', draw_batch_distribution, batch_counts)
 
     def analyze_tags(self):
         """Analyze most common tags/categories"""
-        if self.df.empty:
+        if not self.tag_counts:
             return
 
-        # Flatten all tags
-        all_tags = []
-        for tags in self.df['tags'].dropna():
-            if isinstance(tags, str):
-                all_tags.extend(eval(tags))  # Convert string list to actual list
-
-        tag_counts = Counter(all_tags)
-        top_tags = dict(tag_counts.most_common(15))
+        top_tags = dict(self.tag_counts.most_common(15))
 
         print("\n=== Top 15 Tags ===")
         for tag, count in top_tags.items():
             print(f"{tag}: {count}")
 
-        plt.figure(figsize=(12, 8))
-        plt.barh(list(top_tags.keys()), list(top_tags.values()), color='coral')
-        plt.title('Most Common Tags in AI Healthtech Startups', fontsize=14, fontweight='bold')
-        plt.xlabel('Number of Startups')
-        plt.ylabel('Tag')
-        plt.tight_layout()
-        plt.savefig('visualizations/tag_distribution.png', dpi=300)
-        print("Saved visualization: visualizations/tag_distribution.png")
+        self.renderer.add('tag_distribution.png', draw_tag_distribution, top_tags, figsize=(12, 8))
+
+        print("\n=== Top 10 Tag Pairs ===")
+        for (a, b), count in self.tag_pair_counts.most_common(10):
+            print(f"{a} + {b}: {count}")
+
+        self.renderer.add('tag_cooccurrence.png', draw_tag_cooccurrence, self.tag_cooccurrence(15), figsize=(12, 10))
 
     def analyze_growth_trends(self):
         """Analyze growth trends over time"""
-        if self.df.empty:
+        # Years come from the batch dimension, not from re-parsing batch codes
+        yearly_counts = self.yearly_counts()
+        if yearly_counts.empty:
             return
 
-        # Extract year and season from batch
-        self.df['year'] = self.df['batch'].str.extract(r'(\d+)').astype(int) + 2000
-        self.df['season'] = self.df['batch'].str[0]
-
-        yearly_counts = self.df.groupby('year').size()
-
         print("\n=== Yearly Growth ===")
         print(yearly_counts)
 
-        plt.figure(figsize=(12, 6))
-        yearly_counts.plot(kind='line', marker='o', color='green', linewidth=2)
-        plt.title('AI Healthtech Startup Growth Over Time', fontsize=14, fontweight='bold')
-        plt.xlabel('Year')
-        plt.ylabel('Number of Startups')
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig('visualizations/growth_trends.png', dpi=300)
-        print("Saved visualization: visualizations/growth_trends.png")
+        self.renderer.add('growth_trends.png', draw_growth_trends, yearly_counts)
 
     def generate_summary_stats(self):
         """Generate summary statistics"""
-        if self.df.empty:
+        if not self.total:
             return
 
         print("\n=== Summary Statistics ===")
-        print(f"Total Startups: {len(self.df)}")
-        print(f"Earliest Batch: {self.df['batch'].min()}")
-        print(f"Latest Batch: {self.df['batch'].max()}")
+        print(f"Total Startups: {self.total}")
+        # Chronological, not lexicographic: 'S24' is later than 'W23'
+        batches = self.batch_table()
+        print(f"Earliest Batch: {batches['code'].iloc[0] if len(batches) else None}")
+        print(f"Latest Batch: {batches['code'].iloc[-1] if len(batches) else None}")
         print(f"\nSample Startups:")
-        print(self.df[['name', 'batch', 'description']].head(10))
+        print(self.sample())
 
     def run_full_analysis(self):
         """Run complete analysis pipeline"""
-        if self.df.empty:
+        if not self.total:
             print("No data available for analysis")
             return
 
-        # Create visualizations directory
-        os.makedirs('visualizations', exist_ok=True)
-
         print("Running full analysis...")
         self.generate_summary_stats()
-        self.analyze_batch_distribution()
-        self.analyze_tags()
-        self.analyze_growth_trends()
+        # Charts are rendered together, in parallel, once every analysis has run
+        with self.renderer.batch():
+            self.analyze_batch_distribution()
+            self.analyze_tags()
+            self.analyze_growth_trends()
         print("\nAnalysis complete! Check the visualizations folder.")
 
 
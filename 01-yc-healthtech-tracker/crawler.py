@@ -0,0 +1,227 @@
+"""
+YC AI Healthtech Startup Tracker - Async Crawler
+Shared-session HTTP fetching with per-host rate limits, concurrency caps and retries
+"""
+
+import asyncio
+import random
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import aiohttp
+
+
+# Responses worth retrying: rate limited or a transient server error
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` requests per second with bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity=None, min_rate=0.1):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def throttle(self, factor=0.5):
+        """Cut the rate after the host pushed back (429) and drop saved-up tokens"""
+        self.rate = max(self.min_rate, self.rate * factor)
+        self.tokens = min(self.tokens, 0.0)
+
+    def recover(self, fraction=0.05):
+        """Step the rate back toward its configured maximum after a success"""
+        self.rate = min(self.max_rate, self.rate + self.max_rate * fraction)
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CrawlStats:
+    """Counters describing a crawl"""
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.cache_hits = 0
+        self.not_modified = 0
+        self.failures = 0
+        self.bytes = 0
+        self.by_host = defaultdict(int)
+        self.started = time.monotonic()
+
+    def to_dict(self):
+        """Return the stats as plain Python types"""
+        elapsed = time.monotonic() - self.started
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'cache_hits': self.cache_hits,
+            'not_modified': self.not_modified,
+            'failures': self.failures,
+            'bytes': self.bytes,
+            'by_host': dict(self.by_host),
+            'elapsed_seconds': elapsed,
+            'requests_per_second': self.requests / elapsed if elapsed else 0.0
+        }
+
+
+class AsyncCrawler:
+    """Polite concurrent fetcher sharing one connection pool"""
+
+    def __init__(
+        self,
+        headers=None,
+        max_connections=20,
+        per_host_concurrency=4,
+        rate=5.0,
+        burst=None,
+        retries=3,
+        backoff=0.5,
+        max_backoff=30.0,
+        timeout=30.0,
+        cache=None
+    ):
+        """
+        Initialize the crawler
+
+        Args:
+            headers: Headers sent with every request
+            max_connections: Connection pool size across all hosts
+            per_host_concurrency: Requests in flight to any one host
+            rate: Requests per second allowed to any one host
+            burst: Token-bucket capacity per host (defaults to the rate)
+            retries: Retries per request after the first attempt
+            backoff: Base delay in seconds for exponential backoff
+            max_backoff: Cap on a single backoff delay
+            timeout: Total timeout per attempt in seconds
+            cache: Optional HTTPCache; fresh entries skip the network, stale
+                ones are revalidated with conditional requests
+        """
+        self.headers = headers or {}
+        self.max_connections = max_connections
+        self.per_host_concurrency = per_host_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.cache = cache
+
+        self.stats = CrawlStats()
+        self._session = None
+        self._buckets = {}
+        self._semaphores = {}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host_concurrency)
+        self._session = aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=self.timeout)
+        self.stats = CrawlStats()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+        self._session = None
+
+    def _host_limits(self, url):
+        """Token bucket and concurrency semaphore for a URL's host"""
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+            self._semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return host, self._buckets[host], self._semaphores[host]
+
+    def _backoff_delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry `attempt` (1-based), honoring Retry-After"""
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def fetch(self, url, params=None):
+        """
+        GET a URL and return its body as text
+
+        Retries connection errors, timeouts, 429 and 5xx responses with
+        exponential backoff; other HTTP errors are raised immediately. A 429
+        also halves the host's request rate, which then recovers gradually.
+
+        With a cache, fresh entries are returned without a request and
+        stale ones are revalidated; a 304 returns the cached body.
+
+        Raises:
+            aiohttp.ClientError: If the request still fails after all retries
+            CacheMiss: If the cache is offline and the URL is not cached
+        """
+        entry, headers = None, None
+        if self.cache is not None:
+            entry, fresh = self.cache.lookup(url, params)
+            if fresh:
+                self.stats.cache_hits += 1
+                return entry.text
+            headers = self.cache.conditional_headers(entry)
+
+        host, bucket, semaphore = self._host_limits(url)
+
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            async with semaphore:
+                await bucket.acquire()
+                self.stats.requests += 1
+                self.stats.by_host[host] += 1
+                try:
+                    async with self._session.get(url, params=params, headers=headers) as response:
+                        if response.status == 304 and entry is not None:
+                            self.stats.not_modified += 1
+                            bucket.recover()
+                            return self.cache.revalidated(entry, response.headers).text
+                        if response.status not in RETRY_STATUSES:
+                            response.raise_for_status()
+                            body = await response.read()
+                            self.stats.bytes += len(body)
+                            bucket.recover()
+                            if self.cache is not None:
+                                self.cache.store(url, params, response.status, response.headers, body)
+                            return body.decode(response.get_encoding() or 'utf-8', errors='replace')
+                        if response.status == 429:
+                            self.stats.throttled += 1
+                            bucket.throttle()
+                        retry_after = response.headers.get('Retry-After')
+                        error = aiohttp.ClientResponseError(
+                            response.request_info, response.history,
+                            status=response.status, message=response.reason
+                        )
+                except aiohttp.ClientResponseError:
+                    self.stats.failures += 1
+                    raise
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = e
+
+            if attempt == self.retries:
+                break
+            self.stats.retries += 1
+            await asyncio.sleep(self._backoff_delay(attempt + 1, retry_after))
+
+        self.stats.failures += 1
+        raise error if isinstance(error, aiohttp.ClientError) else aiohttp.ServerTimeoutError(str(error))
@@ -0,0 +1,94 @@
+"""
+YC AI Healthtech Startup Tracker - Extraction Benchmark
+Pages/sec for startup card extraction over saved HTML fixtures, before and after
+"""
+
+import argparse
+import glob
+import os
+
+from bs4 import BeautifulSoup
+
+from healthtech_shared.extraction import HAS_LXML, CardExtractor, benchmark
+
+from fixture_server import build_directory, render_page
+from scraper import STARTUP_CARD, STARTUP_FIELDS
+
+
+def save_fixtures(fixture_dir='fixtures/html', num_pages=200, page_size=20):
+    """
+    Write directory pages to disk if they are not there yet
+
+    Returns:
+        Sorted list of fixture file paths
+    """
+    os.makedirs(fixture_dir, exist_ok=True)
+    paths = sorted(glob.glob(os.path.join(fixture_dir, 'page_*.html')))
+    if len(paths) >= num_pages:
+        return paths[:num_pages]
+
+    directory = build_directory(num_pages * page_size)
+    for page in range(num_pages):
+        path = os.path.join(fixture_dir, f'page_{page + 1:04d}.html')
+        with open(path, 'w') as f:
+            f.write(render_page(directory[page * page_size:(page + 1) * page_size]))
+
+    return sorted(glob.glob(os.path.join(fixture_dir, 'page_*.html')))[:num_pages]
+
+
+def legacy_extract(html):
+    """The original extraction: html.parser and two find() calls per field"""
+    soup = BeautifulSoup(html, 'html.parser')
+    startups = []
+    for card in soup.find_all('div', class_='startup-card'):
+        startups.append({
+            'name': card.find('h3').text.strip() if card.find('h3') else None,
+            'description': card.find('p', class_='description').text.strip() if card.find('p', class_='description') else None,
+            'batch': card.find('span', class_='batch').text.strip() if card.find('span', class_='batch') else None,
+            'tags': [tag.text.strip() for tag in card.find_all('span', class_='tag')],
+            'website': card.find('a', class_='website')['href'] if card.find('a', class_='website') else None
+        })
+    return startups
+
+
+def run(fixture_dir='fixtures/html', num_pages=200, workers=4, repeats=3):
+    """Benchmark every extraction path over the same fixture pages"""
+    pages = []
+    for path in save_fixtures(fixture_dir, num_pages):
+        with open(path) as f:
+            pages.append(f.read())
+
+    cases = {
+        'legacy (html.parser, 2x find)': lambda p: [legacy_extract(html) for html in p],
+        'bs4 single lookup': CardExtractor(STARTUP_CARD, STARTUP_FIELDS, 'bs4').extract_many
+    }
+    if HAS_LXML:
+        lxml_extractor = CardExtractor(STARTUP_CARD, STARTUP_FIELDS, 'lxml')
+        cases['bs4 on lxml parser'] = CardExtractor(STARTUP_CARD, STARTUP_FIELDS, 'bs4-lxml').extract_many
+        cases['lxml compiled selectors'] = lxml_extractor.extract_many
+        if workers:
+            cases[f'lxml x {workers} processes'] = lambda p: lxml_extractor.extract_many(p, workers=workers)
+
+    expected = [legacy_extract(html) for html in pages]
+    for name, extract in cases.items():
+        if extract(pages) != expected:
+            raise AssertionError(f"{name} output differs from the legacy extraction")
+
+    print(f"Extracting {len(pages)} pages ({sum(map(len, expected)):,} startup cards)\n")
+    return benchmark(pages, cases, repeats)
+
+
+def main():
+    """Run the extraction benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Benchmark startup card extraction")
+    parser.add_argument('--fixtures', default='fixtures/html', help="Directory of saved HTML pages")
+    parser.add_argument('--pages', type=int, default=200, help="Pages to extract")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Processes for the pooled case")
+    parser.add_argument('--repeats', type=int, default=3, help="Timed runs per case")
+    args = parser.parse_args()
+
+    run(args.fixtures, args.pages, args.workers, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
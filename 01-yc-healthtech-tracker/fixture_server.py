@@ -0,0 +1,313 @@
+"""
+YC AI Healthtech Startup Tracker - Fixture Directory Server
+Local stand-in for YC's startup directory to measure crawl throughput and politeness offline
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from collections import deque
+
+from aiohttp import web
+
+from scraper import DEFAULT_TAGS, YCStartupScraper, yc_batches
+
+
+EXTRA_TAGS = ['B2B', 'SaaS', 'Biotech', 'Medical Devices', 'Fintech', 'Developer Tools']
+
+
+def build_directory(num_startups=2000, first_year=2015, last_year=2024, seed=42):
+    """
+    Generate a synthetic startup directory
+
+    Returns:
+        List of startup dicts with name, description, batch, tags and website
+    """
+    rng = random.Random(seed)
+    batches = yc_batches(first_year, last_year)
+    tag_pool = DEFAULT_TAGS + EXTRA_TAGS
+
+    directory = []
+    for i in range(num_startups):
+        name = f'Startup {i:05d}'
+        directory.append({
+            'name': name,
+            'description': f'{name} builds software for {rng.choice(["clinics", "payers", "labs", "patients"])}.',
+            'batch': rng.choice(batches),
+            'tags': rng.sample(tag_pool, k=rng.randint(1, 4)),
+            'website': f'https://startup{i:05d}.example.com'
+        })
+    return directory
+
+
+def render_page(startups):
+    """Render startups as directory HTML using the selectors scraper.py expects"""
+    cards = ''.join(
+        '<div class="startup-card">'
+        f'<h3>{s["name"]}</h3>'
+        f'<p class="description">{s["description"]}</p>'
+        f'<span class="batch">{s["batch"]}</span>'
+        + ''.join(f'<span class="tag">{tag}</span>' for tag in s['tags'])
+        + f'<a class="website" href="{s["website"]}">Website</a>'
+        '</div>'
+        for s in startups
+    )
+    return f'<html><body><div class="directory">{cards}</div></body></html>'
+
+
+class FixtureDirectory:
+    """aiohttp app serving a paginated directory, with latency, faults and request logging"""
+
+    def __init__(self, directory, page_size=20, latency_ms=20.0, failure_rate=0.0,
+                 max_rate=None, seed=0):
+        """
+        Args:
+            directory: Startups from build_directory
+            page_size: Startups per page
+            latency_ms: Delay added to every response
+            failure_rate: Fraction of requests answered with a 503
+            max_rate: Requests per second above which the server answers 429 (None = no limit)
+            seed: Random seed for injected failures
+        """
+        self.directory = directory
+        self.page_size = page_size
+        self.latency = latency_ms / 1000
+        self.failure_rate = failure_rate
+        self.max_rate = max_rate
+        self.rng = random.Random(seed)
+
+        self._recent = deque()
+        self.in_flight = 0
+        self.reset()
+
+    def reset(self):
+        """Clear the request log between measured runs"""
+        self.arrivals = []
+        self._recent.clear()
+        self.peak_in_flight = 0
+        self.status_counts = {}
+        self.bytes_sent = 0
+
+    def listing(self, tag=None, batch=None):
+        """Startups matching a tag and batch filter"""
+        return [
+            s for s in self.directory
+            if (tag is None or tag in s['tags']) and (batch is None or s['batch'] == batch)
+        ]
+
+    async def handle(self, request):
+        now = time.monotonic()
+        self.arrivals.append(now)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            status, body = await self._respond(request, now)
+        finally:
+            self.in_flight -= 1
+
+        if status == 200:
+            etag = '"' + hashlib.sha1(body.encode()).hexdigest() + '"'
+            if request.headers.get('If-None-Match') == etag:
+                status = 304
+
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if status == 429:
+            return web.Response(status=status, headers={'Retry-After': '1'})
+        if status == 304:
+            return web.Response(status=status, headers={'ETag': etag})
+        if status != 200:
+            return web.Response(status=status)
+        self.bytes_sent += len(body)
+        return web.Response(text=body, content_type='text/html', headers={'ETag': etag})
+
+    async def _respond(self, request, now):
+        while self._recent and now - self._recent[0] >= 1:
+            self._recent.popleft()
+        self._recent.append(now)
+
+        await asyncio.sleep(self.latency)
+
+        if self.max_rate is not None and len(self._recent) > self.max_rate:
+            return 429, None
+        if self.rng.random() < self.failure_rate:
+            return 503, None
+
+        page = int(request.query.get('page', 1))
+        matches = self.listing(request.query.get('tags'), request.query.get('batch'))
+        start = (page - 1) * self.page_size
+        return 200, render_page(matches[start:start + self.page_size])
+
+    def stats(self):
+        """Politeness summary: peak concurrency, peak 1-second request rate and status counts"""
+        arrivals = sorted(self.arrivals)
+        peak_rate = 0
+        start = 0
+        for end, arrival in enumerate(arrivals):
+            while arrival - arrivals[start] >= 1:
+                start += 1
+            peak_rate = max(peak_rate, end - start + 1)
+
+        return {
+            'requests': len(arrivals),
+            'peak_in_flight': self.peak_in_flight,
+            'peak_requests_per_second': peak_rate,
+            'status_counts': dict(self.status_counts),
+            'bytes_sent': self.bytes_sent
+        }
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get('/companies', self.handle)
+        return app
+
+
+class FixtureServer:
+    """Run a FixtureDirectory on a background thread (usable from synchronous code)"""
+
+    def __init__(self, fixture, host='127.0.0.1', port=0):
+        self.fixture = fixture
+        self.host = host
+        self.port = port
+        self.url = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._runner = None
+
+    async def _start(self):
+        self._runner = web.AppRunner(self.fixture.app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f'http://{self.host}:{port}/companies'
+
+    def __enter__(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def measure(num_startups=2000, batches=None, page_size=20, latency_ms=20.0, failure_rate=0.05,
+            max_rate=None, cache_dir=None, cache_ttl=0, runs=1, **crawler_options):
+    """
+    Crawl a fixture directory and report throughput and politeness
+
+    Args:
+        num_startups: Startups in the synthetic directory
+        batches: Batches to crawl (all fixture batches if None)
+        page_size: Startups per fixture page
+        latency_ms: Fixture response latency
+        failure_rate: Fraction of fixture responses that are 503s
+        max_rate: Fixture 429 threshold in requests per second
+        cache_dir: HTTP cache directory (no cache if None)
+        cache_ttl: Cache TTL; 0 revalidates every page on every run
+        runs: Crawls to run back to back; stats describe the last one
+        **crawler_options: Passed to YCStartupScraper / AsyncCrawler
+
+    Returns:
+        Dict with crawl stats, server-side politeness stats and completeness
+    """
+    from healthtech_shared.http_cache import HTTPCache
+
+    directory = build_directory(num_startups)
+    batches = batches or yc_batches(2015, 2024)
+    fixture = FixtureDirectory(directory, page_size, latency_ms, failure_rate, max_rate)
+    cache = HTTPCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+
+    with FixtureServer(fixture) as server:
+        for _ in range(runs):
+            fixture.reset()
+            scraper = YCStartupScraper(server.url, cache=cache, **crawler_options)
+            scraper.scrape_startups(tags=DEFAULT_TAGS, batch=batches)
+
+    if cache is not None:
+        cache.close()
+
+    expected = {
+        s['name'] for s in directory
+        if s['batch'] in batches and any(tag in s['tags'] for tag in DEFAULT_TAGS)
+    }
+    crawl = scraper.crawl_stats
+    return {
+        'crawl': crawl,
+        'server': fixture.stats(),
+        'startups_scraped': len(scraper.startups),
+        'startups_expected': len(expected),
+        'complete': {s['name'] for s in scraper.startups} == expected,
+        'pages_per_second': crawl['requests'] / crawl['elapsed_seconds']
+    }
+
+
+def main():
+    """Serve the fixture directory or measure a crawl against it"""
+    parser = argparse.ArgumentParser(description="Local fixture for YC's startup directory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help="Serve the fixture directory")
+    serve_parser.add_argument('--port', type=int, default=8765, help="Bind port")
+    serve_parser.add_argument('--startups', type=int, default=2000, help="Startups in the directory")
+    serve_parser.add_argument('--latency-ms', type=float, default=20.0, help="Response latency")
+    serve_parser.add_argument('--failure-rate', type=float, default=0.0, help="Fraction of 503 responses")
+
+    measure_parser = subparsers.add_parser('measure', help="Crawl the fixture and report throughput")
+    measure_parser.add_argument('--startups', type=int, default=2000, help="Startups in the directory")
+    measure_parser.add_argument('--latency-ms', type=float, default=20.0, help="Response latency")
+    measure_parser.add_argument('--failure-rate', type=float, default=0.05, help="Fraction of 503 responses")
+    measure_parser.add_argument('--max-rate', type=float, help="Fixture 429 threshold (requests/sec)")
+    measure_parser.add_argument('--rate', type=float, default=50.0, help="Crawler requests/sec per host")
+    measure_parser.add_argument('--concurrency', type=int, default=8, help="Crawler requests in flight per host")
+    measure_parser.add_argument('--retries', type=int, default=5, help="Crawler retries per request")
+    measure_parser.add_argument('--cache-dir', help="HTTP cache directory (uncached if omitted)")
+    measure_parser.add_argument('--cache-ttl', type=float, default=0, help="Cache TTL (0 = always revalidate)")
+    measure_parser.add_argument('--runs', type=int, default=1, help="Back-to-back crawls; the last is reported")
+    measure_parser.add_argument('--extract-workers', type=int, default=0, help="Processes for card extraction")
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        fixture = FixtureDirectory(build_directory(args.startups), latency_ms=args.latency_ms,
+                                   failure_rate=args.failure_rate)
+        print(f"Serving fixture directory at http://127.0.0.1:{args.port}/companies")
+        web.run_app(fixture.app(), host='127.0.0.1', port=args.port)
+        return
+
+    result = measure(
+        num_startups=args.startups,
+        latency_ms=args.latency_ms,
+        failure_rate=args.failure_rate,
+        max_rate=args.max_rate,
+        rate=args.rate,
+        per_host_concurrency=args.concurrency,
+        retries=args.retries,
+        backoff=0.05,
+        cache_dir=args.cache_dir,
+        cache_ttl=args.cache_ttl,
+        runs=args.runs,
+        extract_workers=args.extract_workers
+    )
+
+    server = result['server']
+    print("\n=== Throughput ===")
+    print(f"Pages/sec: {result['pages_per_second']:.1f}")
+    print(f"Startups: {result['startups_scraped']} of {result['startups_expected']} "
+          f"({'complete' if result['complete'] else 'INCOMPLETE'})")
+    print("\n=== Politeness ===")
+    print(f"Peak in flight: {server['peak_in_flight']} (limit {args.concurrency})")
+    print(f"Peak requests/sec: {server['peak_requests_per_second']} (limit {args.rate:g} + burst)")
+    print(f"Retries: {result['crawl']['retries']} ({result['crawl']['throttled']} throttled), "
+          f"failures: {result['crawl']['failures']}")
+    print(f"Server status counts: {server['status_counts']}")
+    print(f"Body bytes sent: {server['bytes_sent']:,} "
+          f"({result['crawl']['not_modified']} not modified, {result['crawl']['cache_hits']} cache hits)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,78 +3,197 @@ YC AI Healthtech Startup Tracker - Web Scraper
 Scrapes Y Combinator's startup directory for AI and healthcare companies
 """
 
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
 import pandas as pd
-import time
 from datetime import datetime
 import json
 
+from healthtech_shared.dedup import NearDuplicateDetector
+from healthtech_shared.extraction import BACKENDS, CardExtractor
+from healthtech_shared.http_cache import DEFAULT_CACHE_DIR, HTTPCache
+
+from crawler import AsyncCrawler
+from search_index import SearchIndex
+from startup_store import StartupStore
+
+
+DEFAULT_TAGS = ['Healthcare', 'Artificial Intelligence']
+
+# TODO: Update selectors based on actual YC website structure
+STARTUP_CARD = ('div', 'startup-card')  # Placeholder
+
+# (field, tag, class, value) - see extraction.CardExtractor
+STARTUP_FIELDS = [
+    ('name', 'h3', None, 'text'),
+    ('description', 'p', 'description', 'text'),
+    ('batch', 'span', 'batch', 'text'),
+    ('tags', 'span', 'tag', 'texts'),
+    ('website', 'a', 'website', '@href')
+]
+
+# Near-duplicate startups - see dedup.NearDuplicateDetector.deduplicate. Names match fuzzily
+# ("Acme Health" and "Acme Health AI"). Websites need not match: relistings sometimes change them
+DEDUP_FIELDS = ('name', 'description')
+DEDUP_NAME_FIELD = 'name'
+DEDUP_NAME_THRESHOLD = 0.5
+
+
+def yc_batches(first_year=2005, last_year=None):
+    """YC batch codes from first_year to last_year, e.g. ['W05', 'S05', ...]"""
+    last_year = last_year or datetime.now().year
+    return [f'{season}{year % 100:02d}' for year in range(first_year, last_year + 1) for season in 'WS']
+
 
 class YCStartupScraper:
     """Scraper for Y Combinator startup data"""
 
-    def __init__(self):
-        self.base_url = "https://www.ycombinator.com/companies"
+    def __init__(self, base_url="https://www.ycombinator.com/companies", parser='auto',
+                 extract_workers=0, dedup_threshold=0.7, **crawler_options):
+        """
+        Initialize the scraper
+
+        Args:
+            base_url: Directory URL (point at fixture_server.py to crawl offline)
+            parser: Extraction backend ('auto', 'lxml', 'bs4-lxml' or 'bs4')
+            extract_workers: Processes for card extraction (0 extracts on the crawl loop)
+            dedup_threshold: Similarity at which scraped startups are near-duplicates (None keeps them all)
+            **crawler_options: Passed to AsyncCrawler (rate, per_host_concurrency, retries, cache, ...)
+        """
+        self.base_url = base_url
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.extractor = CardExtractor(STARTUP_CARD, STARTUP_FIELDS, backend=parser)
+        self.extract_workers = extract_workers
+        self.dedup = NearDuplicateDetector(dedup_threshold, name_threshold=DEDUP_NAME_THRESHOLD) if dedup_threshold else None
+        self.crawler_options = crawler_options
         self.startups = []
+        self.crawl_stats = None
 
-    def scrape_startups(self, tags=None, batch=None):
+    def scrape_startups(self, tags=None, batch=None, max_pages=100):
         """
         Scrape startups from YC directory
 
+        Every tag x batch combination is crawled concurrently and paged
+        until an empty page. Startups listed under several combinations
+        are kept once, as are near-duplicate listings of the same startup.
+
         Args:
             tags: List of tags to filter by (e.g., ['Healthcare', 'Artificial Intelligence'])
-            batch: Specific YC batch (e.g., 'W23', 'S24')
+            batch: YC batch or list of batches (e.g., 'W23' or ['W23', 'S24']); all batches if None
+            max_pages: Page limit per combination
         """
-        params = {}
-        if tags:
-            params['tags'] = tags
-        if batch:
-            params['batch'] = batch
+        tags = tags or [None]
+        batches = [batch] if isinstance(batch, str) or batch is None else list(batch)
+        combinations = list(product(tags, batches))
 
-        print(f"Scraping YC startups with filters: {params}")
+        print(f"Scraping YC startups across {len(combinations)} tag/batch combinations")
 
         # Note: This is a template. Actual implementation depends on YC's website structure
         # You may need to use their API or adjust selectors based on current HTML
 
-        try:
-            response = requests.get(self.base_url, headers=self.headers, params=params)
-            response.raise_for_status()
+        startups = asyncio.run(self._crawl(combinations, max_pages))
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+        seen = {(s['name'], s['website']) for s in self.startups}
+        for startup in startups:
+            key = (startup['name'], startup['website'])
+            if key not in seen:
+                seen.add(key)
+                self.startups.append(startup)
+        self.remove_near_duplicates()
 
-            # TODO: Update selectors based on actual YC website structure
-            startup_cards = soup.find_all('div', class_='startup-card')  # Placeholder
+        stats = self.crawl_stats
+        print(f"Scraped {len(self.startups)} startups with {stats['requests']} requests "
+              f"({stats['retries']} retries, {stats['failures']} failures, "
+              f"{stats['cache_hits']} cache hits, {stats['not_modified']} not modified) "
+              f"in {stats['elapsed_seconds']:.1f}s")
 
-            for card in startup_cards:
-                startup_data = self._extract_startup_data(card)
-                if startup_data:
-                    self.startups.append(startup_data)
+    def remove_near_duplicates(self):
+        """
+        Drop startups that near-duplicate an earlier one
 
-            print(f"Scraped {len(self.startups)} startups")
+        The directory lists some startups more than once with small edits to
+        the name or description (and sometimes a different website), which
+        the exact name/website check above lets through.
 
-        except Exception as e:
-            print(f"Error scraping: {e}")
+        Returns:
+            Number of startups dropped
+        """
+        if self.dedup is None or not self.startups:
+            return 0
+
+        before = len(self.startups)
+        self.startups = self.dedup.deduplicate(self.startups, DEDUP_FIELDS, name_field=DEDUP_NAME_FIELD)
+        dropped = before - len(self.startups)
+        print(f"Dropped {dropped} near-duplicate startups ({self.dedup.stats['candidates']} candidate pairs)")
+        return dropped
 
-    def _extract_startup_data(self, card):
-        """Extract data from a startup card element"""
+    async def _crawl(self, combinations, max_pages):
+        """Crawl every combination with one shared crawler"""
+        pool = ProcessPoolExecutor(self.extract_workers) if self.extract_workers else None
         try:
-            data = {
-                'name': card.find('h3').text.strip() if card.find('h3') else None,
-                'description': card.find('p', class_='description').text.strip() if card.find('p', class_='description') else None,
-                'batch': card.find('span', class_='batch').text.strip() if card.find('span', class_='batch') else None,
-                'tags': [tag.text.strip() for tag in card.find_all('span', class_='tag')],
-                'website': card.find('a', class_='website')['href'] if card.find('a', class_='website') else None,
-                'scraped_at': datetime.now().isoformat()
-            }
-            return data
-        except Exception as e:
-            print(f"Error extracting startup data: {e}")
+            async with AsyncCrawler(headers=self.headers, **self.crawler_options) as crawler:
+                results = await asyncio.gather(
+                    *(self._crawl_listing(crawler, pool, tag, batch, max_pages) for tag, batch in combinations)
+                )
+                self.crawl_stats = crawler.stats.to_dict()
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return [startup for listing in results for startup in listing]
+
+    async def _crawl_listing(self, crawler, pool, tag, batch, max_pages):
+        """Page through one tag/batch listing until a page has no startups"""
+        params = {}
+        if tag:
+            params['tags'] = tag
+        if batch:
+            params['batch'] = batch
+
+        startups = []
+        for page in range(1, max_pages + 1):
+            try:
+                html = await crawler.fetch(self.base_url, params={**params, 'page': page})
+            except Exception as e:
+                print(f"Error scraping {params} page {page}: {e}")
+                break
+
+            page_startups = await self._extract(pool, html)
+            if not page_startups:
+                break
+            startups.extend(page_startups)
+
+        return startups
+
+    async def _extract(self, pool, html):
+        """Extract every startup card on a directory page, in the pool if there is one"""
+        if pool is None:
+            page_startups = self.extractor.extract(html)
+        else:
+            page_startups = await asyncio.get_running_loop().run_in_executor(pool, self.extractor.extract, html)
+
+        scraped_at = datetime.now().isoformat()
+        for startup in page_startups:
+            startup['scraped_at'] = scraped_at
+        return page_startups
+
+    def save_to_store(self, db_file='data/yc_startups.db'):
+        """Upsert scraped startups into the startup store and update its search index"""
+        if not self.startups:
+            print("No data to save")
             return None
 
+        with StartupStore(db_file) as store:
+            result = store.upsert(self.startups)
+            total = len(store)
+            indexed = SearchIndex(store).refresh()
+        print(f"Upserted {len(self.startups)} startups into {db_file}: {result['inserted']} new, "
+              f"{result['updated']} changed, {result['unchanged']} unchanged ({total} stored, {indexed} re-indexed)")
+        return result
+
     def save_to_csv(self, filename='data/yc_startups.csv'):
         """Save scraped data to CSV"""
         if not self.startups:
@@ -98,15 +217,55 @@ class YCStartupScraper:
 
 def main():
     """Main execution function"""
-    scraper = YCStartupScraper()
+    parser = argparse.ArgumentParser(description="Scrape YC's startup directory")
+    parser.add_argument('--base-url', default="https://www.ycombinator.com/companies", help="Directory URL")
+    parser.add_argument('--tags', nargs='+', default=DEFAULT_TAGS, help="Tags to crawl")
+    parser.add_argument('--batches', nargs='+', help="Batches to crawl (default: no batch filter)")
+    parser.add_argument('--all-batches', action='store_true', help="Crawl every batch since W05")
+    parser.add_argument('--max-pages', type=int, default=100, help="Page limit per tag/batch")
+    parser.add_argument('--rate', type=float, default=2.0, help="Requests per second per host")
+    parser.add_argument('--concurrency', type=int, default=4, help="Requests in flight per host")
+    parser.add_argument('--retries', type=int, default=3, help="Retries per request")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="HTTP cache directory")
+    parser.add_argument('--cache-ttl', type=float, default=3600, help="Seconds before cached pages are revalidated")
+    parser.add_argument('--offline', action='store_true', help="Serve pages from the cache only")
+    parser.add_argument('--no-cache', action='store_true', help="Bypass the HTTP cache")
+    parser.add_argument('--parser', choices=('auto',) + BACKENDS, default='auto', help="HTML extraction backend")
+    parser.add_argument('--extract-workers', type=int, default=0, help="Processes for card extraction")
+    parser.add_argument('--dedup-threshold', type=float, default=0.7, help="Similarity at which scraped startups are near-duplicates")
+    parser.add_argument('--no-dedup', action='store_true', help="Keep near-duplicate startups")
+    parser.add_argument('--db', default='data/yc_startups.db', help="Startup store to upsert into")
+    parser.add_argument('--export', action='store_true', help="Also write the full store to CSV, JSON and Parquet")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else HTTPCache(args.cache_dir, ttl=args.cache_ttl, offline=args.offline)
+
+    scraper = YCStartupScraper(
+        args.base_url,
+        parser=args.parser,
+        extract_workers=args.extract_workers,
+        dedup_threshold=None if args.no_dedup else args.dedup_threshold,
+        rate=args.rate,
+        per_host_concurrency=args.concurrency,
+        retries=args.retries,
+        cache=cache
+    )
 
     # Scrape AI and Healthcare startups
     print("Starting YC healthtech startup scraping...")
-    scraper.scrape_startups(tags=['Healthcare', 'Artificial Intelligence'])
+    batches = yc_batches() if args.all_batches else args.batches
+    scraper.scrape_startups(tags=args.tags, batch=batches, max_pages=args.max_pages)
 
     # Save results
-    scraper.save_to_csv()
-    scraper.save_to_json()
+    scraper.save_to_store(args.db)
+    if args.export:
+        with StartupStore(args.db) as store:
+            print(f"Exported {store.export_csv()} startups to data/yc_startups.csv")
+            print(f"Exported {store.export_json()} startups to data/yc_startups.json")
+            print(f"Exported {store.export_parquet()} startups to data/yc_startups.parquet")
+
+    if cache is not None:
+        cache.close()
 
     print("\nScraping complete!")
 
@@ -0,0 +1,404 @@
+"""
+YC AI Healthtech Startup Tracker - Search Index
+BM25 full-text search over startup names, descriptions and tags, with optional dense embeddings
+
+The index lives in the startup store's database and catches up from the
+store's change log, so each scrape only re-indexes the startups it changed.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from startup_store import StartupStore
+
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has in into is it its of on or that the their this to '
+    'we which who will with'.split()
+)
+
+# Fields whose changes require re-indexing a startup
+INDEXED_FIELDS = ('name', 'description', 'tags')
+
+DEFAULT_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+
+# One packed posting per document containing a term; length is the document's
+# token count, kept with the posting so scoring never looks documents up
+POSTING = np.dtype([('doc', '<i4'), ('tf', '<u2'), ('length', '<u2')])
+MAX_U16 = np.iinfo('<u2').max
+
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords; a trailing plural 's' is dropped"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def document_text(name, description, tags):
+    """Indexed text for one startup"""
+    return ' '.join(part for part in (name, description, ' '.join(tags)) if part)
+
+
+def load_model(model=DEFAULT_MODEL):
+    """
+    Load a local sentence-transformers model for dense embeddings
+
+    Args:
+        model: Model name (downloaded once into the Hugging Face cache) or a local directory
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        raise ImportError(
+            "Dense embeddings need sentence-transformers: pip install sentence-transformers"
+        ) from None
+    return SentenceTransformer(model, device='cpu')
+
+
+class SearchIndex:
+    """BM25 inverted index (and optional embeddings) stored alongside the startups"""
+
+    def __init__(self, store, k1=1.2, b=0.75):
+        """
+        Open (or create) the index tables in a startup store
+
+        Each term's postings are one packed array, so a query reads one row
+        per query term and scores it with NumPy.
+
+        Args:
+            store: StartupStore to index
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.store = store
+        self.conn = store.conn
+        self.k1 = k1
+        self.b = b
+        self._embeddings = None
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS search_docs (
+                doc_id INTEGER PRIMARY KEY,
+                startup_key TEXT NOT NULL UNIQUE,
+                length INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                terms TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS search_terms (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL,
+                postings BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS search_embeddings (
+                startup_key TEXT PRIMARY KEY,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL
+            );
+            """
+        )
+        self.conn.commit()
+
+    def _state(self):
+        return self.store.get_state('search_index', {'revision': 0, 'docs': 0, 'total_length': 0})
+
+    def refresh(self, chunk_size=20000):
+        """
+        Re-index the startups whose name, description or tags changed since the last refresh
+
+        Returns:
+            Number of startups re-indexed
+        """
+        state = self._state()
+        if state['revision'] > self.store.revision:
+            # Store was rebuilt; start over
+            self.clear()
+            state = self._state()
+
+        keys = [row[0] for row in self.conn.execute(
+            f"SELECT DISTINCT startup_key FROM startup_changes WHERE revision > ? "
+            f"AND field IN ({', '.join('?' * len(INDEXED_FIELDS))})",
+            (state['revision'], *INDEXED_FIELDS)
+        )]
+
+        for start in range(0, len(keys), chunk_size):
+            state = self._reindex(keys[start:start + chunk_size], state)
+
+        state['revision'] = self.store.revision
+        self.store.set_state('search_index', state)
+        return len(keys)
+
+    def _reindex(self, keys, state, term_chunk=500):
+        """Replace the postings of a chunk of startups"""
+        placeholders = ', '.join('?' * len(keys))
+
+        # Previous version of each document: its id and the terms it was posted under
+        doc_ids, affected = {}, set()
+        for doc_id, key, length, terms in self.conn.execute(
+            f"SELECT doc_id, startup_key, length, terms FROM search_docs WHERE startup_key IN ({placeholders})", keys
+        ):
+            doc_ids[key] = doc_id
+            affected.update(json.loads(terms))
+            state['docs'] -= 1
+            state['total_length'] -= length
+        next_id = (self.conn.execute("SELECT MAX(doc_id) FROM search_docs").fetchone()[0] or 0) + 1
+
+        # Tokenize the current text
+        docs, new_postings = [], {}
+        rows = self.conn.execute(
+            f"SELECT startup_key, name, description, tags FROM startups WHERE startup_key IN ({placeholders})", keys
+        )
+        for key, name, description, tags in rows:
+            if key not in doc_ids:
+                doc_ids[key] = next_id
+                next_id += 1
+            text = document_text(name, description, json.loads(tags))
+            terms = Counter(tokenize(text))
+            length = min(sum(terms.values()), MAX_U16)
+            docs.append((doc_ids[key], key, length, hashlib.sha1(text.encode()).hexdigest(), json.dumps(list(terms))))
+            for term, tf in terms.items():
+                new_postings.setdefault(term, []).append((doc_ids[key], min(tf, MAX_U16), length))
+            state['docs'] += 1
+            state['total_length'] += length
+        affected.update(new_postings)
+
+        # Rewrite the postings array of every term whose documents changed
+        chunk_docs = np.fromiter(doc_ids.values(), dtype='<i4')
+        updates, deletes = [], []
+        affected = sorted(affected)
+        for start in range(0, len(affected), term_chunk):
+            terms = affected[start:start + term_chunk]
+            stored = dict(self.conn.execute(
+                f"SELECT term, postings FROM search_terms WHERE term IN ({', '.join('?' * len(terms))})", terms
+            ).fetchall())
+            for term in terms:
+                postings = np.frombuffer(stored.get(term, b''), dtype=POSTING)
+                if len(postings):
+                    postings = postings[~np.isin(postings['doc'], chunk_docs)]
+                if term in new_postings:
+                    added = np.array(new_postings[term], dtype=POSTING)
+                    postings = np.concatenate([postings, added]) if len(postings) else added
+                    postings.sort(order='doc')
+                if len(postings):
+                    updates.append((term, len(postings), postings.tobytes()))
+                else:
+                    deletes.append((term,))
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO search_docs (doc_id, startup_key, length, text_hash, terms) VALUES (?, ?, ?, ?, ?)",
+                docs
+            )
+            self.conn.executemany("INSERT OR REPLACE INTO search_terms (term, df, postings) VALUES (?, ?, ?)", updates)
+            self.conn.executemany("DELETE FROM search_terms WHERE term = ?", deletes)
+        return state
+
+    def clear(self):
+        """Drop every posting so the next refresh rebuilds the index"""
+        with self.conn:
+            for table in ('search_docs', 'search_terms'):
+                self.conn.execute(f"DELETE FROM {table}")
+        self.store.set_state('search_index', {'revision': 0, 'docs': 0, 'total_length': 0})
+
+    def bm25(self, query, k=10):
+        """
+        Rank startups against a query with BM25
+
+        Returns:
+            Series of score indexed by startup_key, best first
+        """
+        terms = sorted(set(tokenize(query)))
+        state = self._state()
+        if not terms or not state['docs']:
+            return pd.Series(dtype=float, name='score')
+
+        rows = self.conn.execute(
+            f"SELECT df, postings FROM search_terms WHERE term IN ({', '.join('?' * len(terms))})", terms
+        ).fetchall()
+        if not rows:
+            return pd.Series(dtype=float, name='score')
+
+        n = state['docs']
+        avgdl = state['total_length'] / n
+        docs, scores = [], []
+        for df, blob in rows:
+            postings = np.frombuffer(blob, dtype=POSTING)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            tf = postings['tf'].astype(np.float32)
+            norm = self.k1 * (1 - self.b + self.b * postings['length'] / avgdl)
+            docs.append(postings['doc'])
+            scores.append(idf * tf * (self.k1 + 1) / (tf + norm))
+
+        doc_ids, inverse = np.unique(np.concatenate(docs), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(scores))
+        top = np.argsort(-totals, kind='stable')[:k] if len(totals) <= k else np.argpartition(-totals, k)[:k]
+        top = top[np.argsort(-totals[top], kind='stable')]
+
+        top_ids = [int(doc_id) for doc_id in doc_ids[top]]
+        keys = dict(self.conn.execute(
+            f"SELECT doc_id, startup_key FROM search_docs WHERE doc_id IN ({', '.join('?' * len(top_ids))})", top_ids
+        ).fetchall())
+        return pd.Series(totals[top], index=[keys[doc_id] for doc_id in top_ids], name='score').rename_axis('startup_key')
+
+    def embed(self, model=DEFAULT_MODEL, batch_size=256):
+        """
+        Compute dense embeddings for startups whose indexed text changed since they were embedded
+
+        Runs offline on CPU with a local sentence-transformers model.
+
+        Returns:
+            Number of startups embedded
+        """
+        stale = self.conn.execute(
+            "SELECT startups.startup_key, startups.name, startups.description, startups.tags, search_docs.text_hash "
+            "FROM search_docs JOIN startups USING (startup_key) "
+            "LEFT JOIN search_embeddings USING (startup_key) "
+            "WHERE search_embeddings.text_hash IS NULL OR search_embeddings.text_hash != search_docs.text_hash"
+        ).fetchall()
+        if not stale:
+            return 0
+
+        encoder = load_model(model) if isinstance(model, str) else model
+        texts = [document_text(name, description, json.loads(tags)) for _, name, description, tags, _ in stale]
+        vectors = encoder.encode(texts, batch_size=batch_size, normalize_embeddings=True, show_progress_bar=False)
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO search_embeddings (startup_key, text_hash, vector) VALUES (?, ?, ?)",
+                ((row[0], row[4], np.asarray(vector, dtype=np.float32).tobytes()) for row, vector in zip(stale, vectors))
+            )
+            self.conn.execute(
+                "DELETE FROM search_embeddings WHERE startup_key NOT IN (SELECT startup_key FROM search_docs)"
+            )
+        self._embeddings = None
+        return len(stale)
+
+    def dense(self, query, model=DEFAULT_MODEL, k=10):
+        """
+        Rank startups by cosine similarity between the query and their embeddings
+
+        Returns:
+            Series of similarity indexed by startup_key, best first
+        """
+        if self._embeddings is None:
+            rows = self.conn.execute("SELECT startup_key, vector FROM search_embeddings").fetchall()
+            if not rows:
+                raise LookupError("No embeddings stored; run `python search_index.py embed` first")
+            keys = [key for key, _ in rows]
+            matrix = np.frombuffer(b''.join(vector for _, vector in rows), dtype=np.float32).reshape(len(rows), -1)
+            self._embeddings = (keys, matrix)
+
+        keys, matrix = self._embeddings
+        encoder = load_model(model) if isinstance(model, str) else model
+        vector = np.asarray(encoder.encode([query], normalize_embeddings=True)[0], dtype=np.float32)
+        similarity = matrix @ vector
+        top = np.argsort(-similarity)[:k]
+        return pd.Series(similarity[top], index=[keys[i] for i in top], name='score').rename_axis('startup_key')
+
+    def search(self, query, k=10, mode='bm25', model=DEFAULT_MODEL, candidates=100):
+        """
+        Search startups
+
+        Args:
+            query: Free-text query
+            k: Results to return
+            mode: 'bm25', 'dense' or 'hybrid' (reciprocal rank fusion of both)
+            model: sentence-transformers model (name, path or loaded model) for dense/hybrid
+            candidates: Results taken from each ranker before fusion
+
+        Returns:
+            DataFrame of startup_key, name, batch, description, tags and score, best first
+        """
+        if mode == 'bm25':
+            ranked = self.bm25(query, k)
+        elif mode == 'dense':
+            ranked = self.dense(query, model, k)
+        elif mode == 'hybrid':
+            fused = Counter()
+            for ranking in (self.bm25(query, candidates), self.dense(query, model, candidates)):
+                for rank, key in enumerate(ranking.index):
+                    fused[key] += 1 / (60 + rank + 1)
+            ranked = pd.Series(dict(fused.most_common(k)), dtype=float, name='score').rename_axis('startup_key')
+        else:
+            raise ValueError(f"Unknown search mode {mode!r}; expected 'bm25', 'dense' or 'hybrid'")
+
+        if ranked.empty:
+            return pd.DataFrame(columns=['startup_key', 'name', 'batch', 'description', 'tags', 'score'])
+
+        keys = list(ranked.index)
+        placeholders = ', '.join('?' * len(keys))
+        startups = pd.read_sql_query(
+            f"SELECT startup_key, name, batch, description, tags FROM startups WHERE startup_key IN ({placeholders})",
+            self.conn,
+            params=keys
+        )
+        startups['tags'] = startups['tags'].map(json.loads)
+        results = startups.merge(ranked.rename('score').reset_index(), on='startup_key')
+        return results.sort_values('score', ascending=False, ignore_index=True)
+
+
+def main():
+    """Build, embed or query the search index from the command line"""
+    parser = argparse.ArgumentParser(description="Search YC startups by description and tags")
+    parser.add_argument('--db', default='data/yc_startups.db', help="Startup store")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('update', help="Index startups changed since the last update")
+    subparsers.add_parser('rebuild', help="Re-index every startup")
+
+    embed = subparsers.add_parser('embed', help="Compute dense embeddings for new or changed startups")
+    embed.add_argument('--model', default=DEFAULT_MODEL, help="sentence-transformers model name or local path")
+
+    query = subparsers.add_parser('query', help="Search the index")
+    query.add_argument('text', help="Query text")
+    query.add_argument('-k', type=int, default=10, help="Results to show")
+    query.add_argument('--mode', choices=('bm25', 'dense', 'hybrid'), default='bm25', help="Ranking")
+    query.add_argument('--model', default=DEFAULT_MODEL, help="sentence-transformers model for dense/hybrid")
+    args = parser.parse_args()
+
+    with StartupStore(args.db) as store:
+        index = SearchIndex(store)
+
+        if args.command == 'rebuild':
+            index.clear()
+        if args.command in ('update', 'rebuild'):
+            start = time.perf_counter()
+            indexed = index.refresh()
+            print(f"Indexed {indexed} startups in {time.perf_counter() - start:.2f}s")
+            return
+        if args.command == 'embed':
+            index.refresh()
+            print(f"Embedded {index.embed(args.model)} startups")
+            return
+
+        index.refresh()
+        model = load_model(args.model) if args.mode != 'bm25' else args.model
+        start = time.perf_counter()
+        results = index.search(args.text, args.k, args.mode, model)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        print(f"{len(results)} results for {args.text!r} ({args.mode}, {elapsed:.1f} ms)\n")
+        for rank, row in enumerate(results.itertuples(index=False), 1):
+            print(f"{rank:>2}. {row.name} ({row.batch})  score {row.score:.3f}")
+            print(f"    {row.description}")
+            if row.tags:
+                print(f"    tags: {', '.join(row.tags)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+"""
+YC AI Healthtech Startup Tracker - Startup Store
+SQLite store of scraped startups with upserts, first/last seen dates and field-level change history
+"""
+
+import ast
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+
+# Scraped fields tracked for changes, in column order
+FIELDS = ['name', 'website', 'description', 'batch', 'tags']
+
+# Columns derived from the scraped fields at ingest, with their SQLite types
+DERIVED = {'year': 'INTEGER', 'season': 'TEXT', 'batch_ordinal': 'INTEGER'}
+
+COLUMNS = ['startup_key'] + FIELDS + list(DERIVED) + ['first_seen', 'last_seen', 'revision']
+
+BATCH_PATTERN = re.compile(r'([WXSF])(\d{2})')
+
+# Season letter -> (position within the year, name); YC runs Winter, Spring, Summer, Fall
+SEASONS = {'W': (0, 'Winter'), 'X': (1, 'Spring'), 'S': (2, 'Summer'), 'F': (3, 'Fall')}
+
+
+def parse_batch(batch):
+    """
+    (year, season, ordinal) for a batch code, or (None, None, None) if it does not parse
+
+    The ordinal is year * 4 + season position, so batches sort and range-filter
+    chronologically as integers: 'W23' -> (2023, 'W', 8092), 'S24' -> (2024, 'S', 8098).
+    """
+    match = BATCH_PATTERN.fullmatch(batch.strip()) if isinstance(batch, str) else None
+    if match is None:
+        return None, None, None
+    season = match.group(1)
+    year = 2000 + int(match.group(2))
+    return year, season, year * 4 + SEASONS[season][0]
+
+
+def batch_dimension(codes):
+    """
+    Batch dimension table for a set of batch codes
+
+    Returns:
+        DataFrame of code, year, season, season_name and ordinal, in
+        chronological order (codes that do not parse are left out)
+    """
+    rows = []
+    for code in set(codes):
+        year, season, ordinal = parse_batch(code)
+        if ordinal is not None:
+            rows.append((code, year, season, SEASONS[season][1], ordinal))
+    dimension = pd.DataFrame(rows, columns=['code', 'year', 'season', 'season_name', 'ordinal'])
+    return dimension.sort_values('ordinal', ignore_index=True)
+
+
+def startup_key(name, website):
+    """
+    Stable company identity: normalized name plus website domain
+
+    'Acme Health' + 'https://www.acme.health/' -> 'acme health|acme.health'
+    """
+    name = ' '.join(str(name or '').split()).casefold()
+    domain = ''
+    if website:
+        website = str(website).strip()
+        domain = urlsplit(website if '//' in website else '//' + website).netloc.lower()
+        if domain.startswith('www.'):
+            domain = domain[4:]
+    return f'{name}|{domain}'
+
+
+def _encode(field, value):
+    """Column value for a field (tags are stored as a JSON list)"""
+    if field == 'tags':
+        return json.dumps(list(value or []))
+    return value
+
+
+def _same(field, old, new):
+    """True if a stored value equals a scraped one (tag order is ignored)"""
+    if field == 'tags':
+        return sorted(json.loads(old or '[]')) == sorted(json.loads(new))
+    return old == new
+
+
+class StartupStore:
+    """SQLite store of startups keyed by name and website domain"""
+
+    def __init__(self, db_file='data/yc_startups.db'):
+        """
+        Open (or create) the store
+
+        Args:
+            db_file: SQLite database path (':memory:' for a throwaway store)
+        """
+        if db_file != ':memory:' and os.path.dirname(db_file):
+            os.makedirs(os.path.dirname(db_file), exist_ok=True)
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS startups (
+                startup_key TEXT PRIMARY KEY,
+                name TEXT,
+                website TEXT,
+                description TEXT,
+                batch TEXT,
+                tags TEXT NOT NULL DEFAULT '[]',
+                year INTEGER,
+                season TEXT,
+                batch_ordinal INTEGER,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                revision INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS startup_changes (
+                revision INTEGER NOT NULL,
+                startup_key TEXT NOT NULL,
+                field TEXT NOT NULL,
+                old_value TEXT,
+                new_value TEXT,
+                changed_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS startup_changes_revision ON startup_changes (revision);
+            CREATE TABLE IF NOT EXISTS startup_tags (
+                startup_key TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                PRIMARY KEY (startup_key, tag)
+            );
+            CREATE INDEX IF NOT EXISTS startup_tags_tag ON startup_tags (tag, startup_key);
+            CREATE TABLE IF NOT EXISTS batches (
+                ordinal INTEGER PRIMARY KEY,
+                code TEXT NOT NULL UNIQUE,
+                year INTEGER NOT NULL,
+                season TEXT NOT NULL,
+                season_name TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+
+        # Stores written before derived columns existed
+        existing_columns = {row[1] for row in self.conn.execute("PRAGMA table_info(startups)")}
+        missing = [column for column in DERIVED if column not in existing_columns]
+        for column in missing:
+            self.conn.execute(f"ALTER TABLE startups ADD COLUMN {column} {DERIVED[column]}")
+        if missing:
+            batches = [row[0] for row in self.conn.execute("SELECT DISTINCT batch FROM startups")]
+            self.conn.executemany(
+                "UPDATE startups SET year = ?, season = ?, batch_ordinal = ? WHERE batch = ?",
+                ((*parse_batch(batch), batch) for batch in batches)
+            )
+            self._add_batches(batches)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS startups_batch_ordinal ON startups (batch_ordinal)")
+
+        # Stores written before the tag index existed
+        if not self.conn.execute("SELECT 1 FROM startup_tags LIMIT 1").fetchone():
+            self.conn.execute(
+                "INSERT OR IGNORE INTO startup_tags (startup_key, tag) "
+                "SELECT startups.startup_key, tags.value FROM startups, json_each(startups.tags) AS tags"
+            )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def _add_batches(self, codes):
+        """Add batch codes to the batch dimension table"""
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO batches (code, year, season, season_name, ordinal) VALUES (?, ?, ?, ?, ?)",
+            batch_dimension(codes).itertuples(index=False)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def revision(self):
+        """Number of upserts that changed the store"""
+        return int(self.get_state('revision', 0))
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM startups").fetchone()[0]
+
+    def get_state(self, key, default=None):
+        """Read a JSON value from the meta table"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_state(self, key, value):
+        """Write a JSON value to the meta table"""
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+        self.conn.commit()
+
+    def _existing(self, keys, chunk_size=500):
+        """Stored rows for the given keys, keyed by startup_key"""
+        existing = {}
+        columns = ', '.join(FIELDS)
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            placeholders = ', '.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT startup_key, {columns} FROM startups WHERE startup_key IN ({placeholders})", chunk
+            )
+            for key, *values in rows:
+                existing[key] = dict(zip(FIELDS, values))
+        return existing
+
+    def upsert(self, startups, seen_at=None):
+        """
+        Insert new startups, update changed ones and refresh last_seen
+
+        Every inserted field and every changed field is logged to
+        startup_changes under a new revision, so readers can catch up on
+        exactly what changed since the revision they last processed.
+
+        Args:
+            startups: Iterable of scraped startup dicts (name, website, description, batch, tags)
+            seen_at: Scrape timestamp (ISO string); defaults to now
+
+        Returns:
+            Dict with inserted, updated and unchanged counts and the new revision
+        """
+        seen_at = seen_at or datetime.now().isoformat()
+
+        # Later duplicates in the same scrape win
+        scraped = {}
+        for startup in startups:
+            scraped[startup_key(startup.get('name'), startup.get('website'))] = {
+                field: _encode(field, startup.get(field)) for field in FIELDS
+            }
+
+        existing = self._existing(list(scraped))
+        revision = self.revision + 1
+
+        inserts, updates, touches, changes, retagged = [], [], [], [], []
+        for key, record in scraped.items():
+            stored = existing.get(key)
+            if stored is None:
+                inserts.append((key, *record.values(), *parse_batch(record['batch']), seen_at, seen_at, revision))
+                retagged.append(key)
+                changes.extend(
+                    (revision, key, field, None, record[field], seen_at)
+                    for field in FIELDS if record[field] is not None
+                )
+                continue
+
+            changed = [field for field in FIELDS if not _same(field, stored[field], record[field])]
+            if changed:
+                updates.append((*record.values(), *parse_batch(record['batch']), seen_at, revision, key))
+                if 'tags' in changed:
+                    retagged.append(key)
+                changes.extend(
+                    (revision, key, field, stored[field], record[field], seen_at) for field in changed
+                )
+            else:
+                touches.append((seen_at, key))
+
+        with self.conn:
+            self._add_batches(record['batch'] for record in scraped.values())
+            self.conn.executemany(
+                f"INSERT INTO startups ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                inserts
+            )
+            self.conn.executemany(
+                f"UPDATE startups SET {', '.join(f'{column} = ?' for column in FIELDS + list(DERIVED))}, last_seen = ?, revision = ? "
+                "WHERE startup_key = ?",
+                updates
+            )
+            self.conn.executemany("UPDATE startups SET last_seen = ? WHERE startup_key = ?", touches)
+            self.conn.executemany("DELETE FROM startup_tags WHERE startup_key = ?", ((key,) for key in retagged))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO startup_tags (startup_key, tag) VALUES (?, ?)",
+                ((key, tag) for key in retagged for tag in json.loads(scraped[key]['tags']))
+            )
+            self.conn.executemany(
+                "INSERT INTO startup_changes (revision, startup_key, field, old_value, new_value, changed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                changes
+            )
+            if changes:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('revision', ?)", (json.dumps(revision),)
+                )
+
+        return {
+            'inserted': len(inserts),
+            'updated': len(updates),
+            'unchanged': len(touches),
+            'revision': revision if changes else revision - 1
+        }
+
+    def load(self, columns=None, limit=None):
+        """
+        Stored startups as a DataFrame (tags decoded to lists)
+
+        Args:
+            columns: Columns to read (all if None)
+            limit: Maximum rows to read
+        """
+        columns = columns or COLUMNS
+        query = f"SELECT {', '.join(columns)} FROM startups ORDER BY first_seen, startup_key"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        return self._decode(pd.read_sql_query(query, self.conn))
+
+    def with_tags(self, tags, columns=None):
+        """
+        Startups carrying every one of the given tags, looked up in the tag index
+
+        Args:
+            tags: Tag or list of tags
+            columns: Columns to read (all if None)
+        """
+        tags = [tags] if isinstance(tags, str) else list(tags)
+        columns = columns or COLUMNS
+        selected = ', '.join(f'startups.{column}' for column in columns)
+        placeholders = ', '.join('?' * len(tags))
+        query = (
+            f"SELECT {selected} FROM startups "
+            f"JOIN (SELECT startup_key FROM startup_tags WHERE tag IN ({placeholders}) "
+            "GROUP BY startup_key HAVING COUNT(*) = ?) AS matches USING (startup_key) "
+            "ORDER BY startups.first_seen, startups.startup_key"
+        )
+        return self._decode(pd.read_sql_query(query, self.conn, params=(*tags, len(set(tags)))))
+
+    def in_batches(self, first=None, last=None, columns=None):
+        """
+        Startups from a range of batches, inclusive, in chronological order
+
+        The range is an integer comparison on the indexed batch_ordinal column.
+
+        Args:
+            first: Earliest batch code (open-ended if None)
+            last: Latest batch code (open-ended if None)
+            columns: Columns to read (all if None)
+        """
+        low = parse_batch(first)[2] if first else None
+        high = parse_batch(last)[2] if last else None
+        if (first and low is None) or (last and high is None):
+            raise ValueError(f"Unrecognized batch code in range {first!r}..{last!r}")
+        columns = columns or COLUMNS
+        query = (
+            f"SELECT {', '.join(columns)} FROM startups WHERE batch_ordinal BETWEEN ? AND ? "
+            "ORDER BY batch_ordinal, startup_key"
+        )
+        params = (low if low is not None else -1, high if high is not None else 2 ** 31)
+        return self._decode(pd.read_sql_query(query, self.conn, params=params))
+
+    def batch_dimension(self):
+        """The batch dimension table (code, year, season, season_name, ordinal) in chronological order"""
+        return pd.read_sql_query(
+            "SELECT code, year, season, season_name, ordinal FROM batches ORDER BY ordinal", self.conn
+        )
+
+    @staticmethod
+    def _decode(df):
+        """Decode tags to lists and type the derived integer columns"""
+        if 'tags' in df.columns:
+            df['tags'] = df['tags'].map(json.loads)
+        if 'year' in df.columns:
+            df['year'] = df['year'].astype('Int16')
+        if 'batch_ordinal' in df.columns:
+            df['batch_ordinal'] = df['batch_ordinal'].astype('Int32')
+        return df
+
+    def changes(self, since_revision=0):
+        """Field changes logged after a revision, oldest first (missing values are None)"""
+        df = pd.read_sql_query(
+            "SELECT revision, startup_key, field, old_value, new_value, changed_at "
+            "FROM startup_changes WHERE revision > ? ORDER BY revision, rowid",
+            self.conn,
+            params=(since_revision,)
+        )
+        values = df[['old_value', 'new_value']].astype(object)
+        df[['old_value', 'new_value']] = values.where(values.notna(), None)
+        return df
+
+    def import_csv(self, csv_file, seen_at=None):
+        """Upsert startups from a CSV written by YCStartupScraper.save_to_csv"""
+        df = pd.read_csv(csv_file).astype(object).where(lambda d: d.notna(), None)
+        if 'tags' in df.columns:
+            df['tags'] = df['tags'].map(lambda tags: ast.literal_eval(tags) if isinstance(tags, str) else [])
+        return self.upsert(df.to_dict('records'), seen_at)
+
+    def export_csv(self, filename='data/yc_startups.csv'):
+        """Write every stored startup to CSV"""
+        if os.path.dirname(filename):
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+        df = self.load()
+        df.to_csv(filename, index=False)
+        return len(df)
+
+    def export_json(self, filename='data/yc_startups.json'):
+        """Write every stored startup to JSON"""
+        if os.path.dirname(filename):
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+        df = self.load()
+        for column in ('year', 'batch_ordinal'):
+            df[column] = df[column].astype(object).where(df[column].notna(), None)
+        records = df.to_dict('records')
+        with open(filename, 'w') as f:
+            json.dump(records, f, indent=2)
+        return len(records)
+
+    def export_parquet(self, filename='data/yc_startups.parquet'):
+        """
+        Write every stored startup to Parquet
+
+        Tags are a list column and year, season and batch_ordinal are stored
+        typed, so readers can load just the columns an analysis needs and
+        filter batch ranges on the integer ordinal.
+        """
+        if os.path.dirname(filename):
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+        df = self.load()
+        df['season'] = df['season'].astype('category')
+        df.to_parquet(filename, index=False)
+        return len(df)
@@ -0,0 +1,73 @@
+"""
+YC AI Healthtech Startup Tracker - Crawler Tests
+Crawls the local fixture directory in-process and checks completeness, politeness, retries and caching
+
+Run with: python -m unittest test_crawler
+"""
+
+import shutil
+import tempfile
+import unittest
+
+from fixture_server import measure
+from scraper import yc_batches
+
+
+# Small directory and a few batches keep each crawl to a few seconds
+CRAWL = {
+    'num_startups': 300,
+    'batches': ['W20', 'S20', 'W21', 'S21'],
+    'latency_ms': 10.0,
+    'backoff': 0.05
+}
+
+
+class CrawlerTest(unittest.TestCase):
+    """Crawls against FixtureServer running on a background thread"""
+
+    def crawl(self, **options):
+        return measure(**{**CRAWL, **options})
+
+    def test_crawl_is_complete(self):
+        result = self.crawl(failure_rate=0.0)
+
+        self.assertTrue(result['complete'])
+        self.assertGreater(result['startups_expected'], 0)
+        self.assertEqual(result['crawl']['failures'], 0)
+
+    def test_crawl_respects_concurrency_and_rate_limits(self):
+        concurrency, rate, burst = 4, 40.0, 10
+        result = self.crawl(failure_rate=0.0, per_host_concurrency=concurrency, rate=rate, burst=burst)
+        server = result['server']
+
+        self.assertTrue(result['complete'])
+        self.assertLessEqual(server['peak_in_flight'], concurrency)
+        # Any one second can spend a full bucket plus that second's refill
+        self.assertLessEqual(server['peak_requests_per_second'], rate + burst)
+
+    def test_crawl_retries_through_failures_and_throttling(self):
+        # Every batch, so enough requests are made to draw both 503s and 429s
+        result = self.crawl(batches=yc_batches(2015, 2024), failure_rate=0.1, max_rate=20, rate=40.0, retries=8)
+
+        self.assertTrue(result['complete'])
+        self.assertGreater(result['crawl']['retries'], 0)
+        self.assertEqual(result['crawl']['failures'], 0)
+        self.assertIn(503, result['server']['status_counts'])
+        self.assertIn(429, result['server']['status_counts'])
+
+    def test_cached_rerun_only_revalidates(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        result = self.crawl(failure_rate=0.0, cache_dir=cache_dir, cache_ttl=0, runs=2)
+        server = result['server']
+
+        self.assertTrue(result['complete'])
+        self.assertGreater(server['requests'], 0)
+        self.assertEqual(server['status_counts'], {304: server['requests']})
+        self.assertEqual(server['bytes_sent'], 0)
+        self.assertEqual(result['crawl']['not_modified'], server['requests'])
+
+
+if __name__ == "__main__":
+    unittest.main()
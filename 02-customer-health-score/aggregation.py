@@ -0,0 +1,110 @@
+"""
+Dashboard Aggregation Layer
+Precomputes chart data with NumPy so only small frames reach the browser
+"""
+
+import numpy as np
+import pandas as pd
+
+from streaming import RISK_CATEGORIES
+
+
+def score_histogram(df, bins=30, value_range=(0, 100)):
+    """
+    Health score histogram per risk category on shared bin edges
+
+    Args:
+        df: Scored customer DataFrame
+        bins: Number of equal-width bins
+        value_range: (min, max) score range covered by the bins
+
+    Returns:
+        Long DataFrame with bin_start, bin_end, bin_center, risk_category
+        and customers - at most bins * 3 rows
+    """
+    edges = np.linspace(value_range[0], value_range[1], bins + 1)
+    scores = df['health_score'].to_numpy()
+    categories = df['risk_category'].to_numpy()
+
+    frames = []
+    for category in RISK_CATEGORIES:
+        counts, _ = np.histogram(scores[categories == category], bins=edges)
+        frames.append(pd.DataFrame({
+            'bin_start': edges[:-1],
+            'bin_end': edges[1:],
+            'bin_center': (edges[:-1] + edges[1:]) / 2,
+            'risk_category': category,
+            'customers': counts
+        }))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def stratified_sample(df, max_points=5000, stratify='risk_category', min_per_group=200, seed=0):
+    """
+    Downsample rows for a scatter plot while keeping every group visible
+
+    Each group gets a share of max_points proportional to its size, but
+    never fewer than min_per_group rows (or the whole group if smaller).
+
+    Args:
+        df: DataFrame to sample
+        max_points: Approximate total rows to return
+        stratify: Column to stratify by
+        min_per_group: Floor on rows kept per group
+        seed: Random seed for reproducible samples
+
+    Returns:
+        Sampled DataFrame (df itself when it already fits)
+    """
+    if len(df) <= max_points:
+        return df
+
+    rng = np.random.default_rng(seed)
+    groups = df[stratify].to_numpy()
+    positions = []
+    for group in pd.unique(groups):
+        members = np.flatnonzero(groups == group)
+        quota = max(min_per_group, int(round(max_points * len(members) / len(df))))
+        if len(members) > quota:
+            members = rng.choice(members, size=quota, replace=False)
+        positions.append(members)
+
+    return df.iloc[np.sort(np.concatenate(positions))]
+
+
+def density_grid(df, x='contract_value', y='health_score', bins=50):
+    """
+    2D histogram of two columns for a density heatmap
+
+    Args:
+        df: Scored customer DataFrame
+        x: Column for the horizontal axis
+        y: Column for the vertical axis
+        bins: Bins per axis
+
+    Returns:
+        Tuple of (counts, x_centers, y_centers) with counts shaped (y, x)
+    """
+    counts, x_edges, y_edges = np.histogram2d(df[x].to_numpy(), df[y].to_numpy(), bins=bins)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    return counts.T, x_centers, y_centers
+
+
+def paginate(df, page, page_size=100):
+    """
+    Return one page of rows
+
+    Args:
+        df: DataFrame to page through
+        page: One-based page number (clamped to the valid range)
+        page_size: Rows per page
+
+    Returns:
+        Tuple of (page rows, number of pages)
+    """
+    num_pages = max(1, -(-len(df) // page_size))
+    page = min(max(1, page), num_pages)
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size], num_pages
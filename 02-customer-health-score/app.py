@@ -3,13 +3,33 @@ Customer Health Score Calculator - Streamlit Dashboard
 Interactive dashboard for predicting customer churn using usage metrics
 """
 
+import hashlib
+import io
+import os
+from datetime import date
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from health_score import HealthScoreCalculator
+from health_score import DEFAULT_PROFILE, METRIC_COLUMNS, HealthScoreCalculator, load_profiles, score_profiles
 from data_generator import generate_sample_data
+from streaming import ScoreAggregates
+from history import ScoreHistory
+from customer_index import CustomerIndex
+from aggregation import density_grid, paginate, score_histogram, stratified_sample
+from score_store import profile_hash
+from churn_model import ChurnModel
+from schema import SchemaError, coerce, read_customers
+
+
+# Scored frames are shared across sessions; keep a bounded number of them
+CACHE_MAX_ENTRIES = 8
+CACHE_TTL_SECONDS = 3600
 
+PROFILES_FILE = 'scoring_profiles.json'
+CHURN_MODEL_FILE = 'churn_model.npz'
 
 # Page configuration
 st.set_page_config(
@@ -35,37 +55,123 @@ data_source = st.sidebar.radio(
 @st.cache_data
 def load_data(source="sample"):
     if source == "sample":
-        return generate_sample_data(num_customers=100)
+        return coerce(generate_sample_data(num_customers=100))
     return None
 
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Scoring customers...")
+def build_dashboard_data(data_key, profile_key, _load, _calculator):
+    """
+    Score a dataset and precompute everything the charts need
+
+    Keyed by the data content hash and the scoring profile hash; the
+    underscored arguments are not hashed. Results are shared read-only
+    across sessions, so widget changes and other users loading the same
+    file reuse them instead of rescoring.
+    """
+    scored = _calculator.recommend_frame(_calculator.score_frame(_load()))
+
+    summary = ScoreAggregates()
+    summary.update_frame(scored)
+
+    return {
+        'df': scored,
+        'by_score': scored.sort_values('health_score', ascending=True),
+        'summary': summary,
+        'histogram': score_histogram(scored, bins=30),
+        'sample': stratified_sample(scored, max_points=5000),
+        'density': density_grid(scored, x='contract_value', y='health_score'),
+        'index': CustomerIndex(scored)
+    }
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Comparing profiles...")
+def compare_profiles(data_key, profile_names, profile_keys, _df, _profiles):
+    """
+    Score the dataset under several profiles in one pass and summarize each
+
+    Keyed by the data hash and each compared profile's name and hash, so
+    editing a profile in scoring_profiles.json recomputes the comparison.
+    """
+    scored = score_profiles(_df, [_profiles[name] for name in profile_names])
+
+    rows = []
+    for name in profile_names:
+        categories = scored[f'risk_category_{name}']
+        rows.append({
+            'Profile': name,
+            'Avg Health Score': scored[f'health_score_{name}'].mean(),
+            'Avg Churn Risk': scored[f'churn_risk_{name}'].mean(),
+            'Healthy': int((categories == 'Healthy').sum()),
+            'At Risk': int((categories == 'At Risk').sum()),
+            'High Risk': int((categories == 'High Risk').sum())
+        })
+    return pd.DataFrame(rows)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Preparing download...")
+def download_csv(data_key, profile_key, risk_categories, _df, _calculator):
+    """
+    CSV of the filtered customer list with decoded recommendations
+
+    Keyed by the data, the scoring profile and the risk filter, so reruns
+    from other widgets reuse it instead of re-encoding every row.
+    """
+    return _df.assign(
+        recommendations=_calculator.recommendation_codes(_df['recommendation_mask'])
+    ).to_csv(index=False)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Computing score velocity...")
+def velocity_histogram(as_of, window, _history):
+    """
+    Histogram of per-customer score velocity at a snapshot date
+
+    Keyed by the snapshot date and window, so the two partitions are only
+    read again when either changes (saving a snapshot clears the cache).
+
+    Returns:
+        Tuple of (counts, bin edges), or None if no snapshot is old enough
+    """
+    velocity = _history.score_velocity(days=window, as_of=as_of)
+    if velocity.empty:
+        return None
+    return np.histogram(velocity['velocity'], bins=40)
+
 if data_source == "Use Sample Data":
-    df = load_data("sample")
+    data_key = "sample-100"
+    load = lambda: load_data("sample")
 elif data_source == "Upload CSV":
     uploaded_file = st.sidebar.file_uploader("Upload customer data CSV", type=['csv'])
     if uploaded_file:
-        df = pd.read_csv(uploaded_file)
+        content = uploaded_file.getvalue()
+        data_key = hashlib.sha256(content).hexdigest()
+        load = lambda: read_customers(io.BytesIO(content))
     else:
         st.warning("Please upload a CSV file or use sample data")
         st.stop()
 
-# Initialize calculator
-calculator = HealthScoreCalculator()
-
-# Calculate health scores
-if df is not None:
-    df['health_score'] = df.apply(
-        lambda row: calculator.calculate_health_score(
-            login_frequency=row['login_frequency'],
-            feature_usage=row['feature_usage'],
-            support_tickets=row['support_tickets'],
-            days_since_last_login=row['days_since_last_login'],
-            contract_value=row['contract_value']
-        ),
-        axis=1
-    )
+# Scoring profiles
+profiles = load_profiles(PROFILES_FILE) if os.path.exists(PROFILES_FILE) else {'default': DEFAULT_PROFILE}
+profile_name = st.sidebar.selectbox("Scoring Profile", options=list(profiles))
+
+# Learned churn model, if one has been trained (python churn_model.py train)
+churn_model = None
+if os.path.exists(CHURN_MODEL_FILE) and st.sidebar.checkbox("Use learned churn model", value=True):
+    churn_model = ChurnModel.load(CHURN_MODEL_FILE)
 
-    df['risk_category'] = df['health_score'].apply(calculator.categorize_risk)
-    df['churn_risk'] = df['health_score'].apply(lambda x: calculator.predict_churn_probability(x))
+# Initialize calculator
+calculator = HealthScoreCalculator(profiles[profile_name], churn_model=churn_model)
+
+# Calculate health scores and chart data (cached)
+profile_key = profile_hash(calculator)
+try:
+    dashboard = build_dashboard_data(data_key, profile_key, load, calculator)
+except SchemaError as e:
+    st.error(f"Invalid customer data: {e.summary}")
+    if len(e.errors):
+        st.dataframe(e.errors.head(1000).astype({'value': str}), use_container_width=True, hide_index=True)
+    st.stop()
+df = dashboard['df']
+
+# Headline metrics from the same aggregates the streaming pipeline produces
+summary = dashboard['summary']
 
 # Main dashboard
 col1, col2, col3, col4 = st.columns(4)
@@ -73,21 +179,21 @@ col1, col2, col3, col4 = st.columns(4)
 with col1:
     st.metric(
         "Total Customers",
-        len(df),
+        summary.count,
         delta=None
     )
 
 with col2:
-    high_risk = len(df[df['risk_category'] == 'High Risk'])
+    high_risk = summary.risk_counts['High Risk']
     st.metric(
         "High Risk Customers",
         high_risk,
-        delta=f"{(high_risk/len(df)*100):.1f}%",
+        delta=f"{(high_risk/summary.count*100):.1f}%",
         delta_color="inverse"
     )
 
 with col3:
-    avg_score = df['health_score'].mean()
+    avg_score = summary.mean_score
     st.metric(
         "Avg Health Score",
         f"{avg_score:.1f}",
@@ -95,7 +201,7 @@ with col3:
     )
 
 with col4:
-    avg_churn = df['churn_risk'].mean()
+    avg_churn = summary.mean_churn
     st.metric(
         "Avg Churn Risk",
         f"{avg_churn:.1%}",
@@ -108,26 +214,29 @@ tab1, tab2, tab3, tab4 = st.tabs(["📈 Overview", "👥 Customer List", "🔍 I
 with tab1:
     st.header("Health Score Distribution")
 
-    # Health score histogram
-    fig_hist = px.histogram(
-        df,
-        x='health_score',
-        nbins=30,
+    # Health score histogram, binned server-side
+    histogram = dashboard['histogram']
+    fig_hist = px.bar(
+        histogram,
+        x='bin_center',
+        y='customers',
         color='risk_category',
         color_discrete_map={
             'Healthy': 'green',
             'At Risk': 'orange',
             'High Risk': 'red'
         },
+        labels={'bin_center': 'health_score'},
         title="Customer Health Score Distribution"
     )
+    fig_hist.update_layout(bargap=0)
     st.plotly_chart(fig_hist, use_container_width=True)
 
     # Risk category pie chart
     col1, col2 = st.columns(2)
 
     with col1:
-        risk_counts = df['risk_category'].value_counts()
+        risk_counts = pd.Series(summary.risk_counts)
         fig_pie = px.pie(
             values=risk_counts.values,
             names=risk_counts.index,
@@ -142,21 +251,43 @@ with tab1:
         st.plotly_chart(fig_pie, use_container_width=True)
 
     with col2:
-        # Scatter plot: Health Score vs Contract Value
-        fig_scatter = px.scatter(
-            df,
-            x='contract_value',
-            y='health_score',
-            color='risk_category',
-            size='churn_risk',
-            hover_data=['customer_id', 'login_frequency', 'support_tickets'],
-            title="Health Score vs Contract Value",
-            color_discrete_map={
-                'Healthy': 'green',
-                'At Risk': 'orange',
-                'High Risk': 'red'
-            }
+        # Health Score vs Contract Value, downsampled or binned server-side
+        scatter_mode = st.radio(
+            "Scatter view",
+            ["Sampled points", "Density"],
+            horizontal=True
         )
+
+        if scatter_mode == "Sampled points":
+            sample = dashboard['sample']
+            fig_scatter = px.scatter(
+                sample,
+                x='contract_value',
+                y='health_score',
+                color='risk_category',
+                size='churn_risk',
+                hover_data=['customer_id', 'login_frequency', 'support_tickets'],
+                title=f"Health Score vs Contract Value ({len(sample):,} of {len(df):,} customers)",
+                color_discrete_map={
+                    'Healthy': 'green',
+                    'At Risk': 'orange',
+                    'High Risk': 'red'
+                }
+            )
+        else:
+            counts, x_centers, y_centers = dashboard['density']
+            fig_scatter = go.Figure(go.Heatmap(
+                z=counts,
+                x=x_centers,
+                y=y_centers,
+                colorscale='Blues',
+                colorbar={'title': 'Customers'}
+            ))
+            fig_scatter.update_layout(
+                title="Health Score vs Contract Value (density)",
+                xaxis_title='contract_value',
+                yaxis_title='health_score'
+            )
         st.plotly_chart(fig_scatter, use_container_width=True)
 
 with tab2:
@@ -169,24 +300,29 @@ with tab2:
         default=['Healthy', 'At Risk', 'High Risk']
     )
 
-    filtered_df = df[df['risk_category'].isin(filter_risk)].copy()
+    # Filter the pre-sorted frame; filtering keeps the health score order
+    by_score = dashboard['by_score']
+    filtered_df = by_score[by_score['risk_category'].isin(filter_risk)]
 
-    # Sort by health score
-    filtered_df = filtered_df.sort_values('health_score', ascending=True)
+    # Display one page at a time so only visible rows are styled and sent
+    page_size = 100
+    num_pages = max(1, -(-len(filtered_df) // page_size))
+    page = st.number_input(f"Page (of {num_pages})", min_value=1, max_value=num_pages, value=1, step=1)
+    page_df, _ = paginate(filtered_df, page, page_size)
 
-    # Display table
     st.dataframe(
-        filtered_df[[
+        page_df[[
             'customer_id', 'health_score', 'churn_risk', 'risk_category',
             'login_frequency', 'feature_usage', 'support_tickets',
             'days_since_last_login', 'contract_value'
-        ]].style.background_gradient(subset=['health_score'], cmap='RdYlGn'),
+        ]].style.background_gradient(subset=['health_score'], cmap='RdYlGn', vmin=0, vmax=100),
         use_container_width=True,
         height=400
     )
+    st.caption(f"Showing {len(page_df):,} of {len(filtered_df):,} customers")
 
     # Download button
-    csv = filtered_df.to_csv(index=False)
+    csv = download_csv(data_key, profile_key, tuple(sorted(filter_risk)), filtered_df, calculator)
     st.download_button(
         label="Download Data as CSV",
         data=csv,
@@ -197,74 +333,127 @@ with tab2:
 with tab3:
     st.header("Individual Customer Analysis")
 
-    # Customer selector
-    customer_id = st.selectbox(
-        "Select Customer",
-        options=df['customer_id'].tolist()
-    )
+    customer_index = dashboard['index']
 
-    customer = df[df['customer_id'] == customer_id].iloc[0]
+    # Customer selector, narrowed by prefix search instead of listing every ID
+    search = st.text_input("Search Customer ID", placeholder="Type the start of a customer ID")
+    matches = customer_index.search(search.strip(), limit=50)
 
-    # Customer metrics
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        st.metric("Health Score", f"{customer['health_score']:.1f}")
-        st.metric("Risk Category", customer['risk_category'])
+    if not matches:
+        st.warning(f"No customers match '{search}'")
+    else:
+        customer_id = st.selectbox(
+            "Select Customer",
+            options=matches
+        )
 
-    with col2:
-        st.metric("Churn Probability", f"{customer['churn_risk']:.1%}")
-        st.metric("Contract Value", f"${customer['contract_value']:,.0f}")
-
-    with col3:
-        st.metric("Login Frequency", f"{customer['login_frequency']}/month")
-        st.metric("Support Tickets", int(customer['support_tickets']))
-
-    # Gauge chart for health score
-    fig_gauge = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
-        value=customer['health_score'],
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': "Health Score"},
-        gauge={
-            'axis': {'range': [None, 100]},
-            'bar': {'color': "darkblue"},
-            'steps': [
-                {'range': [0, 40], 'color': "red"},
-                {'range': [40, 70], 'color': "orange"},
-                {'range': [70, 100], 'color': "green"}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': 40
+        customer = customer_index.get(customer_id)
+
+        # Customer metrics
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.metric("Health Score", f"{customer['health_score']:.1f}")
+            st.metric("Risk Category", customer['risk_category'])
+
+        with col2:
+            st.metric("Churn Probability", f"{customer['churn_risk']:.1%}")
+            st.metric("Contract Value", f"${customer['contract_value']:,.0f}")
+
+        with col3:
+            st.metric("Login Frequency", f"{customer['login_frequency']}/month")
+            st.metric("Support Tickets", int(customer['support_tickets']))
+
+        # Gauge chart for health score
+        fig_gauge = go.Figure(go.Indicator(
+            mode="gauge+number+delta",
+            value=customer['health_score'],
+            domain={'x': [0, 1], 'y': [0, 1]},
+            title={'text': "Health Score"},
+            gauge={
+                'axis': {'range': [None, 100]},
+                'bar': {'color': "darkblue"},
+                'steps': [
+                    {'range': [0, calculator.profile.at_risk_threshold], 'color': "red"},
+                    {'range': [calculator.profile.at_risk_threshold, calculator.profile.healthy_threshold], 'color': "orange"},
+                    {'range': [calculator.profile.healthy_threshold, 100], 'color': "green"}
+                ],
+                'threshold': {
+                    'line': {'color': "red", 'width': 4},
+                    'thickness': 0.75,
+                    'value': calculator.profile.at_risk_threshold
+                }
             }
-        }
-    ))
-    st.plotly_chart(fig_gauge, use_container_width=True)
-
-    # Recommendations
-    st.subheader("Recommendations")
-    recommendations = calculator.get_recommendations(
-        health_score=customer['health_score'],
-        login_frequency=customer['login_frequency'],
-        support_tickets=customer['support_tickets'],
-        days_since_last_login=customer['days_since_last_login']
-    )
+        ))
+        st.plotly_chart(fig_gauge, use_container_width=True)
+
+        # Recommendations
+        st.subheader("Recommendations")
+        recommendations = calculator.decode_recommendations(customer['recommendation_mask'])
 
-    for rec in recommendations:
-        st.info(rec)
+        for rec in recommendations:
+            st.info(rec)
 
 with tab4:
     st.header("Trend Analysis")
-    st.info("This section would show time-series data if available. Add date columns to your data for trend analysis.")
+
+    history = ScoreHistory()
+
+    if st.button("Save current scores to history"):
+        history.append(date.today(), df, overwrite=True)
+        velocity_histogram.clear()
+        st.success(f"Saved snapshot for {date.today().isoformat()}")
+
+    snapshot_dates = history.snapshot_dates()
+
+    if not snapshot_dates:
+        st.info("No score history yet. Save a snapshot above, or run `python history.py backfill` for sample history.")
+    else:
+        window = st.slider("Rolling window (days)", min_value=1, max_value=30, value=7)
+
+        # Every trend chart is drawn from precomputed daily aggregates
+        trend = history.rolling_average(window=window)
+        fig_trend = px.line(
+            trend,
+            x='snapshot_date',
+            y=['mean_score', f'rolling_{window}d'],
+            title="Average Health Score Over Time"
+        )
+        st.plotly_chart(fig_trend, use_container_width=True)
+
+        cohort_trends = history.cohort_trends().reset_index()
+        fig_cohorts = px.line(
+            cohort_trends,
+            x='snapshot_date',
+            y=[column for column in cohort_trends.columns if column != 'snapshot_date'],
+            title="Average Health Score by Risk Cohort",
+            color_discrete_map={
+                'Healthy': 'green',
+                'At Risk': 'orange',
+                'High Risk': 'red'
+            }
+        )
+        st.plotly_chart(fig_cohorts, use_container_width=True)
+
+        velocity = velocity_histogram(snapshot_dates[-1], window, history)
+        if velocity is None:
+            st.info(f"Score velocity needs snapshots at least {window} days apart.")
+        else:
+            counts, edges = velocity
+            fig_velocity = px.bar(
+                x=(edges[:-1] + edges[1:]) / 2,
+                y=counts,
+                labels={'x': 'Score change per day', 'y': 'Customers'},
+                title=f"Score Velocity over the Last {window} Days"
+            )
+            st.plotly_chart(fig_velocity, use_container_width=True)
 
     # Feature importance
     st.subheader("Feature Importance for Health Score")
 
     feature_importance = pd.DataFrame({
         'Feature': ['Login Frequency', 'Feature Usage', 'Support Tickets', 'Days Since Last Login', 'Contract Value'],
-        'Weight': [0.30, 0.25, 0.20, 0.15, 0.10]
+        'Weight': [calculator.weights[metric] for metric in METRIC_COLUMNS]
     })
 
     fig_importance = px.bar(
@@ -278,6 +467,26 @@ with tab4:
     )
     st.plotly_chart(fig_importance, use_container_width=True)
 
+    # Side-by-side profile comparison, scored in a single pass
+    st.subheader("Scoring Profile Comparison")
+    compared = st.multiselect(
+        "Profiles to compare",
+        options=list(profiles),
+        default=list(profiles)[:2]
+    )
+    if compared:
+        st.dataframe(
+            compare_profiles(
+                data_key,
+                tuple(compared),
+                tuple(profile_hash(HealthScoreCalculator(profiles[name])) for name in compared),
+                df,
+                profiles
+            ),
+            use_container_width=True,
+            hide_index=True
+        )
+
 # Footer
 st.markdown("---")
 st.markdown("Built with Streamlit | Customer Health Score Calculator v1.0")
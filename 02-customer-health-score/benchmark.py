@@ -0,0 +1,242 @@
+"""
+Health Score Benchmark Suite
+Times the scoring hot paths and flags regressions against a stored baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from data_generator import generate_sample_data
+from health_score import HealthScoreCalculator
+from schema import read_customers
+
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+# Row-at-a-time cases are slow at scale; time them once instead of best-of-N
+SLOW_CASE_ROWS = 100_000
+
+
+def _apply_pipeline(calculator, df):
+    """The original dashboard scoring: three per-row apply passes"""
+    scored = df.copy()
+    scored['health_score'] = scored.apply(
+        lambda row: calculator.calculate_health_score(
+            login_frequency=row['login_frequency'],
+            feature_usage=row['feature_usage'],
+            support_tickets=row['support_tickets'],
+            days_since_last_login=row['days_since_last_login'],
+            contract_value=row['contract_value']
+        ),
+        axis=1
+    )
+    scored['risk_category'] = scored['health_score'].apply(calculator.categorize_risk)
+    scored['churn_risk'] = scored['health_score'].apply(lambda x: calculator.predict_churn_probability(x))
+    return scored
+
+
+def _per_row_scores(calculator, df):
+    """calculate_health_score called once per customer"""
+    return [
+        calculator.calculate_health_score(*row)
+        for row in df[['login_frequency', 'feature_usage', 'support_tickets',
+                       'days_since_last_login', 'contract_value']].itertuples(index=False)
+    ]
+
+
+def _per_row_recommendations(calculator, scored):
+    """get_recommendations called once per customer"""
+    return [
+        calculator.get_recommendations(*row)
+        for row in scored[['health_score', 'login_frequency', 'support_tickets',
+                           'days_since_last_login']].itertuples(index=False)
+    ]
+
+
+def _build_figures(scored):
+    """Build the Overview tab figures from server-side aggregates"""
+    import plotly.express as px
+
+    from aggregation import score_histogram, stratified_sample
+
+    histogram = score_histogram(scored, bins=30)
+    risk_counts = scored['risk_category'].value_counts()
+    return [
+        px.bar(histogram, x='bin_center', y='customers', color='risk_category'),
+        px.pie(values=risk_counts.values, names=risk_counts.index),
+        px.scatter(stratified_sample(scored, max_points=5000), x='contract_value', y='health_score',
+                   color='risk_category', size='churn_risk')
+    ]
+
+
+def _time(fn, repeats):
+    """Best wall-clock time of fn over `repeats` runs"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_suite(sizes=None, repeats=3, seed=42):
+    """
+    Run every benchmark case at every size
+
+    Args:
+        sizes: Row counts to benchmark (defaults to 1k, 100k and 1M)
+        repeats: Timed runs per fast case; the best is reported
+        seed: Random seed for generate_sample_data
+
+    Returns:
+        Dict with run metadata and a list of case results
+    """
+    calculator = HealthScoreCalculator()
+    results = []
+
+    try:
+        import plotly  # noqa: F401
+        has_plotly = True
+    except ImportError:
+        has_plotly = False
+
+    for rows in sizes or DEFAULT_SIZES:
+        df = generate_sample_data(rows, seed=seed)
+        scored = calculator.recommend_frame(calculator.score_frame(df))
+        slow_repeats = 1 if rows >= SLOW_CASE_ROWS else repeats
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'customers.csv')
+            df.to_csv(csv_path, index=False)
+
+            cases = [
+                ('calculate_health_score.per_row', lambda: _per_row_scores(calculator, df), slow_repeats),
+                ('dashboard.apply_pipeline', lambda: _apply_pipeline(calculator, df), slow_repeats),
+                ('dashboard.score_frame', lambda: calculator.score_frame(df), repeats),
+                ('get_recommendations.per_row', lambda: _per_row_recommendations(calculator, scored), slow_repeats),
+                ('recommendations.recommend_frame', lambda: calculator.recommend_frame(scored), repeats),
+                ('csv.load', lambda: pd.read_csv(csv_path), repeats),
+                ('csv.read_customers', lambda: read_customers(csv_path), repeats),
+            ]
+            if has_plotly:
+                cases.append(('figures.overview', lambda: _build_figures(scored), repeats))
+
+            for name, fn, case_repeats in cases:
+                seconds = _time(fn, case_repeats)
+                results.append({
+                    'case': name,
+                    'rows': rows,
+                    'seconds': seconds,
+                    'rows_per_sec': rows / seconds if seconds else float('inf')
+                })
+                print(f"{name:<36} {rows:>10,} rows  {seconds * 1000:>11.1f} ms  {rows / seconds:>14,.0f} rows/sec")
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeats': repeats,
+            'seed': seed
+        },
+        'results': results
+    }
+
+
+def compare(baseline, current, threshold=0.10):
+    """
+    Compare two benchmark runs case by case
+
+    Args:
+        baseline: Result dict from a previous run_suite
+        current: Result dict from the run under test
+        threshold: Allowed slowdown before a case is flagged (0.10 = 10%)
+
+    Returns:
+        List of comparison dicts; 'regression' is True for flagged cases
+    """
+    baseline_seconds = {(r['case'], r['rows']): r['seconds'] for r in baseline['results']}
+
+    comparisons = []
+    for result in current['results']:
+        key = (result['case'], result['rows'])
+        if key not in baseline_seconds:
+            continue
+        ratio = result['seconds'] / baseline_seconds[key]
+        comparisons.append({
+            'case': result['case'],
+            'rows': result['rows'],
+            'baseline_seconds': baseline_seconds[key],
+            'seconds': result['seconds'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold
+        })
+
+    return comparisons
+
+
+def print_comparison(comparisons, threshold):
+    """Print a comparison table; return the number of regressions"""
+    regressions = 0
+    print(f"\n=== Comparison against baseline (threshold {threshold:.0%}) ===")
+    for c in comparisons:
+        flag = "REGRESSION" if c['regression'] else ""
+        regressions += c['regression']
+        print(f"{c['case']:<36} {c['rows']:>10,} rows  {c['baseline_seconds'] * 1000:>10.1f} ms -> "
+              f"{c['seconds'] * 1000:>10.1f} ms  ({c['ratio']:.2f}x) {flag}")
+    print(f"\n{regressions} regression(s) found")
+    return regressions
+
+
+def main():
+    """Run the benchmark suite or compare results from the command line"""
+    parser = argparse.ArgumentParser(description="Health score benchmark suite")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Run the suite and write JSON results")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Row counts")
+    run_parser.add_argument('--repeats', type=int, default=3, help="Timed runs per fast case")
+    run_parser.add_argument('--output', default='benchmark_results.json', help="Results JSON file")
+    run_parser.add_argument('--baseline', help="Baseline JSON to compare against after the run")
+    run_parser.add_argument('--threshold', type=float, default=0.10, help="Allowed slowdown ratio")
+
+    compare_parser = subparsers.add_parser('compare', help="Compare two results files")
+    compare_parser.add_argument('baseline', help="Baseline results JSON")
+    compare_parser.add_argument('current', help="Current results JSON")
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help="Allowed slowdown ratio")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        current = run_suite(args.sizes, args.repeats)
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+        if not args.baseline:
+            return
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+
+    regressions = print_comparison(compare(baseline, current, args.threshold), args.threshold)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
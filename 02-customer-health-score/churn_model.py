@@ -0,0 +1,210 @@
+"""
+Learned Churn Model
+Logistic regression on the usage metrics with a NumPy-only batch inference path
+"""
+
+import argparse
+import hashlib
+import json
+import time
+from datetime import datetime
+
+import numpy as np
+
+from health_score import METRIC_COLUMNS, HealthScoreCalculator, churn_probabilities
+from schema import metric_matrix, read_customers
+
+
+class ChurnModel:
+    """Logistic churn model trained on the five usage metrics"""
+
+    def __init__(self, coef, intercept, metadata=None):
+        """
+        Args:
+            coef: Weight per metric in METRIC_COLUMNS order, on raw (unscaled) inputs
+            intercept: Model intercept
+            metadata: Optional dict describing how the model was trained
+        """
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.metadata = metadata or {}
+
+        if self.coef.shape != (len(METRIC_COLUMNS),):
+            raise ValueError(f"Expected {len(METRIC_COLUMNS)} coefficients, got {self.coef.shape}")
+
+    @classmethod
+    def train(cls, df, label_column='churned', C=1.0, max_iter=1000):
+        """
+        Fit a logistic regression on labeled customers
+
+        Inputs are standardized for fitting, then the scaling is folded into
+        the coefficients so inference is a single dot product on raw metrics.
+
+        Args:
+            df: DataFrame with the five usage metric columns and a 0/1 label
+            label_column: Column holding churn labels
+            C: Inverse regularization strength
+            max_iter: Solver iteration limit
+
+        Returns:
+            Trained ChurnModel
+        """
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.metrics import roc_auc_score
+
+        metrics = metric_matrix(df, METRIC_COLUMNS)
+        labels = df[label_column].to_numpy(dtype=np.int8)
+
+        mean = metrics.mean(axis=0)
+        std = metrics.std(axis=0)
+        std[std == 0] = 1.0
+
+        model = LogisticRegression(C=C, max_iter=max_iter)
+        model.fit((metrics - mean) / std, labels)
+
+        coef = model.coef_[0] / std
+        intercept = model.intercept_[0] - np.dot(mean / std, model.coef_[0])
+
+        churn_model = cls(coef, intercept, metadata={
+            'trained_at': datetime.now().isoformat(),
+            'rows': int(len(df)),
+            'churn_rate': float(labels.mean())
+        })
+        churn_model.metadata['train_auc'] = float(roc_auc_score(labels, churn_model.predict_proba(metrics)))
+        return churn_model
+
+    def predict_proba(self, metrics):
+        """
+        Churn probabilities for a batch of customers
+
+        Args:
+            metrics: Array shaped (rows, 5) in METRIC_COLUMNS order
+
+        Returns:
+            Array of churn probabilities rounded to 4 decimals, like
+            HealthScoreCalculator.predict_churn_probability
+        """
+        logits = np.asarray(metrics, dtype=np.float64) @ self.coef
+        logits += self.intercept
+        return np.round(1 / (1 + np.exp(-logits)), 4)
+
+    def predict_frame(self, df):
+        """Churn probabilities for a customer DataFrame"""
+        return self.predict_proba(metric_matrix(df, METRIC_COLUMNS))
+
+    def fingerprint(self):
+        """Stable hash of the model parameters"""
+        payload = json.dumps({'coef': self.coef.tolist(), 'intercept': self.intercept}).encode()
+        return hashlib.sha256(payload).hexdigest()[:16]
+
+    def save(self, path='churn_model.npz'):
+        """Save the model as a small uncompressed .npz (no pickle)"""
+        np.savez(
+            path,
+            coef=self.coef,
+            intercept=np.float64(self.intercept),
+            feature_names=np.array(METRIC_COLUMNS),
+            metadata=np.array(json.dumps(self.metadata))
+        )
+
+    @classmethod
+    def load(cls, path='churn_model.npz'):
+        """Load a model saved with save()"""
+        with np.load(path, allow_pickle=False) as data:
+            feature_names = data['feature_names'].tolist()
+            if feature_names != METRIC_COLUMNS:
+                raise ValueError(f"Model features {feature_names} do not match {METRIC_COLUMNS}")
+            return cls(data['coef'], data['intercept'], metadata=json.loads(str(data['metadata'])))
+
+
+def synthetic_labels(df, seed=42):
+    """
+    Draw 0/1 churn labels for synthetic customers
+
+    Churn odds rise with inactivity and support load and fall with
+    engagement, so a trained model has a real signal to recover.
+    """
+    rng = np.random.default_rng(seed)
+    logits = (
+        -0.15 * df['login_frequency'].to_numpy()
+        - 0.03 * df['feature_usage'].to_numpy()
+        + 0.20 * df['support_tickets'].to_numpy()
+        + 0.05 * df['days_since_last_login'].to_numpy()
+        - 0.00001 * df['contract_value'].to_numpy()
+        + 0.5
+    )
+    return (rng.random(len(df)) < 1 / (1 + np.exp(-logits))).astype(np.int8)
+
+
+def benchmark(model, num_rows=1_000_000, repeats=5, seed=42):
+    """
+    Compare batch churn inference latency against the fixed sigmoid
+
+    Args:
+        model: ChurnModel to benchmark
+        num_rows: Synthetic customers per batch
+        repeats: Timed runs per method (best is reported)
+        seed: Random seed for the synthetic data
+
+    Returns:
+        Dict of method -> rows/sec
+    """
+    from data_generator import generate_chunk
+
+    df = generate_chunk(0, num_rows, num_rows, seed=seed)
+    metrics = metric_matrix(df, METRIC_COLUMNS)
+    health_score = HealthScoreCalculator().score_frame(df)['health_score'].to_numpy()
+
+    methods = {
+        'sigmoid': lambda: churn_probabilities(health_score),
+        'churn_model': lambda: model.predict_proba(metrics)
+    }
+
+    results = {}
+    for name, run in methods.items():
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        results[name] = num_rows / best
+        print(f"{name:>12}: {best * 1000:8.1f} ms per {num_rows:,} rows ({results[name]:,.0f} rows/sec)")
+
+    return results
+
+
+def main():
+    """Train, inspect or benchmark a churn model from the command line"""
+    parser = argparse.ArgumentParser(description="Learned churn model")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help="Train on a labeled customer CSV")
+    train_parser.add_argument('input', nargs='?', help="Customer CSV (customer_id, the five metrics and a churn label; synthetic if omitted)")
+    train_parser.add_argument('--label', default='churned', help="Label column")
+    train_parser.add_argument('--rows', type=int, default=100_000, help="Synthetic rows when no input is given")
+    train_parser.add_argument('--output', default='churn_model.npz', help="Model file")
+
+    benchmark_parser = subparsers.add_parser('benchmark', help="Compare latency with the fixed sigmoid")
+    benchmark_parser.add_argument('--model', default='churn_model.npz', help="Model file")
+    benchmark_parser.add_argument('--rows', type=int, default=1_000_000, help="Rows per batch")
+    args = parser.parse_args()
+
+    if args.command == 'train':
+        if args.input:
+            df = read_customers(args.input)
+        else:
+            from data_generator import generate_chunk
+
+            df = generate_chunk(0, args.rows, args.rows)
+            df[args.label] = synthetic_labels(df)
+
+        model = ChurnModel.train(df, label_column=args.label)
+        model.save(args.output)
+        print(f"Trained on {model.metadata['rows']} customers (train AUC {model.metadata['train_auc']:.3f})")
+        print(f"Saved model to {args.output}")
+    else:
+        benchmark(ChurnModel.load(args.model), num_rows=args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Customer Lookup Index
+Constant-time customer_id lookup and prefix search over scored customers
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class CustomerIndex:
+    """Index of a scored customer DataFrame keyed by customer_id"""
+
+    def __init__(self, df):
+        """
+        Build the index
+
+        Args:
+            df: Scored customer DataFrame with a customer_id column
+        """
+        self.df = df
+        ids = df['customer_id'].astype(str).to_numpy(dtype=object)
+
+        # Hash index for exact lookups
+        self._index = pd.Index(ids)
+
+        # Sorted ids for prefix search by binary search
+        order = np.argsort(ids, kind='stable')
+        self._sorted_ids = ids[order]
+
+    def __len__(self):
+        return len(self._sorted_ids)
+
+    def __contains__(self, customer_id):
+        return customer_id in self._index
+
+    def position(self, customer_id):
+        """
+        Row position of a customer in the indexed DataFrame
+
+        Raises:
+            KeyError: If the customer is not indexed
+        """
+        loc = self._index.get_loc(customer_id)
+        if isinstance(loc, slice):
+            return loc.start
+        if isinstance(loc, np.ndarray):
+            return int(np.flatnonzero(loc)[0])
+        return loc
+
+    def get(self, customer_id):
+        """Return the customer's scored row as a Series"""
+        return self.df.iloc[self.position(customer_id)]
+
+    def search(self, prefix, limit=20):
+        """
+        Customer IDs starting with a prefix, in sorted order
+
+        Args:
+            prefix: Leading characters of the customer_id (empty matches all)
+            limit: Maximum number of matches to return
+
+        Returns:
+            List of matching customer IDs
+        """
+        start = np.searchsorted(self._sorted_ids, prefix, side='left')
+        stop = np.searchsorted(self._sorted_ids, prefix + '\U0010ffff', side='left')
+        return self._sorted_ids[start:min(stop, start + limit)].tolist()
@@ -3,6 +3,10 @@ Sample Data Generator
 Generates realistic sample customer data for testing
 """
 
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 
@@ -40,10 +44,145 @@ def generate_sample_data(num_customers=100, seed=42):
     return df
 
 
+def generate_chunk(chunk_index, chunk_size, num_customers, seed=42):
+    """
+    Generate one chunk of a large synthetic customer book
+
+    Each chunk draws from its own numpy.random.Generator seeded by
+    (seed, chunk_index), so any chunk can be produced independently and in
+    any order with identical results.
+
+    Args:
+        chunk_index: Zero-based chunk number
+        chunk_size: Customers per chunk
+        num_customers: Total customers in the book (the last chunk may be short)
+        seed: Base random seed
+
+    Returns:
+        DataFrame with customer data for the chunk
+    """
+    start = chunk_index * chunk_size
+    size = max(0, min(chunk_size, num_customers - start))
+    rng = np.random.default_rng([seed, chunk_index])
+
+    ids = np.arange(start + 1, start + size + 1).astype(str)
+
+    return pd.DataFrame({
+        'customer_id': np.char.add('CUST-', np.char.zfill(ids, 4)),
+        'login_frequency': rng.exponential(scale=10, size=size).clip(0, 30).round(1),
+        'feature_usage': (rng.beta(2, 5, size=size) * 100).round(1),
+        'support_tickets': rng.poisson(lam=3, size=size).clip(0, 20),
+        'days_since_last_login': rng.exponential(scale=20, size=size).clip(0, 90).round(0).astype(int),
+        'contract_value': rng.lognormal(mean=10, sigma=0.8, size=size).clip(1000, 100000).round(0).astype(int)
+    })
+
+
+def iter_large_data(num_customers, chunk_size=1_000_000, seed=42):
+    """
+    Yield a large synthetic customer book chunk by chunk
+
+    Args:
+        num_customers: Total customers to generate
+        chunk_size: Customers per chunk
+        seed: Base random seed
+
+    Yields:
+        DataFrames of at most chunk_size customers
+    """
+    num_chunks = -(-num_customers // chunk_size)
+    for chunk_index in range(num_chunks):
+        yield generate_chunk(chunk_index, chunk_size, num_customers, seed)
+
+
+def write_large_data(path, num_customers, chunk_size=1_000_000, seed=42):
+    """
+    Stream a large synthetic customer book into one CSV or Parquet file
+
+    Returns:
+        Number of customers written
+    """
+    from streaming import ChunkWriter
+
+    writer = ChunkWriter(path)
+    try:
+        for chunk in iter_large_data(num_customers, chunk_size, seed):
+            writer.write(chunk)
+    finally:
+        writer.close()
+
+    return num_customers
+
+
+def _write_part(output_dir, extension, chunk_index, chunk_size, num_customers, seed):
+    """Write a single chunk to its own part file"""
+    chunk = generate_chunk(chunk_index, chunk_size, num_customers, seed)
+    path = os.path.join(output_dir, f'part-{chunk_index:05d}{extension}')
+    if extension == '.parquet':
+        chunk.to_parquet(path, index=False)
+    else:
+        chunk.to_csv(path, index=False)
+    return path
+
+
+def write_large_data_parts(output_dir, num_customers, chunk_size=1_000_000, seed=42,
+                           workers=None, file_format='parquet'):
+    """
+    Generate a large synthetic customer book as part files, in parallel
+
+    Args:
+        output_dir: Directory to write part-NNNNN files into
+        num_customers: Total customers to generate
+        chunk_size: Customers per part file
+        seed: Base random seed
+        workers: Number of worker processes (defaults to the CPU count)
+        file_format: 'parquet' or 'csv'
+
+    Returns:
+        List of part file paths in chunk order
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    extension = f'.{file_format}'
+    num_chunks = -(-num_customers // chunk_size)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_write_part, output_dir, extension, chunk_index, chunk_size, num_customers, seed)
+            for chunk_index in range(num_chunks)
+        ]
+        return [future.result() for future in futures]
+
+
+def main():
+    """Generate sample data from the command line"""
+    parser = argparse.ArgumentParser(description="Generate synthetic customer data")
+    parser.add_argument('--rows', type=int, default=150, help="Number of customers")
+    parser.add_argument('--output', default='sample_customer_data.csv',
+                        help="Output .csv/.parquet file, or a directory when --workers > 1")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    parser.add_argument('--chunk-size', type=int,
+                        help="Customers per chunk; enables the fast chunked generator")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Generate chunks in parallel into part files under --output")
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet',
+                        help="Part file format when --workers > 1")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        parts = write_large_data_parts(
+            args.output, args.rows, args.chunk_size or 1_000_000, args.seed, args.workers, args.format
+        )
+        print(f"Generated {args.rows} customers in {len(parts)} part files under {args.output}")
+    elif args.chunk_size:
+        write_large_data(args.output, args.rows, args.chunk_size, args.seed)
+        print(f"Generated {args.rows} customers in {args.output}")
+    else:
+        # Generate and save sample data
+        df = generate_sample_data(args.rows, seed=args.seed)
+        df.to_csv(args.output, index=False)
+        print(f"Generated {len(df)} sample customers")
+        print("\nSample data:")
+        print(df.head())
+
+
 if __name__ == "__main__":
-    # Generate and save sample data
-    df = generate_sample_data(150)
-    df.to_csv('sample_customer_data.csv', index=False)
-    print(f"Generated {len(df)} sample customers")
-    print("\nSample data:")
-    print(df.head())
+    main()
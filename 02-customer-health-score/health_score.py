@@ -3,21 +3,291 @@ Health Score Calculator Module
 Calculates customer health scores based on usage metrics
 """
 
+import copy
+import json
+import operator
+
 import numpy as np
+import pandas as pd
+
+from schema import as_float64, metric_matrix
+
+
+METRIC_COLUMNS = [
+    'login_frequency',
+    'feature_usage',
+    'support_tickets',
+    'days_since_last_login',
+    'contract_value'
+]
+
+# Recommendation rules in display order: (code, input, comparison, threshold, message).
+# Rule i sets bit i of a recommendation mask; the fallback uses the next bit.
+RECOMMENDATION_RULES = [
+    ('check_in', 'health_score', '<', 40,
+     "🚨 HIGH PRIORITY: Schedule immediate check-in call with customer success team"),
+    ('re_engage', 'login_frequency', '<', 5,
+     "📧 Low engagement detected. Send re-engagement campaign highlighting key features"),
+    ('support_review', 'support_tickets', '>', 10,
+     "🎯 High support volume. Investigate common issues and provide proactive solutions"),
+    ('reactivation_email', 'days_since_last_login', '>', 30,
+     "⏰ Customer hasn't logged in recently. Send personalized re-activation email"),
+    ('phone_outreach', 'days_since_last_login', '>', 60,
+     "📞 Consider phone outreach to understand barriers to usage"),
+    ('upsell', 'health_score', '>=', 70,
+     "✅ Healthy customer! Consider upsell opportunities or request testimonial"),
+]
+FALLBACK_RECOMMENDATION = ('stable', "✓ Customer is stable. Continue regular monitoring")
+
+RISK_LABELS = np.array(["Healthy", "At Risk", "High Risk"], dtype=object)
+
+COMPARISONS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+class ScoringProfile:
+    """Named set of metric weights, normalization ranges and risk thresholds"""
+
+    def __init__(self, name, weights, ranges, healthy_threshold=70, at_risk_threshold=40):
+        """
+        Args:
+            name: Profile name
+            weights: Dict of metric -> weight
+            ranges: Dict of metric -> (min, max, invert)
+            healthy_threshold: Minimum score categorized as Healthy
+            at_risk_threshold: Minimum score categorized as At Risk
+        """
+        missing = [metric for metric in METRIC_COLUMNS if metric not in weights or metric not in ranges]
+        if missing:
+            raise ValueError(f"Profile '{name}' is missing metrics: {', '.join(missing)}")
+
+        self.name = name
+        self.weights = dict(weights)
+        self.ranges = {metric: tuple(ranges[metric]) for metric in METRIC_COLUMNS}
+        self.healthy_threshold = healthy_threshold
+        self.at_risk_threshold = at_risk_threshold
+
+    @classmethod
+    def from_dict(cls, name, config):
+        """Build a profile from its JSON config entry"""
+        thresholds = config.get('thresholds', {})
+        return cls(
+            name,
+            weights=config['weights'],
+            ranges={
+                metric: (spec['min'], spec['max'], spec.get('invert', False))
+                for metric, spec in config['ranges'].items()
+            },
+            healthy_threshold=thresholds.get('healthy', 70),
+            at_risk_threshold=thresholds.get('at_risk', 40)
+        )
+
+    def to_dict(self):
+        """Return the profile in its JSON config form"""
+        return {
+            'weights': dict(self.weights),
+            'ranges': {
+                metric: {'min': min_val, 'max': max_val, 'invert': invert}
+                for metric, (min_val, max_val, invert) in self.ranges.items()
+            },
+            'thresholds': {
+                'healthy': self.healthy_threshold,
+                'at_risk': self.at_risk_threshold
+            }
+        }
+
+
+DEFAULT_PROFILE = ScoringProfile(
+    'default',
+    weights={
+        'login_frequency': 0.30,
+        'feature_usage': 0.25,
+        'support_tickets': 0.20,
+        'days_since_last_login': 0.15,
+        'contract_value': 0.10
+    },
+    ranges={
+        'login_frequency': (0, 30, False),
+        'feature_usage': (0, 100, False),
+        'support_tickets': (0, 20, True),
+        'days_since_last_login': (0, 90, True),
+        'contract_value': (0, 100000, False)
+    }
+)
+
+
+def load_profiles(path='scoring_profiles.json'):
+    """
+    Load scoring profiles from a JSON config file
+
+    Args:
+        path: JSON file mapping profile name -> {weights, ranges, thresholds}
+
+    Returns:
+        Dict of profile name -> ScoringProfile
+    """
+    with open(path) as f:
+        config = json.load(f)
+
+    return {name: ScoringProfile.from_dict(name, entry) for name, entry in config.items()}
+
+
+class CompiledProfiles:
+    """One or more scoring profiles compiled into dense arrays"""
+
+    def __init__(self, profiles):
+        """
+        Args:
+            profiles: List of ScoringProfile objects
+
+        Arrays are shaped (metrics, profiles) so a (rows, metrics) block
+        broadcasts against all profiles at once.
+        """
+        self.names = [profile.name for profile in profiles]
+        self.weights = np.array([[p.weights[m] for p in profiles] for m in METRIC_COLUMNS], dtype=np.float64)
+        self.mins = np.array([[p.ranges[m][0] for p in profiles] for m in METRIC_COLUMNS], dtype=np.float64)
+        self.spans = np.array(
+            [[p.ranges[m][1] - p.ranges[m][0] for p in profiles] for m in METRIC_COLUMNS], dtype=np.float64
+        )
+        self.invert = np.array([[p.ranges[m][2] for p in profiles] for m in METRIC_COLUMNS], dtype=bool)
+        self._sign = np.where(self.invert, -1.0, 1.0)
+        self._offset = np.where(self.invert, 1.0, 0.0)
+        self.healthy = np.array([p.healthy_threshold for p in profiles], dtype=np.float64)
+        self.at_risk = np.array([p.at_risk_threshold for p in profiles], dtype=np.float64)
+
+    def health_scores(self, metrics, block_size=16_384):
+        """
+        Score a metric matrix under every compiled profile in one pass
+
+        Args:
+            metrics: Array shaped (rows, 5) in METRIC_COLUMNS order
+            block_size: Rows per block; blocks are sized to stay in cache
+
+        Returns:
+            Array shaped (rows, profiles) of rounded health scores
+        """
+        metrics = np.asarray(metrics, dtype=np.float64)
+        scores = np.empty((len(metrics), len(self.names)), dtype=np.float64)
+        buffer = np.empty((min(block_size, len(metrics)), len(METRIC_COLUMNS), len(self.names)))
+
+        for start in range(0, len(metrics), block_size):
+            block = metrics[start:start + block_size, :, np.newaxis]
+            normalized = buffer[:len(block)]
+
+            np.subtract(block, self.mins, out=normalized)
+            np.divide(normalized, self.spans, out=normalized)
+
+            # Same clamp comparisons as normalize_score, so NaN behaves identically
+            np.copyto(normalized, 1.0, where=~(normalized < 1))
+            np.copyto(normalized, 0.0, where=~(normalized > 0))
+
+            # 1 - x for inverted metrics, x otherwise
+            np.multiply(normalized, self._sign, out=normalized)
+            np.add(normalized, self._offset, out=normalized)
+
+            np.multiply(normalized, 100, out=normalized)
+            np.multiply(normalized, self.weights, out=normalized)
+
+            # Accumulate in metric order to match calculate_health_score exactly
+            total = scores[start:start + block_size]
+            np.copyto(total, normalized[:, 0])
+            for i in range(1, len(METRIC_COLUMNS)):
+                total += normalized[:, i]
+
+        return round_like_python(scores, 2)
+
+    def risk_codes(self, health_scores):
+        """Risk category codes (indexes into RISK_LABELS) for a score array of any shape"""
+        # 0 = Healthy, 1 = At Risk, 2 = High Risk; NaN falls through to High Risk
+        return 2 - (health_scores >= self.at_risk).astype(np.int8) - (health_scores >= self.healthy)
+
+    def risk_categories(self, health_scores):
+        """Risk categories for a (rows, profiles) score array"""
+        return RISK_LABELS[self.risk_codes(health_scores)]
+
+
+def round_like_python(values, decimals):
+    """
+    Round an array in place exactly as Python's round() rounds each float
+
+    np.round scales by 10**decimals before rounding, which can move a value
+    lying just off a halfway point onto it (or across it). Those elements are
+    the only ones where the two disagree, so they are re-rounded with round().
+    """
+    scaled = values * 10.0 ** decimals
+    near_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    suspects = np.flatnonzero(near_half)
+    exact = [round(float(value), decimals) for value in values.flat[suspects]]
+
+    np.round(values, decimals, out=values)
+    values.flat[suspects] = exact
+    return values
+
+
+def churn_probabilities(health_scores):
+    """Vectorized predict_churn_probability"""
+    return np.round(1 / (1 + np.exp((health_scores - 50) / 10)), 4)
+
+
+def score_profiles(df, profiles):
+    """
+    Score one dataset under several profiles in a single pass
+
+    Args:
+        df: DataFrame with the five usage metric columns
+        profiles: List of ScoringProfile objects (e.g. A/B variants)
+
+    Returns:
+        DataFrame with health_score_<name>, risk_category_<name> and
+        churn_risk_<name> columns for each profile, aligned to df's index
+    """
+    compiled = CompiledProfiles(profiles)
+    scores = compiled.health_scores(metric_matrix(df, METRIC_COLUMNS))
+    categories = compiled.risk_categories(scores)
+    churn = churn_probabilities(scores)
+
+    columns = {}
+    for i, name in enumerate(compiled.names):
+        columns[f'health_score_{name}'] = scores[:, i]
+        columns[f'risk_category_{name}'] = categories[:, i]
+        columns[f'churn_risk_{name}'] = churn[:, i]
+
+    return pd.DataFrame(columns, index=df.index)
 
 
 class HealthScoreCalculator:
     """Calculator for customer health scores"""
 
-    def __init__(self):
-        """Initialize with default weights"""
-        self.weights = {
-            'login_frequency': 0.30,
-            'feature_usage': 0.25,
-            'support_tickets': 0.20,
-            'days_since_last_login': 0.15,
-            'contract_value': 0.10
-        }
+    def __init__(self, profile=None, churn_model=None):
+        """
+        Initialize with a scoring profile
+
+        Args:
+            profile: ScoringProfile to score with (the default weights if None)
+            churn_model: Optional trained model (e.g. churn_model.ChurnModel) whose
+                predict_proba(metrics) replaces the fixed churn sigmoid
+        """
+        self.profile = copy.deepcopy(profile or DEFAULT_PROFILE)
+        self.churn_model = churn_model
+        self.weights = self.profile.weights
+        self._compiled = None
+        self._compiled_key = None
+
+    def compiled(self):
+        """
+        The profile compiled into dense arrays
+
+        Recompiled only when the weights, ranges or thresholds have changed.
+        """
+        key = json.dumps(self.profile.to_dict(), sort_keys=True)
+        if key != self._compiled_key:
+            self._compiled = CompiledProfiles([self.profile])
+            self._compiled_key = key
+        return self._compiled
 
     def normalize_score(self, value, min_val, max_val, invert=False):
         """
@@ -58,12 +328,14 @@ class HealthScoreCalculator:
         Returns:
             Health score (0-100)
         """
+        ranges = self.profile.ranges
+
         # Normalize each metric
-        login_score = self.normalize_score(login_frequency, 0, 30, invert=False)
-        feature_score = self.normalize_score(feature_usage, 0, 100, invert=False)
-        support_score = self.normalize_score(support_tickets, 0, 20, invert=True)
-        recency_score = self.normalize_score(days_since_last_login, 0, 90, invert=True)
-        value_score = self.normalize_score(contract_value, 0, 100000, invert=False)
+        login_score = self.normalize_score(login_frequency, *ranges['login_frequency'])
+        feature_score = self.normalize_score(feature_usage, *ranges['feature_usage'])
+        support_score = self.normalize_score(support_tickets, *ranges['support_tickets'])
+        recency_score = self.normalize_score(days_since_last_login, *ranges['days_since_last_login'])
+        value_score = self.normalize_score(contract_value, *ranges['contract_value'])
 
         # Calculate weighted score
         health_score = (
@@ -86,28 +358,101 @@ class HealthScoreCalculator:
         Returns:
             Risk category string
         """
-        if health_score >= 70:
+        if health_score >= self.profile.healthy_threshold:
             return "Healthy"
-        elif health_score >= 40:
+        elif health_score >= self.profile.at_risk_threshold:
             return "At Risk"
         else:
             return "High Risk"
 
-    def predict_churn_probability(self, health_score):
+    def predict_churn_probability(self, health_score, metrics=None):
         """
         Predict churn probability based on health score
 
         Args:
             health_score: Health score (0-100)
+            metrics: Optional dict of the five usage metrics; used instead of
+                the health score when a churn model is configured
 
         Returns:
             Churn probability (0-1)
         """
+        if self.churn_model is not None and metrics is not None:
+            row = np.array([[metrics[metric] for metric in METRIC_COLUMNS]], dtype=np.float64)
+            return float(self.churn_model.predict_proba(row)[0])
+
         # Sigmoid-like function for churn probability
         # High health score = low churn probability
         churn_prob = 1 / (1 + np.exp((health_score - 50) / 10))
         return round(churn_prob, 4)
 
+    def score_arrays(
+        self,
+        login_frequency,
+        feature_usage,
+        support_tickets,
+        days_since_last_login,
+        contract_value
+    ):
+        """
+        Score whole metric columns at once
+
+        Args:
+            login_frequency: Array of logins per month
+            feature_usage: Array of features used (0-100)
+            support_tickets: Array of support ticket counts
+            days_since_last_login: Array of days since last login
+            contract_value: Array of annual contract values
+
+        Returns:
+            Tuple of (health_score, risk_category, churn_risk) arrays, matching
+            calculate_health_score, categorize_risk and predict_churn_probability
+            (churn_risk comes from the churn model when one is configured)
+        """
+        metrics = np.column_stack([
+            as_float64(login_frequency),
+            as_float64(feature_usage),
+            as_float64(support_tickets),
+            as_float64(days_since_last_login),
+            as_float64(contract_value)
+        ])
+
+        compiled = self.compiled()
+        health_score = compiled.health_scores(metrics)
+        risk_category = compiled.risk_categories(health_score)[:, 0]
+        health_score = health_score[:, 0]
+
+        if self.churn_model is not None:
+            churn_risk = self.churn_model.predict_proba(metrics)
+        else:
+            churn_risk = churn_probabilities(health_score)
+
+        return health_score, risk_category, churn_risk
+
+    def score_frame(self, df):
+        """
+        Score a customer DataFrame in one vectorized pass
+
+        Args:
+            df: DataFrame with the five usage metric columns
+
+        Returns:
+            Copy of df with health_score, risk_category and churn_risk columns
+        """
+        health_score, risk_category, churn_risk = self.score_arrays(
+            login_frequency=df['login_frequency'].to_numpy(),
+            feature_usage=df['feature_usage'].to_numpy(),
+            support_tickets=df['support_tickets'].to_numpy(),
+            days_since_last_login=df['days_since_last_login'].to_numpy(),
+            contract_value=df['contract_value'].to_numpy()
+        )
+
+        return df.assign(
+            health_score=health_score,
+            risk_category=risk_category,
+            churn_risk=churn_risk
+        )
+
     def get_recommendations(
         self,
         health_score,
@@ -127,27 +472,101 @@ class HealthScoreCalculator:
         Returns:
             List of recommendation strings
         """
-        recommendations = []
+        values = {
+            'health_score': health_score,
+            'login_frequency': login_frequency,
+            'support_tickets': support_tickets,
+            'days_since_last_login': days_since_last_login
+        }
 
-        if health_score < 40:
-            recommendations.append("🚨 HIGH PRIORITY: Schedule immediate check-in call with customer success team")
+        recommendations = [
+            message
+            for _, column, comparison, threshold, message in RECOMMENDATION_RULES
+            if COMPARISONS[comparison](values[column], threshold)
+        ]
 
-        if login_frequency < 5:
-            recommendations.append("📧 Low engagement detected. Send re-engagement campaign highlighting key features")
+        if not recommendations:
+            recommendations.append(FALLBACK_RECOMMENDATION[1])
 
-        if support_tickets > 10:
-            recommendations.append("🎯 High support volume. Investigate common issues and provide proactive solutions")
+        return recommendations
 
-        if days_since_last_login > 30:
-            recommendations.append("⏰ Customer hasn't logged in recently. Send personalized re-activation email")
+    def recommendation_masks(
+        self,
+        health_score,
+        login_frequency,
+        support_tickets,
+        days_since_last_login
+    ):
+        """
+        Evaluate every recommendation rule over whole columns
 
-        if days_since_last_login > 60:
-            recommendations.append("📞 Consider phone outreach to understand barriers to usage")
+        Args:
+            health_score: Array of health scores
+            login_frequency: Array of logins per month
+            support_tickets: Array of support ticket counts
+            days_since_last_login: Array of days since last login
+
+        Returns:
+            uint8 array with bit i set when RECOMMENDATION_RULES[i] applies,
+            or the fallback bit when no rule does
+        """
+        values = {
+            'health_score': np.asarray(health_score),
+            'login_frequency': np.asarray(login_frequency),
+            'support_tickets': np.asarray(support_tickets),
+            'days_since_last_login': np.asarray(days_since_last_login)
+        }
 
-        if health_score >= 70:
-            recommendations.append("✅ Healthy customer! Consider upsell opportunities or request testimonial")
+        masks = np.zeros(len(values['health_score']), dtype=np.uint8)
+        for bit, (_, column, comparison, threshold, _) in enumerate(RECOMMENDATION_RULES):
+            masks |= COMPARISONS[comparison](values[column], threshold).astype(np.uint8) << bit
 
-        if not recommendations:
-            recommendations.append("✓ Customer is stable. Continue regular monitoring")
+        masks[masks == 0] = 1 << len(RECOMMENDATION_RULES)
+        return masks
 
-        return recommendations
+    def recommend_frame(self, df):
+        """
+        Add a recommendation_mask column to a scored DataFrame
+
+        Args:
+            df: DataFrame returned by score_frame
+
+        Returns:
+            Copy of df with a uint8 recommendation_mask column
+        """
+        return df.assign(recommendation_mask=self.recommendation_masks(
+            health_score=df['health_score'].to_numpy(),
+            login_frequency=df['login_frequency'].to_numpy(),
+            support_tickets=df['support_tickets'].to_numpy(),
+            days_since_last_login=df['days_since_last_login'].to_numpy()
+        ))
+
+    @staticmethod
+    def decode_recommendations(mask):
+        """
+        Recommendation messages for one mask, in the same order as get_recommendations
+
+        Args:
+            mask: Recommendation mask from recommendation_masks
+        """
+        rules = RECOMMENDATION_RULES + [(FALLBACK_RECOMMENDATION[0], None, None, None, FALLBACK_RECOMMENDATION[1])]
+        return [rule[4] for bit, rule in enumerate(rules) if int(mask) >> bit & 1]
+
+    @staticmethod
+    def recommendation_codes(masks, separator=';'):
+        """
+        Compact rule-code strings for export, e.g. "check_in;re_engage"
+
+        Every possible mask is decoded once into a lookup table, so this is a
+        single vectorized take over the masks.
+
+        Args:
+            masks: Array of recommendation masks
+            separator: String placed between rule codes
+        """
+        codes = [rule[0] for rule in RECOMMENDATION_RULES] + [FALLBACK_RECOMMENDATION[0]]
+        table = np.array([
+            separator.join(code for bit, code in enumerate(codes) if mask >> bit & 1)
+            for mask in range(1 << len(codes))
+        ], dtype=object)
+        return table[np.asarray(masks, dtype=np.intp)]
@@ -0,0 +1,271 @@
+"""
+Health Score History
+Append-only, date-partitioned score history with precomputed daily trends
+"""
+
+import argparse
+import os
+import shutil
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+
+HISTORY_COLUMNS = ['customer_id', 'health_score', 'churn_risk', 'risk_category']
+AGGREGATES_FILE = 'daily_aggregates.parquet'
+ALL_CUSTOMERS = 'All Customers'
+
+
+def _as_date(value):
+    """Coerce a date, datetime or ISO string to a date"""
+    return pd.Timestamp(value).date()
+
+
+class ScoreHistory:
+    """Columnar history of per-customer scores keyed by snapshot date"""
+
+    def __init__(self, root='data/history'):
+        """
+        Open (or create) a history directory
+
+        Layout:
+            root/snapshots/snapshot_date=YYYY-MM-DD/scores.parquet
+            root/daily_aggregates.parquet
+
+        Args:
+            root: Directory holding the history
+        """
+        self.root = root
+        self.snapshot_dir = os.path.join(root, 'snapshots')
+        self.aggregates_path = os.path.join(root, AGGREGATES_FILE)
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        self._aggregates = None
+
+    def _partition_path(self, snapshot_date):
+        return os.path.join(self.snapshot_dir, f'snapshot_date={snapshot_date.isoformat()}')
+
+    def snapshot_dates(self):
+        """Return the sorted list of stored snapshot dates"""
+        return sorted(
+            _as_date(name.split('=', 1)[1])
+            for name in os.listdir(self.snapshot_dir)
+            if name.startswith('snapshot_date=')
+        )
+
+    def append(self, snapshot_date, scored, cohort_column='risk_category', overwrite=False):
+        """
+        Store one day's scored customers and its daily aggregates
+
+        Args:
+            snapshot_date: Date the snapshot was scored for
+            scored: DataFrame returned by HealthScoreCalculator.score_frame
+            cohort_column: Column to precompute cohort trend lines over
+            overwrite: Replace an existing snapshot for the same date
+
+        Returns:
+            DataFrame of the aggregates written for this date
+        """
+        snapshot_date = _as_date(snapshot_date)
+        partition = self._partition_path(snapshot_date)
+        if os.path.exists(partition):
+            if not overwrite:
+                raise ValueError(f"Snapshot for {snapshot_date} already exists")
+            shutil.rmtree(partition)
+
+        columns = HISTORY_COLUMNS + ([cohort_column] if cohort_column not in HISTORY_COLUMNS else [])
+        frame = scored[columns].copy()
+        frame['risk_category'] = frame['risk_category'].astype('category')
+
+        os.makedirs(partition)
+        frame.to_parquet(os.path.join(partition, 'scores.parquet'), index=False)
+
+        daily = self._daily_aggregates(snapshot_date, scored, cohort_column)
+        aggregates = self.daily_aggregates()
+        aggregates = aggregates[aggregates['snapshot_date'] != pd.Timestamp(snapshot_date)]
+        aggregates = pd.concat([aggregates, daily], ignore_index=True)
+        aggregates = aggregates.sort_values(['snapshot_date', 'cohort'], ignore_index=True)
+        aggregates.to_parquet(self.aggregates_path, index=False)
+        self._aggregates = aggregates
+
+        return daily
+
+    @staticmethod
+    def _daily_aggregates(snapshot_date, scored, cohort_column):
+        """Summarize one snapshot overall and per cohort"""
+        overall = scored.assign(cohort=ALL_CUSTOMERS)
+        by_cohort = scored.assign(cohort=scored[cohort_column].astype(str))
+        combined = pd.concat([overall, by_cohort], ignore_index=True)
+
+        daily = combined.groupby('cohort', observed=True).agg(
+            customers=('health_score', 'size'),
+            mean_score=('health_score', 'mean'),
+            median_score=('health_score', 'median'),
+            mean_churn=('churn_risk', 'mean')
+        ).reset_index()
+        daily.insert(0, 'snapshot_date', pd.Timestamp(snapshot_date))
+        return daily
+
+    def daily_aggregates(self):
+        """Return precomputed daily aggregates for every snapshot"""
+        if self._aggregates is None:
+            if os.path.exists(self.aggregates_path):
+                self._aggregates = pd.read_parquet(self.aggregates_path)
+            else:
+                self._aggregates = pd.DataFrame({
+                    'snapshot_date': pd.Series(dtype='datetime64[ns]'),
+                    'cohort': pd.Series(dtype=object),
+                    'customers': pd.Series(dtype=np.int64),
+                    'mean_score': pd.Series(dtype=np.float64),
+                    'median_score': pd.Series(dtype=np.float64),
+                    'mean_churn': pd.Series(dtype=np.float64)
+                })
+        return self._aggregates
+
+    def cohort_trends(self, metric='mean_score'):
+        """
+        Trend lines per cohort from the daily aggregates
+
+        Returns:
+            DataFrame indexed by snapshot_date with one column per cohort
+        """
+        return self.daily_aggregates().pivot(index='snapshot_date', columns='cohort', values=metric)
+
+    def rolling_average(self, window=7, metric='mean_score', cohort=ALL_CUSTOMERS):
+        """
+        Rolling average of a daily metric for one cohort
+
+        Args:
+            window: Window length in days
+            metric: Daily aggregate column to smooth
+            cohort: Cohort to compute it for
+
+        Returns:
+            DataFrame with snapshot_date, the daily value and its rolling average
+        """
+        daily = self.daily_aggregates()
+        series = daily.loc[daily['cohort'] == cohort].set_index('snapshot_date')[metric]
+        rolling = series.rolling(f'{window}D', min_periods=1).mean()
+        return pd.DataFrame({metric: series, f'rolling_{window}d': rolling}).reset_index()
+
+    def load_snapshot(self, snapshot_date, columns=None):
+        """Read a single day's scores"""
+        path = os.path.join(self._partition_path(_as_date(snapshot_date)), 'scores.parquet')
+        return pd.read_parquet(path, columns=columns)
+
+    def score_velocity(self, days=7, as_of=None):
+        """
+        Per-customer score change per day over a trailing window
+
+        Reads only two partitions: the as_of snapshot and the latest
+        snapshot at least `days` earlier.
+
+        Args:
+            days: Look-back window in days
+            as_of: Snapshot date to measure at (defaults to the latest)
+
+        Returns:
+            DataFrame with customer_id, health_score, previous_health_score
+            and velocity (points per day); empty if no earlier snapshot exists
+        """
+        dates = self.snapshot_dates()
+        if not dates:
+            return pd.DataFrame(columns=['customer_id', 'health_score', 'previous_health_score', 'velocity'])
+
+        as_of = _as_date(as_of) if as_of else dates[-1]
+        earlier = [d for d in dates if d <= as_of - timedelta(days=days)]
+        if not earlier:
+            return pd.DataFrame(columns=['customer_id', 'health_score', 'previous_health_score', 'velocity'])
+
+        baseline = earlier[-1]
+        current = self.load_snapshot(as_of, columns=['customer_id', 'health_score'])
+        previous = self.load_snapshot(baseline, columns=['customer_id', 'health_score'])
+
+        merged = current.merge(previous, on='customer_id', suffixes=('', '_previous'))
+        merged = merged.rename(columns={'health_score_previous': 'previous_health_score'})
+        merged['velocity'] = (merged['health_score'] - merged['previous_health_score']) / (as_of - baseline).days
+        return merged
+
+    def customer_history(self, customer_id):
+        """
+        Score history for one customer across every snapshot
+
+        Uses a filtered, column-pruned dataset scan instead of loading
+        whole snapshots.
+        """
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(self.snapshot_dir, format='parquet', partitioning='hive')
+        table = dataset.to_table(
+            columns=['snapshot_date', 'health_score', 'churn_risk', 'risk_category'],
+            filter=ds.field('customer_id') == customer_id
+        )
+        history = table.to_pandas()
+        history['snapshot_date'] = pd.to_datetime(history['snapshot_date'])
+        return history.sort_values('snapshot_date', ignore_index=True)
+
+
+def backfill_sample_history(history, num_customers=1000, days=90, end=None, seed=42):
+    """
+    Fill a history with drifting synthetic snapshots for demos and load tests
+
+    Args:
+        history: ScoreHistory to append to
+        num_customers: Customers per snapshot
+        days: Number of daily snapshots ending at `end`
+        end: Last snapshot date (defaults to today)
+        seed: Random seed
+    """
+    from data_generator import generate_sample_data
+    from health_score import HealthScoreCalculator
+
+    calculator = HealthScoreCalculator()
+    rng = np.random.default_rng(seed)
+    end = _as_date(end) if end else date.today()
+
+    df = generate_sample_data(num_customers, seed=seed)
+    for offset in range(days - 1, -1, -1):
+        history.append(end - timedelta(days=offset), calculator.score_frame(df), overwrite=True)
+
+        # Random-walk the engagement metrics for the next day
+        df['login_frequency'] = (df['login_frequency'] + rng.normal(0, 0.5, len(df))).clip(0, 30).round(1)
+        df['feature_usage'] = (df['feature_usage'] + rng.normal(0, 1, len(df))).clip(0, 100).round(1)
+        df['days_since_last_login'] = (df['days_since_last_login'] + rng.integers(-2, 3, len(df))).clip(0, 90)
+
+
+def main():
+    """Manage score history from the command line"""
+    parser = argparse.ArgumentParser(description="Health score history")
+    parser.add_argument('--root', default='data/history', help="History directory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    append_parser = subparsers.add_parser('append', help="Score a customer CSV and append it as a snapshot")
+    append_parser.add_argument('input', help="Customer metrics CSV")
+    append_parser.add_argument('--date', default=date.today().isoformat(), help="Snapshot date (YYYY-MM-DD)")
+    append_parser.add_argument('--overwrite', action='store_true', help="Replace an existing snapshot")
+
+    backfill_parser = subparsers.add_parser('backfill', help="Generate synthetic daily snapshots")
+    backfill_parser.add_argument('--rows', type=int, default=1000, help="Customers per snapshot")
+    backfill_parser.add_argument('--days', type=int, default=90, help="Number of snapshots")
+
+    subparsers.add_parser('summary', help="Print the overall daily trend")
+    args = parser.parse_args()
+
+    history = ScoreHistory(args.root)
+
+    if args.command == 'append':
+        from health_score import HealthScoreCalculator
+        from schema import read_customers
+
+        scored = HealthScoreCalculator().score_frame(read_customers(args.input))
+        history.append(args.date, scored, overwrite=args.overwrite)
+        print(f"Appended {len(scored)} customers for {args.date}")
+    elif args.command == 'backfill':
+        backfill_sample_history(history, args.rows, args.days)
+        print(f"Backfilled {args.days} snapshots of {args.rows} customers")
+    else:
+        print(history.rolling_average().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Parallel Health Score Engine
+Scores customers across CPU cores with a process pool and shared memory
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from health_score import METRIC_COLUMNS, HealthScoreCalculator
+from schema import as_float64
+from streaming import RISK_CATEGORIES, ScoreAggregates, StreamingScorer
+
+
+def _attach(name, shape, dtype):
+    """Attach to a shared memory block and view it as an array"""
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _warm_up(calculator):
+    """Import the scoring modules and compile the calculator's kernel in a worker"""
+    calculator.score_arrays(*np.zeros((len(METRIC_COLUMNS), 1)))
+    return os.getpid()
+
+
+def _score_shard(calculator, names, capacity, start, stop, bins):
+    """
+    Score rows [start, stop) of the shared metric block in a worker
+
+    Results are written straight into the shared output blocks; only the
+    shard's aggregates travel back through the pool. Blocks hold capacity
+    rows, which may be more than the frame being scored.
+    """
+    metrics_block, metrics = _attach(names['metrics'], (len(METRIC_COLUMNS), capacity), np.float64)
+    scores_block, scores = _attach(names['scores'], (2, capacity), np.float64)
+    codes_block, codes = _attach(names['codes'], (capacity,), np.int8)
+
+    try:
+        health_score, _, churn_risk = calculator.score_arrays(
+            *(metrics[i, start:stop] for i in range(len(METRIC_COLUMNS)))
+        )
+
+        scores[0, start:stop] = health_score
+        scores[1, start:stop] = churn_risk
+        codes[start:stop] = calculator.compiled().risk_codes(health_score)
+
+        aggregates = ScoreAggregates(bins=bins)
+        aggregates.update_codes(health_score, codes[start:stop], churn_risk)
+        return aggregates
+    finally:
+        # Views must be released before the blocks can be closed
+        del metrics, scores, codes
+        for block in (metrics_block, scores_block, codes_block):
+            block.close()
+
+
+def _score_file(calculator, input_path, output_path, chunk_size, bins):
+    """Stream-score a single file in a worker"""
+    scorer = StreamingScorer(calculator=calculator, chunk_size=chunk_size, bins=bins)
+    return scorer.score_file(input_path, output_path)
+
+
+class ParallelScorer:
+    """
+    Multi-core scorer built on HealthScoreCalculator.score_arrays
+
+    Used as a context manager, the scorer owns one process pool and one set
+    of shared memory blocks for its lifetime, so repeated calls skip worker
+    startup and block allocation. Outside a with block, every call starts
+    and shuts down its own pool.
+    """
+
+    def __init__(self, calculator=None, workers=None, chunk_size=250_000, bins=30):
+        """
+        Initialize the scorer
+
+        Args:
+            calculator: HealthScoreCalculator to score with (default weights if None)
+            workers: Number of worker processes (defaults to the CPU count)
+            chunk_size: Rows per shard, or rows per read chunk when scoring files
+            bins: Number of health score histogram bins to aggregate
+        """
+        self.calculator = calculator or HealthScoreCalculator()
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.bins = bins
+        self._pool = None
+        self._blocks = None
+        self._capacity = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        """Start the worker pool and warm up every worker"""
+        if self._pool is None:
+            # Workers must share this process's tracker: one of their own would
+            # unlink the shared blocks they attached to when the worker exits
+            resource_tracker.ensure_running()
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            self.warm_up()
+
+    def warm_up(self):
+        """Run one tiny task per worker so processes are started and kernels compiled before timing"""
+        futures = [self._pool.submit(_warm_up, self.calculator) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """Shut down the worker pool and free the shared memory blocks"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._free_blocks()
+
+    def _free_blocks(self):
+        if self._blocks:
+            for block in self._blocks.values():
+                block.close()
+                block.unlink()
+        self._blocks = None
+        self._capacity = 0
+
+    def _shared_blocks(self, num_rows):
+        """Shared metric, score and category blocks holding at least num_rows, grown when too small"""
+        if num_rows > self._capacity:
+            self._free_blocks()
+            itemsize = np.dtype(np.float64).itemsize
+            self._blocks = {
+                'metrics': shared_memory.SharedMemory(create=True, size=len(METRIC_COLUMNS) * num_rows * itemsize),
+                'scores': shared_memory.SharedMemory(create=True, size=2 * num_rows * itemsize),
+                'codes': shared_memory.SharedMemory(create=True, size=num_rows)
+            }
+            self._capacity = num_rows
+        return self._blocks
+
+    def shards(self, num_rows):
+        """Split num_rows into (start, stop) row ranges of at most chunk_size"""
+        return [
+            (start, min(start + self.chunk_size, num_rows))
+            for start in range(0, num_rows, self.chunk_size)
+        ]
+
+    def score_frame(self, df):
+        """
+        Score a customer DataFrame by row range across worker processes
+
+        Metric columns are copied once into shared memory; workers read their
+        row range and write scores back in place, so no frames are pickled.
+        Inside a with block the pool and blocks are reused across calls.
+
+        Args:
+            df: DataFrame with the five usage metric columns
+
+        Returns:
+            Tuple of (scored DataFrame, merged ScoreAggregates)
+        """
+        num_rows = len(df)
+        aggregates = ScoreAggregates(bins=self.bins)
+        if num_rows == 0:
+            return self.calculator.score_frame(df), aggregates
+
+        persistent = self._pool is not None
+        pool = self._pool or ProcessPoolExecutor(max_workers=self.workers)
+        blocks = self._shared_blocks(num_rows)
+        capacity = self._capacity
+        names = {key: block.name for key, block in blocks.items()}
+
+        metrics = np.ndarray((len(METRIC_COLUMNS), capacity), dtype=np.float64, buffer=blocks['metrics'].buf)
+        scores = np.ndarray((2, capacity), dtype=np.float64, buffer=blocks['scores'].buf)
+        codes = np.ndarray((capacity,), dtype=np.int8, buffer=blocks['codes'].buf)
+
+        try:
+            for i, column in enumerate(METRIC_COLUMNS):
+                metrics[i, :num_rows] = as_float64(df[column].to_numpy())
+
+            futures = [
+                pool.submit(_score_shard, self.calculator, names, capacity, start, stop, self.bins)
+                for start, stop in self.shards(num_rows)
+            ]
+            for future in futures:
+                aggregates.merge(future.result())
+
+            scored = df.assign(
+                health_score=scores[0, :num_rows].copy(),
+                risk_category=np.array(RISK_CATEGORIES, dtype=object)[codes[:num_rows]],
+                churn_risk=scores[1, :num_rows].copy()
+            )
+        finally:
+            del metrics, scores, codes
+            if not persistent:
+                pool.shutdown()
+                self._free_blocks()
+
+        return scored, aggregates
+
+    def score_files(self, input_paths, output_dir=None):
+        """
+        Score several customer files, one file per worker task
+
+        Args:
+            input_paths: CSV or Parquet files with customer metrics
+            output_dir: Optional directory to write scored files to (same names)
+
+        Returns:
+            Merged ScoreAggregates over every file
+        """
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        aggregates = ScoreAggregates(bins=self.bins)
+        pool = self._pool or ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            futures = [
+                pool.submit(
+                    _score_file,
+                    self.calculator,
+                    path,
+                    os.path.join(output_dir, os.path.basename(path)) if output_dir else None,
+                    self.chunk_size,
+                    self.bins
+                )
+                for path in input_paths
+            ]
+            for future in futures:
+                aggregates.merge(future.result())
+        finally:
+            if pool is not self._pool:
+                pool.shutdown()
+
+        return aggregates
+
+
+def benchmark(num_rows=1_000_000, worker_counts=None, chunk_size=250_000, seed=42, repeats=3):
+    """
+    Measure how parallel scoring throughput scales with worker count
+
+    Each worker count is timed twice: cold, as a one-off call that starts
+    its own pool and shared memory, and warm, as the best of repeated calls
+    on a started, warmed-up scorer. Warm throughput is what a long-running
+    nightly job sees; cold shows the fixed startup cost.
+
+    Args:
+        num_rows: Number of synthetic customers to score
+        worker_counts: Worker counts to try (defaults to powers of two up to the CPU count)
+        chunk_size: Rows per shard
+        seed: Random seed for the synthetic data
+        repeats: Warm calls per worker count; the fastest is reported
+
+    Returns:
+        List of result dicts with workers, seconds, rows_per_sec, speedup and
+        their cold_* counterparts
+    """
+    from data_generator import generate_sample_data
+
+    if worker_counts is None:
+        cpu_count = os.cpu_count() or 1
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= cpu_count:
+            worker_counts.append(worker_counts[-1] * 2)
+
+    df = generate_sample_data(num_rows, seed=seed)
+    calculator = HealthScoreCalculator()
+
+    def best_of(score):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            score(df)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    calculator.score_frame(df)
+    serial_seconds = best_of(calculator.score_frame)
+    print(f"Serial score_frame: {num_rows / serial_seconds:,.0f} rows/sec")
+
+    results = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        ParallelScorer(calculator, workers=workers, chunk_size=chunk_size).score_frame(df)
+        cold_seconds = time.perf_counter() - start
+
+        with ParallelScorer(calculator, workers=workers, chunk_size=chunk_size) as scorer:
+            scorer.score_frame(df)
+            seconds = best_of(scorer.score_frame)
+
+        result = {
+            'workers': workers,
+            'seconds': seconds,
+            'rows_per_sec': num_rows / seconds,
+            'speedup': serial_seconds / seconds,
+            'cold_seconds': cold_seconds,
+            'cold_rows_per_sec': num_rows / cold_seconds,
+            'cold_speedup': serial_seconds / cold_seconds
+        }
+        results.append(result)
+        print(f"{workers:>3} workers: warm {result['rows_per_sec']:>14,.0f} rows/sec ({result['speedup']:.2f}x serial)  "
+              f"cold {result['cold_rows_per_sec']:>14,.0f} rows/sec ({result['cold_speedup']:.2f}x serial)")
+
+    return results
+
+
+def main():
+    """Run the parallel scoring benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark parallel health score throughput")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Synthetic customers to score")
+    parser.add_argument('--workers', type=int, nargs='+', help="Worker counts to benchmark")
+    parser.add_argument('--chunk-size', type=int, default=250_000, help="Rows per shard")
+    parser.add_argument('--repeats', type=int, default=3, help="Warm calls per worker count")
+    args = parser.parse_args()
+
+    benchmark(args.rows, args.workers, args.chunk_size, repeats=args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Customer Metrics Schema
+Declared compact dtypes, typed file reading and bulk validation for customer data
+"""
+
+import numpy as np
+import pandas as pd
+
+
+ID_COLUMN = 'customer_id'
+
+# Arrow-backed strings: one contiguous buffer instead of a Python object per ID
+ID_DTYPE = 'string[pyarrow]'
+
+# (column, storage dtype, minimum, maximum) - None means unbounded.
+# Fractional metrics stay float64 so uploaded values are scored exactly as given.
+METRIC_SCHEMA = [
+    ('login_frequency', 'float64', 0, None),
+    ('feature_usage', 'float64', 0, 100),
+    ('support_tickets', 'int16', 0, np.iinfo(np.int16).max),
+    ('days_since_last_login', 'int16', 0, np.iinfo(np.int16).max),
+    ('contract_value', 'float64', 0, None)
+]
+
+REQUIRED_COLUMNS = [ID_COLUMN] + [column for column, _, _, _ in METRIC_SCHEMA]
+
+# Dtypes requested from the CSV parser. Integer columns are parsed as float64
+# so missing and fractional values can be reported by validate() instead of
+# failing inside the parser.
+READ_DTYPES = {ID_COLUMN: ID_DTYPE}
+READ_DTYPES.update({
+    column: 'float64' if dtype.startswith('int') else dtype
+    for column, dtype, _, _ in METRIC_SCHEMA
+})
+
+# Bad rows included in a SchemaError message
+MAX_REPORTED_ERRORS = 10
+
+
+class SchemaError(ValueError):
+    """Customer data that does not match the declared schema"""
+
+    def __init__(self, message, errors=None):
+        """
+        Args:
+            message: Summary of what is wrong
+            errors: DataFrame with row, column, value and problem per bad cell
+        """
+        self.summary = message
+        self.errors = errors if errors is not None else pd.DataFrame(columns=['row', 'column', 'value', 'problem'])
+        if len(self.errors):
+            shown = self.errors.head(MAX_REPORTED_ERRORS)
+            details = '; '.join(
+                f"row {row} {column}={value!r}: {problem}"
+                for row, column, value, problem in shown.itertuples(index=False)
+            )
+            more = len(self.errors) - len(shown)
+            message = f"{message}: {details}" + (f" (and {more} more)" if more else "")
+        super().__init__(message)
+
+
+def as_float64(values):
+    """Upcast a metric column (e.g. the int16 counts) to float64 for scoring, without changing any value"""
+    return np.asarray(values).astype(np.float64, copy=False)
+
+
+def metric_matrix(df, columns):
+    """Stack metric columns into a (rows, len(columns)) float64 matrix"""
+    metrics = np.empty((len(df), len(columns)), dtype=np.float64)
+    for i, column in enumerate(columns):
+        metrics[:, i] = as_float64(df[column].to_numpy())
+    return metrics
+
+
+def metric_checks(values, dtype, minimum, maximum):
+    """
+    Range and type checks for one parsed metric column
+
+    Args:
+        values: float64 array; NaN (missing or unparseable) is skipped
+        dtype, minimum, maximum: The column's METRIC_SCHEMA entry
+
+    Returns:
+        List of (mask, problem) pairs
+    """
+    parsed = ~np.isnan(values)
+    checks = [
+        (parsed & np.isinf(values), 'not finite'),
+        (parsed & (values < minimum), f'below {minimum}')
+    ]
+    if maximum is not None:
+        checks.append((parsed & ~np.isinf(values) & (values > maximum), f'above {maximum}'))
+    if dtype.startswith('int'):
+        checks.append((parsed & np.isfinite(values) & (values != np.floor(values)), 'not a whole number'))
+    return checks
+
+
+def validate(df, row_offset=0):
+    """
+    Check every required column of a customer frame in one vectorized pass
+
+    Args:
+        df: Customer DataFrame, typed or as parsed
+        row_offset: Added to reported row numbers (for chunked reads)
+
+    Returns:
+        DataFrame with row, column, value and problem for each bad cell,
+        empty when the frame is valid
+
+    Raises:
+        SchemaError: If required columns are missing
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise SchemaError(f"Missing required columns: {', '.join(missing)}")
+
+    problems = []
+
+    def report(column, mask, problem):
+        rows = np.flatnonzero(mask)
+        if len(rows):
+            problems.append(pd.DataFrame({
+                'row': rows + row_offset,
+                'column': column,
+                'value': df[column].to_numpy(dtype=object)[rows],
+                'problem': problem
+            }))
+
+    report(ID_COLUMN, df[ID_COLUMN].isna().to_numpy(), 'missing')
+
+    for column, dtype, minimum, maximum in METRIC_SCHEMA:
+        raw = df[column]
+        absent = raw.isna().to_numpy()
+        values = pd.to_numeric(raw, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        parsed = ~np.isnan(values)
+
+        report(column, absent, 'missing')
+        report(column, ~absent & ~parsed, 'not a number')
+        for mask, problem in metric_checks(values, dtype, minimum, maximum):
+            report(column, mask, problem)
+
+    if not problems:
+        return pd.DataFrame(columns=['row', 'column', 'value', 'problem'])
+    return pd.concat(problems, ignore_index=True).sort_values(['row', 'column'], kind='stable', ignore_index=True)
+
+
+def coerce(df, row_offset=0):
+    """
+    Validate a customer frame and cast it to the compact schema
+
+    Columns outside the schema are passed through unchanged.
+
+    Args:
+        df: Customer DataFrame
+        row_offset: Added to reported row numbers (for chunked reads)
+
+    Returns:
+        New DataFrame with declared dtypes on the schema columns
+
+    Raises:
+        SchemaError: Listing every bad row if any value is invalid
+    """
+    errors = validate(df, row_offset)
+    if len(errors):
+        raise SchemaError(f"{errors['row'].nunique()} invalid customer rows", errors)
+
+    typed = {ID_COLUMN: df[ID_COLUMN].astype(ID_DTYPE)}
+    for column, dtype, _, _ in METRIC_SCHEMA:
+        typed[column] = pd.to_numeric(df[column]).to_numpy().astype(dtype)
+
+    return df.assign(**typed)
+
+
+def _rewind(source):
+    """Seek file-like sources back to the start before re-reading"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def _check_header(source):
+    """Fail before parsing the body when required columns are missing"""
+    header = pd.read_csv(source, nrows=0)
+    _rewind(source)
+    missing = [column for column in REQUIRED_COLUMNS if column not in header.columns]
+    if missing:
+        raise SchemaError(f"Missing required columns: {', '.join(missing)}")
+
+
+def _untyped_errors(source, skip_rows=0, nrows=None):
+    """Re-read rows as text to locate values the typed parser rejected"""
+    _rewind(source)
+    raw = pd.read_csv(
+        source,
+        dtype=str,
+        skiprows=range(1, skip_rows + 1),
+        nrows=nrows
+    )
+    errors = validate(raw, row_offset=skip_rows)
+    return SchemaError(f"{errors['row'].nunique()} invalid customer rows", errors)
+
+
+def read_customers(source):
+    """
+    Read a customer CSV with explicit dtypes
+
+    Args:
+        source: Path or file-like object
+
+    Returns:
+        DataFrame in the compact schema
+
+    Raises:
+        SchemaError: If columns are missing or any row is invalid
+    """
+    _check_header(source)
+    try:
+        df = pd.read_csv(source, dtype=READ_DTYPES)
+    except ValueError:
+        raise _untyped_errors(source)
+    return coerce(df)
+
+
+def iter_customer_chunks(path, chunk_size):
+    """
+    Yield a customer CSV as typed chunks of at most chunk_size rows
+
+    Each chunk is validated as it is read, so a bad file fails at the
+    first chunk containing a bad row, with every bad row of that chunk.
+
+    Args:
+        path: CSV file path
+        chunk_size: Rows per chunk
+
+    Raises:
+        SchemaError: If columns are missing or a chunk has invalid rows
+    """
+    _check_header(path)
+    offset = 0
+    with pd.read_csv(path, dtype=READ_DTYPES, chunksize=chunk_size) as reader:
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return
+            except ValueError:
+                raise _untyped_errors(path, skip_rows=offset, nrows=chunk_size)
+            yield coerce(chunk, row_offset=offset)
+            offset += len(chunk)
@@ -0,0 +1,228 @@
+"""
+Persistent Health Score Store
+Keeps scores in SQLite and rescores only customers whose inputs changed
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from health_score import METRIC_COLUMNS, HealthScoreCalculator
+from schema import metric_matrix, read_customers
+
+
+SCORE_COLUMNS = ['health_score', 'risk_category', 'churn_risk']
+
+
+def profile_hash(calculator):
+    """Stable 64-bit hash of a calculator's scoring profile and churn model, if any"""
+    config = calculator.profile.to_dict()
+    if calculator.churn_model is not None:
+        config['churn_model'] = calculator.churn_model.fingerprint()
+    payload = json.dumps(config, sort_keys=True).encode()
+    return int.from_bytes(hashlib.sha256(payload).digest()[:8], 'little', signed=True)
+
+
+def input_hashes(df, calculator):
+    """
+    Hash each customer's metrics together with the calculator's scoring profile
+
+    Metrics are cast to float64 first so a column read back as int, float
+    or the compact schema's int16 hashes the same way.
+
+    Returns:
+        int64 array, one hash per row
+    """
+    metrics = pd.DataFrame(metric_matrix(df, METRIC_COLUMNS), columns=METRIC_COLUMNS)
+    row_hashes = pd.util.hash_pandas_object(metrics, index=False).to_numpy().view(np.int64)
+    return row_hashes ^ np.int64(profile_hash(calculator))
+
+
+class ScoreStore:
+    """SQLite store of customer scores keyed by customer_id"""
+
+    def __init__(self, db_file='data/health_scores.db', calculator=None):
+        """
+        Open (or create) the score store
+
+        Args:
+            db_file: SQLite database path
+            calculator: HealthScoreCalculator to score changed rows with
+        """
+        self.db_file = db_file
+        self.calculator = calculator or HealthScoreCalculator()
+
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS customer_scores (
+                customer_id TEXT PRIMARY KEY,
+                input_hash INTEGER NOT NULL,
+                health_score REAL NOT NULL,
+                risk_category TEXT NOT NULL,
+                churn_risk REAL NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM customer_scores").fetchone()[0]
+
+    def load_scores(self):
+        """Return every stored score as a DataFrame"""
+        return pd.read_sql_query(
+            "SELECT customer_id, input_hash, health_score, risk_category, churn_risk, updated_at "
+            "FROM customer_scores",
+            self.conn
+        )
+
+    def score_snapshot(self, df):
+        """
+        Score a snapshot, recomputing only new or changed customers
+
+        The snapshot is the full customer book: stored customers missing from
+        it are reported as removed and deleted from the store, so a returning
+        customer is scored as new.
+
+        Args:
+            df: DataFrame with customer_id and the five usage metric columns
+
+        Returns:
+            Tuple of (scored snapshot, deltas) where deltas has one row per new,
+            changed or removed customer with previous and current scores
+            (current scores are NaN for removed customers)
+        """
+        snapshot = df.assign(input_hash=input_hashes(df, self.calculator))
+        stored = self.load_scores().drop(columns='updated_at').astype({
+            'customer_id': snapshot['customer_id'].dtype,
+            'input_hash': 'Int64',
+            'health_score': np.float64,
+            'risk_category': object,
+            'churn_risk': np.float64
+        })
+
+        merged = snapshot.merge(
+            stored.rename(columns={'input_hash': 'stored_hash'}),
+            on='customer_id',
+            how='left'
+        )
+        changed = merged['stored_hash'].ne(merged['input_hash']).fillna(True).to_numpy(dtype=bool)
+
+        rescored = self.calculator.score_frame(snapshot.loc[changed])
+        removed = stored.loc[~stored['customer_id'].isin(snapshot['customer_id'])]
+        self._upsert(rescored)
+        self._delete(removed['customer_id'])
+
+        previous = merged.loc[changed, ['customer_id'] + SCORE_COLUMNS]
+        deltas = pd.DataFrame({
+            'customer_id': rescored['customer_id'].to_numpy(),
+            'status': np.where(previous['health_score'].isna(), 'new', 'changed'),
+            'previous_health_score': previous['health_score'].to_numpy(),
+            'health_score': rescored['health_score'].to_numpy(),
+            'score_delta': rescored['health_score'].to_numpy() - previous['health_score'].to_numpy(),
+            'previous_risk_category': previous['risk_category'].to_numpy(),
+            'risk_category': rescored['risk_category'].to_numpy()
+        })
+        if not removed.empty:
+            deltas = pd.concat([deltas, pd.DataFrame({
+                'customer_id': removed['customer_id'].to_numpy(),
+                'status': 'removed',
+                'previous_health_score': removed['health_score'].to_numpy(),
+                'health_score': np.nan,
+                'score_delta': np.nan,
+                'previous_risk_category': removed['risk_category'].to_numpy(),
+                'risk_category': None
+            })], ignore_index=True)
+
+        scored = merged.drop(columns='stored_hash')
+        for column in SCORE_COLUMNS:
+            scored.loc[changed, column] = rescored[column].to_numpy()
+        scored = scored.drop(columns='input_hash')
+
+        return scored, deltas
+
+    def _upsert(self, scored):
+        """Write rescored customers, replacing any previous rows"""
+        if scored.empty:
+            return
+
+        updated_at = datetime.now().isoformat()
+        rows = zip(
+            scored['customer_id'].astype(str),
+            scored['input_hash'].astype(int).tolist(),
+            scored['health_score'].tolist(),
+            scored['risk_category'].tolist(),
+            scored['churn_risk'].tolist(),
+            [updated_at] * len(scored)
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO customer_scores "
+            "(customer_id, input_hash, health_score, risk_category, churn_risk, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        self.conn.commit()
+
+    def _delete(self, customer_ids):
+        """Delete customers that are no longer in the snapshot"""
+        if customer_ids.empty:
+            return
+
+        self.conn.executemany(
+            "DELETE FROM customer_scores WHERE customer_id = ?",
+            ((customer_id,) for customer_id in customer_ids.astype(str))
+        )
+        self.conn.commit()
+
+
+def main():
+    """Incrementally score a customer snapshot from the command line"""
+    parser = argparse.ArgumentParser(description="Rescore only changed customers in a snapshot")
+    parser.add_argument('snapshot', help="Customer metrics CSV")
+    parser.add_argument('--db', default='data/health_scores.db', help="Score store database")
+    parser.add_argument('--deltas', help="Optional CSV to write score deltas to")
+    args = parser.parse_args()
+
+    df = read_customers(args.snapshot)
+    with ScoreStore(args.db) as store:
+        _, deltas = store.score_snapshot(df)
+
+    counts = deltas['status'].value_counts()
+    new, changed, removed = (int(counts.get(status, 0)) for status in ('new', 'changed', 'removed'))
+    print(f"Snapshot: {len(df)} customers")
+    print(f"Rescored: {new + changed} ({new} new, {changed} changed)")
+    print(f"Unchanged: {len(df) - new - changed}")
+    print(f"Removed: {removed}")
+
+    moved = deltas[(deltas['status'] == 'changed') & (deltas['previous_risk_category'] != deltas['risk_category'])]
+    if not moved.empty:
+        print(f"\nRisk category changes: {len(moved)}")
+        print(moved.sort_values('score_delta').head(10).to_string(index=False))
+
+    if args.deltas:
+        deltas.to_csv(args.deltas, index=False)
+        print(f"\nSaved deltas to {args.deltas}")
+
+
+if __name__ == "__main__":
+    main()
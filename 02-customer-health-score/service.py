@@ -0,0 +1,322 @@
+"""
+Headless Health Score Service
+Batch file scoring CLI and an async HTTP scoring service with micro-batching
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from health_score import METRIC_COLUMNS, HealthScoreCalculator, load_profiles
+from schema import ID_COLUMN, METRIC_SCHEMA, SchemaError, metric_checks
+from streaming import StreamingScorer
+
+
+class LatencyTracker:
+    """Rolling window of request latencies"""
+
+    def __init__(self, window=10_000):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.customers = 0
+
+    def record(self, seconds, customers):
+        """Record one request's latency and size"""
+        self.latencies.append(seconds)
+        self.requests += 1
+        self.customers += customers
+
+    def snapshot(self):
+        """Request counts and p50/p99 latency in milliseconds over the window"""
+        if self.latencies:
+            p50, p99 = np.percentile(np.fromiter(self.latencies, dtype=np.float64), [50, 99]) * 1000
+        else:
+            p50 = p99 = None
+        return {
+            'requests': self.requests,
+            'customers': self.customers,
+            'window': len(self.latencies),
+            'p50_ms': p50,
+            'p99_ms': p99
+        }
+
+
+class MicroBatcher:
+    """Coalesces concurrent scoring requests into one vectorized pass"""
+
+    def __init__(self, calculator, max_batch_rows=4096, max_wait_ms=2.0):
+        """
+        Args:
+            calculator: Warm HealthScoreCalculator shared by every request
+            max_batch_rows: Flush once this many customers are queued
+            max_wait_ms: Flush after waiting this long for more requests
+        """
+        self.calculator = calculator
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.batched_rows = 0
+        self._task = None
+
+    def start(self):
+        """Start the background batching task"""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background batching task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, metrics):
+        """
+        Queue a (rows, 5) metric matrix and wait for its scores
+
+        Returns:
+            Tuple of (health_score, risk_category, churn_risk, recommendation_mask) arrays
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((metrics, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            rows = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while rows < self.max_batch_rows:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                rows += len(item[0])
+
+            self._score(pending)
+
+    def _score(self, pending):
+        """Score one coalesced batch and resolve each request's future"""
+        try:
+            metrics = np.concatenate([item[0] for item in pending])
+            health_score, risk_category, churn_risk = self.calculator.score_arrays(*metrics.T)
+            masks = self.calculator.recommendation_masks(
+                health_score, metrics[:, 0], metrics[:, 2], metrics[:, 3]
+            )
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.batched_rows += len(metrics)
+
+        start = 0
+        for item, future in pending:
+            stop = start + len(item)
+            if not future.done():
+                future.set_result((
+                    health_score[start:stop],
+                    risk_category[start:stop],
+                    churn_risk[start:stop],
+                    masks[start:stop]
+                ))
+            start = stop
+
+
+def parse_customers(payload):
+    """
+    Validate a JSON scoring request
+
+    Metrics must be JSON numbers (a numeric string is a client error here,
+    unlike in a CSV) and pass the same checks as file ingestion
+    (schema.metric_checks).
+
+    Args:
+        payload: {"customers": [{"customer_id": ..., <five metrics>}, ...]}
+
+    Returns:
+        Tuple of (customer_ids, (rows, 5) float64 metric matrix)
+
+    Raises:
+        ValueError: If the payload is malformed
+        SchemaError: If any customer has a missing or invalid value; rows are
+            positions in the customers list
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get('customers'), list):
+        raise ValueError("Body must be a JSON object with a 'customers' list")
+
+    customers = payload['customers']
+    metrics = np.full((len(customers), len(METRIC_COLUMNS)), np.nan)
+    problems = []
+    for i, customer in enumerate(customers):
+        if not isinstance(customer, dict):
+            raise ValueError(f"Customer {i} must be a JSON object")
+        if customer.get(ID_COLUMN) is None:
+            problems.append((i, ID_COLUMN, None, 'missing'))
+        for j, column in enumerate(METRIC_COLUMNS):
+            value = customer.get(column)
+            if value is None or value != value:
+                problems.append((i, column, value, 'missing'))
+            elif isinstance(value, bool) or not isinstance(value, (int, float)):
+                problems.append((i, column, value, 'not a number'))
+            else:
+                metrics[i, j] = value
+
+    for column, dtype, minimum, maximum in METRIC_SCHEMA:
+        for mask, problem in metric_checks(metrics[:, METRIC_COLUMNS.index(column)], dtype, minimum, maximum):
+            problems.extend((int(i), column, customers[i][column], problem) for i in np.flatnonzero(mask))
+
+    if problems:
+        errors = pd.DataFrame(problems, columns=['row', 'column', 'value', 'problem'])
+        errors = errors.sort_values(['row', 'column'], kind='stable', ignore_index=True)
+        raise SchemaError(f"{errors['row'].nunique()} invalid customers", errors)
+
+    return [customer[ID_COLUMN] for customer in customers], metrics
+
+
+def create_app(calculator=None, max_batch_rows=4096, max_wait_ms=2.0):
+    """
+    Build the aiohttp scoring application
+
+    Routes:
+        POST /score    Score a JSON batch of customers
+        GET  /metrics  Request counts, p50/p99 latency and batching stats
+        GET  /health   Liveness check
+    """
+    from aiohttp import web
+
+    calculator = calculator or HealthScoreCalculator()
+
+    # Warm the compiled scoring kernel before the first request
+    calculator.score_arrays(*np.zeros((len(METRIC_COLUMNS), 1)))
+
+    batcher = MicroBatcher(calculator, max_batch_rows, max_wait_ms)
+    latency = LatencyTracker()
+
+    async def score(request):
+        start = time.perf_counter()
+        try:
+            payload = await request.json()
+            customer_ids, metrics = parse_customers(payload)
+        except SchemaError as e:
+            errors = [
+                {'customer': row, 'customer_id': payload['customers'][row].get(ID_COLUMN),
+                 'field': column, 'value': str(value) if isinstance(value, float) and not np.isfinite(value) else value,
+                 'problem': problem}
+                for row, column, value, problem in e.errors.itertuples(index=False)
+            ]
+            return web.json_response({'error': str(e), 'errors': errors}, status=400)
+        except ValueError as e:
+            return web.json_response({'error': str(e)}, status=400)
+
+        health_score, risk_category, churn_risk, masks = await batcher.submit(metrics)
+        codes = calculator.recommendation_codes(masks)
+
+        results = [
+            {
+                'customer_id': customer_id,
+                'health_score': float(health_score[i]),
+                'risk_category': risk_category[i],
+                'churn_risk': float(churn_risk[i]),
+                'recommendations': codes[i].split(';')
+            }
+            for i, customer_id in enumerate(customer_ids)
+        ]
+        response = web.json_response({'results': results})
+        latency.record(time.perf_counter() - start, len(results))
+        return response
+
+    async def metrics(request):
+        stats = latency.snapshot()
+        stats['batches'] = batcher.batches
+        stats['mean_batch_rows'] = batcher.batched_rows / batcher.batches if batcher.batches else None
+        return web.json_response(stats)
+
+    async def health(request):
+        return web.json_response({'status': 'ok', 'profile': calculator.profile.name})
+
+    async def on_startup(app):
+        batcher.start()
+
+    async def on_cleanup(app):
+        await batcher.stop()
+
+    app = web.Application()
+    app.add_routes([
+        web.post('/score', score),
+        web.get('/metrics', metrics),
+        web.get('/health', health)
+    ])
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def build_calculator(profile=None, profiles_file='scoring_profiles.json', churn_model=None):
+    """Build a calculator from CLI options"""
+    selected = None
+    if profile:
+        selected = load_profiles(profiles_file)[profile]
+
+    model = None
+    if churn_model:
+        from churn_model import ChurnModel
+
+        model = ChurnModel.load(churn_model)
+
+    return HealthScoreCalculator(selected, churn_model=model)
+
+
+def main():
+    """Score files or serve the HTTP scoring API from the command line"""
+    parser = argparse.ArgumentParser(description="Headless health score service")
+    parser.add_argument('--profile', help="Scoring profile name from --profiles-file")
+    parser.add_argument('--profiles-file', default='scoring_profiles.json', help="Scoring profiles JSON")
+    parser.add_argument('--churn-model', help="Learned churn model (.npz)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    score_parser = subparsers.add_parser('score', help="Score a CSV/Parquet file into another file")
+    score_parser.add_argument('input', help="Customer metrics file")
+    score_parser.add_argument('output', help="Scored output file")
+    score_parser.add_argument('--chunk-size', type=int, default=100_000, help="Rows per chunk")
+    score_parser.add_argument('--recommendations', action='store_true', help="Add recommendation codes")
+
+    serve_parser = subparsers.add_parser('serve', help="Run the HTTP scoring service")
+    serve_parser.add_argument('--host', default='127.0.0.1', help="Bind address")
+    serve_parser.add_argument('--port', type=int, default=8080, help="Bind port")
+    serve_parser.add_argument('--max-batch-rows', type=int, default=4096, help="Micro-batch row limit")
+    serve_parser.add_argument('--max-wait-ms', type=float, default=2.0, help="Micro-batch wait limit")
+    args = parser.parse_args()
+
+    calculator = build_calculator(args.profile, args.profiles_file, args.churn_model)
+
+    if args.command == 'score':
+        if not os.path.exists(args.input):
+            parser.error(f"Input file not found: {args.input}")
+        scorer = StreamingScorer(calculator, chunk_size=args.chunk_size, recommendations=args.recommendations)
+        aggregates = scorer.score_file(args.input, args.output)
+        print(f"Scored {aggregates.count} customers into {args.output}")
+    else:
+        from aiohttp import web
+
+        app = create_app(calculator, args.max_batch_rows, args.max_wait_ms)
+        web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
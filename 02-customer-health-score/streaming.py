@@ -0,0 +1,263 @@
+"""
+Streaming Health Score Pipeline
+Scores customer CSV/Parquet files in bounded chunks with flat memory
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from health_score import HealthScoreCalculator
+from schema import coerce, iter_customer_chunks
+
+
+RISK_CATEGORIES = ['Healthy', 'At Risk', 'High Risk']
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+
+def is_parquet(path):
+    """Return True if the path looks like a Parquet file"""
+    return str(path).lower().endswith(PARQUET_EXTENSIONS)
+
+
+class ScoreAggregates:
+    """Running aggregates over scored customers"""
+
+    def __init__(self, bins=30):
+        """
+        Initialize empty aggregates
+
+        Args:
+            bins: Number of equal-width health score histogram bins over 0-100
+        """
+        self.bin_edges = np.linspace(0, 100, bins + 1)
+        self.histogram = np.zeros(bins, dtype=np.int64)
+        self.risk_counts = dict.fromkeys(RISK_CATEGORIES, 0)
+        self.count = 0
+        self.score_sum = 0.0
+        self.churn_sum = 0.0
+
+    def update(self, health_score, risk_category, churn_risk):
+        """
+        Fold one batch of scored customers into the aggregates
+
+        Args:
+            health_score: Array of health scores
+            risk_category: Array of risk category strings
+            churn_risk: Array of churn probabilities
+        """
+        risk_category = np.asarray(risk_category)
+        counts = [np.count_nonzero(risk_category == category) for category in RISK_CATEGORIES]
+        self._fold(health_score, counts, churn_risk)
+
+    def update_codes(self, health_score, risk_codes, churn_risk):
+        """
+        Fold one batch into the aggregates, with risk categories as codes
+
+        Same as update, but risk_codes index RISK_CATEGORIES (as returned by
+        CompiledProfiles.risk_codes), which is much cheaper to count than strings.
+        """
+        counts = np.bincount(np.asarray(risk_codes), minlength=len(RISK_CATEGORIES))
+        self._fold(health_score, counts, churn_risk)
+
+    def _fold(self, health_score, counts, churn_risk):
+        health_score = np.asarray(health_score)
+
+        self.count += len(health_score)
+        self.score_sum += float(health_score.sum())
+        self.churn_sum += float(np.asarray(churn_risk).sum())
+        self.histogram += np.histogram(health_score, bins=self.bin_edges)[0]
+
+        for category, count in zip(RISK_CATEGORIES, counts):
+            self.risk_counts[category] += int(count)
+
+    def update_frame(self, df):
+        """Fold a DataFrame returned by HealthScoreCalculator.score_frame"""
+        self.update(
+            df['health_score'].to_numpy(),
+            df['risk_category'].to_numpy(),
+            df['churn_risk'].to_numpy()
+        )
+
+    def merge(self, other):
+        """
+        Merge aggregates computed over another set of customers
+
+        Args:
+            other: ScoreAggregates built with the same bin edges
+
+        Returns:
+            self, for chaining
+        """
+        if not np.array_equal(self.bin_edges, other.bin_edges):
+            raise ValueError("Cannot merge aggregates with different histogram bins")
+
+        self.count += other.count
+        self.score_sum += other.score_sum
+        self.churn_sum += other.churn_sum
+        self.histogram += other.histogram
+        for category, count in other.risk_counts.items():
+            self.risk_counts[category] = self.risk_counts.get(category, 0) + count
+
+        return self
+
+    @property
+    def mean_score(self):
+        """Mean health score, or NaN when empty"""
+        return self.score_sum / self.count if self.count else float('nan')
+
+    @property
+    def mean_churn(self):
+        """Mean churn probability, or NaN when empty"""
+        return self.churn_sum / self.count if self.count else float('nan')
+
+    def to_dict(self):
+        """Return the aggregates as plain Python types"""
+        return {
+            'count': self.count,
+            'mean_score': self.mean_score,
+            'mean_churn': self.mean_churn,
+            'risk_counts': dict(self.risk_counts),
+            'histogram': {
+                'bin_edges': self.bin_edges.tolist(),
+                'counts': self.histogram.tolist()
+            }
+        }
+
+
+class ChunkWriter:
+    """Incremental CSV/Parquet writer for scored chunks"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = is_parquet(path)
+        self._parquet_writer = None
+        self._schema = None
+        self._rows = 0
+
+    def write(self, df):
+        """Append one chunk to the output file"""
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            if self._parquet_writer is None:
+                self._schema = table.schema
+                self._parquet_writer = pq.ParquetWriter(self.path, self._schema)
+            self._parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode='w' if self._rows == 0 else 'a', header=self._rows == 0, index=False)
+
+        self._rows += len(df)
+
+    def close(self):
+        """Flush and close the output file"""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+
+class StreamingScorer:
+    """Chunked scorer for customer files larger than memory"""
+
+    def __init__(self, calculator=None, chunk_size=100_000, bins=30, recommendations=False):
+        """
+        Initialize the scorer
+
+        Args:
+            calculator: HealthScoreCalculator to score with (default weights if None)
+            chunk_size: Rows read, scored and written per chunk
+            bins: Number of health score histogram bins to aggregate
+            recommendations: Also add recommendation_mask and recommendations columns
+        """
+        self.calculator = calculator or HealthScoreCalculator()
+        self.chunk_size = chunk_size
+        self.bins = bins
+        self.recommendations = recommendations
+
+    def iter_chunks(self, path):
+        """
+        Yield a customer file as typed DataFrames of at most chunk_size rows
+
+        Args:
+            path: CSV or Parquet file path
+
+        Raises:
+            SchemaError: At the first chunk with invalid rows
+        """
+        if is_parquet(path):
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(path)
+            offset = 0
+            for batch in parquet_file.iter_batches(batch_size=self.chunk_size):
+                yield coerce(batch.to_pandas(), row_offset=offset)
+                offset += batch.num_rows
+        else:
+            yield from iter_customer_chunks(path, self.chunk_size)
+
+    def iter_scored_chunks(self, path):
+        """Yield scored chunks of a customer file"""
+        for chunk in self.iter_chunks(path):
+            scored = self.calculator.score_frame(chunk)
+            if self.recommendations:
+                scored = self.calculator.recommend_frame(scored)
+                scored['recommendations'] = self.calculator.recommendation_codes(scored['recommendation_mask'])
+            yield scored
+
+    def score_file(self, input_path, output_path=None):
+        """
+        Score a customer file chunk by chunk
+
+        Args:
+            input_path: CSV or Parquet file with customer metrics
+            output_path: Optional CSV or Parquet file to write scored rows to
+
+        Returns:
+            ScoreAggregates over every scored customer
+        """
+        aggregates = ScoreAggregates(bins=self.bins)
+        writer = ChunkWriter(output_path) if output_path else None
+
+        try:
+            for scored in self.iter_scored_chunks(input_path):
+                aggregates.update_frame(scored)
+                if writer:
+                    writer.write(scored)
+        finally:
+            if writer:
+                writer.close()
+
+        return aggregates
+
+
+def main():
+    """Score a customer file from the command line"""
+    parser = argparse.ArgumentParser(description="Stream-score a customer CSV or Parquet file")
+    parser.add_argument('input', help="Customer metrics file (.csv or .parquet)")
+    parser.add_argument('output', nargs='?', help="Scored output file (.csv or .parquet)")
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="Rows per chunk")
+    parser.add_argument('--bins', type=int, default=30, help="Health score histogram bins")
+    parser.add_argument('--recommendations', action='store_true',
+                        help="Add recommendation codes to the scored output")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        parser.error(f"Input file not found: {args.input}")
+
+    scorer = StreamingScorer(chunk_size=args.chunk_size, bins=args.bins, recommendations=args.recommendations)
+    aggregates = scorer.score_file(args.input, args.output)
+
+    print(f"Scored {aggregates.count} customers")
+    print(f"Avg Health Score: {aggregates.mean_score:.1f}")
+    print(f"Avg Churn Risk: {aggregates.mean_churn:.1%}")
+    for category, count in aggregates.risk_counts.items():
+        print(f"{category}: {count}")
+    if args.output:
+        print(f"Saved scored customers to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,76 @@ Analyzes job market trends from scraped data
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
 from collections import Counter
 import ast
 
+from healthtech_shared.charts import ChartRenderer
+
+
+def draw_top_roles(fig, role_counts, top_n):
+    """Draw the most common job roles"""
+    ax = fig.subplots()
+    role_counts.plot(kind='barh', color='skyblue', ax=ax)
+    ax.set_title(f'Top {top_n} Most In-Demand Roles in Healthtech Startups', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Number of Job Postings')
+    ax.set_ylabel('Job Title')
+
+
+def draw_salary_analysis(fig, salaries):
+    """Draw the salary histogram and the highest paying roles"""
+    axes = fig.subplots(1, 2)
+
+    # Histogram
+    axes[0].hist(salaries['salary_min'], bins=30, alpha=0.7, label='Min Salary', color='blue')
+    axes[0].hist(salaries['salary_max'], bins=30, alpha=0.7, label='Max Salary', color='green')
+    axes[0].set_xlabel('Salary ($)')
+    axes[0].set_ylabel('Frequency')
+    axes[0].set_title('Salary Distribution')
+    axes[0].legend()
+    axes[0].grid(True, alpha=0.3)
+
+    # Top paying roles
+    salaries['top_roles'].plot(kind='barh', ax=axes[1], color='coral')
+    axes[1].set_xlabel('Median Max Salary ($)')
+    axes[1].set_title('Top 10 Highest Paying Roles')
+
+
+def draw_skills_demand(fig, top_tags, top_n):
+    """Draw the most in-demand skills"""
+    ax = fig.subplots()
+    ax.barh(list(top_tags.keys()), list(top_tags.values()), color='teal')
+    ax.set_xlabel('Number of Job Postings')
+    ax.set_ylabel('Skill/Technology')
+    ax.set_title(f'Top {top_n} Most In-Demand Skills in Healthtech', fontsize=14, fontweight='bold')
+
+
+def draw_location_distribution(fig, location_counts):
+    """Draw jobs per location"""
+    ax = fig.subplots()
+    location_counts.plot(kind='bar', color='orange', ax=ax)
+    ax.set_title('Job Distribution by Location', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Location')
+    ax.set_ylabel('Number of Jobs')
+    ax.tick_params(axis='x', rotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+
+
+def draw_experience_distribution(fig, exp_counts):
+    """Draw the experience level pie chart"""
+    ax = fig.subplots()
+    exp_counts.plot(kind='pie', autopct='%1.1f%%', startangle=90, colors=sns.color_palette('pastel'), ax=ax)
+    ax.set_title('Jobs by Experience Level', fontsize=14, fontweight='bold')
+    ax.set_ylabel('')
+
 
 class JobMarketAnalyzer:
     """Analyzer for startup job market data"""
 
-    def __init__(self, data_file='data/jobs.csv'):
+    def __init__(self, data_file='data/jobs.csv', renderer=None):
         self.data_file = data_file
+        self.renderer = renderer or ChartRenderer('visualizations')
         self.df = None
         self.load_data()
 
@@ -42,14 +101,7 @@ class JobMarketAnalyzer:
             print(f"{role}: {count} ({count/len(self.df)*100:.1f}%)")
 
         # Visualization
-        plt.figure(figsize=(12, 6))
-        role_counts.plot(kind='barh', color='skyblue')
-        plt.title(f'Top {top_n} Most In-Demand Roles in Healthtech Startups', fontsize=14, fontweight='bold')
-        plt.xlabel('Number of Job Postings')
-        plt.ylabel('Job Title')
-        plt.tight_layout()
-        plt.savefig('visualizations/top_roles.png', dpi=300)
-        print("Saved visualization: visualizations/top_roles.png")
+        self.renderer.add('top_roles.png', draw_top_roles, role_counts, top_n=top_n)
 
     def analyze_salary_ranges(self):
         """Analyze salary distributions"""
@@ -71,25 +123,12 @@ class JobMarketAnalyzer:
         print(salary_by_role)
 
         # Visualization
-        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
-
-        # Histogram
-        axes[0].hist(self.df['salary_min'], bins=30, alpha=0.7, label='Min Salary', color='blue')
-        axes[0].hist(self.df['salary_max'], bins=30, alpha=0.7, label='Max Salary', color='green')
-        axes[0].set_xlabel('Salary ($)')
-        axes[0].set_ylabel('Frequency')
-        axes[0].set_title('Salary Distribution')
-        axes[0].legend()
-        axes[0].grid(True, alpha=0.3)
-
-        # Top paying roles
-        salary_by_role['salary_max'].plot(kind='barh', ax=axes[1], color='coral')
-        axes[1].set_xlabel('Median Max Salary ($)')
-        axes[1].set_title('Top 10 Highest Paying Roles')
-
-        plt.tight_layout()
-        plt.savefig('visualizations/salary_analysis.png', dpi=300)
-        print("Saved visualization: visualizations/salary_analysis.png")
+        salaries = {
+            'salary_min': self.df['salary_min'].to_numpy(),
+            'salary_max': self.df['salary_max'].to_numpy(),
+            'top_roles': salary_by_role['salary_max']
+        }
+        self.renderer.add('salary_analysis.png', draw_salary_analysis, salaries, figsize=(14, 6))
 
     def analyze_skills_demand(self, top_n=15):
         """Analyze most in-demand skills/tags"""
@@ -110,14 +149,7 @@ class JobMarketAnalyzer:
             print(f"{tag}: {count} ({count/len(self.df)*100:.1f}%)")
 
         # Visualization
-        plt.figure(figsize=(12, 8))
-        plt.barh(list(top_tags.keys()), list(top_tags.values()), color='teal')
-        plt.xlabel('Number of Job Postings')
-        plt.ylabel('Skill/Technology')
-        plt.title(f'Top {top_n} Most In-Demand Skills in Healthtech', fontsize=14, fontweight='bold')
-        plt.tight_layout()
-        plt.savefig('visualizations/skills_demand.png', dpi=300)
-        print("Saved visualization: visualizations/skills_demand.png")
+        self.renderer.add('skills_demand.png', draw_skills_demand, top_tags, figsize=(12, 8), top_n=top_n)
 
     def analyze_locations(self):
         """Analyze job distribution by location"""
@@ -130,15 +162,7 @@ class JobMarketAnalyzer:
         print(location_counts)
 
         # Visualization
-        plt.figure(figsize=(10, 6))
-        location_counts.plot(kind='bar', color='orange')
-        plt.title('Job Distribution by Location', fontsize=14, fontweight='bold')
-        plt.xlabel('Location')
-        plt.ylabel('Number of Jobs')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.savefig('visualizations/location_distribution.png', dpi=300)
-        print("Saved visualization: visualizations/location_distribution.png")
+        self.renderer.add('location_distribution.png', draw_location_distribution, location_counts, figsize=(10, 6))
 
     def analyze_experience_levels(self):
         """Analyze distribution by experience level"""
@@ -151,13 +175,7 @@ class JobMarketAnalyzer:
         print(exp_counts)
 
         # Visualization
-        plt.figure(figsize=(10, 6))
-        exp_counts.plot(kind='pie', autopct='%1.1f%%', startangle=90, colors=sns.color_palette('pastel'))
-        plt.title('Jobs by Experience Level', fontsize=14, fontweight='bold')
-        plt.ylabel('')
-        plt.tight_layout()
-        plt.savefig('visualizations/experience_distribution.png', dpi=300)
-        print("Saved visualization: visualizations/experience_distribution.png")
+        self.renderer.add('experience_distribution.png', draw_experience_distribution, exp_counts, figsize=(10, 6))
 
     def generate_insights_report(self):
         """Generate comprehensive insights report"""
@@ -220,11 +238,13 @@ class JobMarketAnalyzer:
         os.makedirs('reports', exist_ok=True)
 
         print("Running full job market analysis...")
-        self.analyze_top_roles()
-        self.analyze_salary_ranges()
-        self.analyze_skills_demand()
-        self.analyze_locations()
-        self.analyze_experience_levels()
+        # Charts are rendered together, in parallel, once every analysis has run
+        with self.renderer.batch():
+            self.analyze_top_roles()
+            self.analyze_salary_ranges()
+            self.analyze_skills_demand()
+            self.analyze_locations()
+            self.analyze_experience_levels()
         self.generate_insights_report()
 
         print("\n✅ Analysis complete! Check visualizations/ and reports/ folders.")
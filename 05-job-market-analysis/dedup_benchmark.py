@@ -0,0 +1,230 @@
+"""
+Startup Job Market Analysis - Near-Duplicate Benchmark
+Time and accuracy of MinHash/LSH deduplication over synthetic job postings with planted near-duplicates
+"""
+
+import argparse
+import time
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from healthtech_shared.dedup import NearDuplicateDetector, TOKEN_PATTERN, record_keys, record_names
+
+from job_scraper import (
+    DEDUP_FIELDS, DEDUP_KEY_FIELDS, DEDUP_NAME_FIELD, DEDUP_NAME_IGNORE, DEDUP_NAME_IGNORE_FIELDS,
+    DEDUP_NAME_THRESHOLD
+)
+
+TITLES = [
+    'Product Manager', 'Software Engineer', 'Data Scientist', 'Machine Learning Engineer',
+    'Healthcare Data Analyst', 'Clinical Product Manager', 'AI Research Scientist',
+    'Backend Engineer', 'Frontend Developer', 'Full Stack Engineer', 'DevOps Engineer',
+    'UX Designer', 'Growth Manager', 'Customer Success Manager', 'Sales Executive'
+]
+LEVELS = ['', 'Junior ', 'Senior ', 'Staff ', 'Lead ', 'Principal ']
+LEVEL_ABBREVIATIONS = {'Senior ': 'Sr. ', 'Junior ': 'Jr. '}
+LOCATIONS = ['San Francisco, CA', 'New York, NY', 'Boston, MA', 'Remote', 'Austin, TX', 'Seattle, WA']
+SYLLABLES = ['ba', 'co', 'di', 'fe', 'ga', 'hi', 'jo', 'ku', 'la', 'me', 'no', 'pi', 'qu', 'ra', 'so', 'ti', 'vu', 'xe']
+
+
+def synthetic_postings(n, duplicate_rate=0.2, sibling_rate=0.1, vocabulary=20000, seed=0):
+    """
+    Job postings where a share are edited copies of others
+
+    Descriptions are 20-40 words drawn from a Zipf-like vocabulary. A
+    duplicate copies a random original and applies one to three edits:
+    changing case, adding a legal suffix to the company, replacing,
+    deleting or inserting a description word, or editing the title's words
+    (abbreviating the level, adding "(Remote)" or the location, or moving
+    the first word to the end, as in "Data Scientist, Senior").
+
+    A share of the originals are hard negatives: siblings of another
+    original with the same company, location and description but a
+    different level or title ("Senior" vs. "Staff Software Engineer").
+    They are distinct roles and must not be merged.
+
+    Returns:
+        (postings, origin, family, title_edited): list of dicts, the index of
+        the original each posting copies, the original whose company and
+        description it shares, and whether its title words were edited
+    """
+    rng = np.random.default_rng(seed)
+    words = [''.join(rng.choice(SYLLABLES, size=rng.integers(2, 5))) for _ in range(vocabulary)]
+    weights = 1 / np.arange(1, vocabulary + 1)
+    weights /= weights.sum()
+
+    originals = n - int(n * duplicate_rate)
+    lengths = rng.integers(20, 41, originals)
+    word_ids = rng.choice(vocabulary, size=lengths.sum(), p=weights)
+    offsets = np.cumsum(lengths) - lengths
+    titles = rng.integers(len(TITLES), size=originals)
+    levels = rng.integers(len(LEVELS), size=originals)
+    locations = rng.integers(len(LOCATIONS), size=originals)
+    companies = rng.integers(vocabulary, size=(originals, 2))
+
+    # Siblings take another original's company, location and description
+    siblings = rng.choice(originals, size=int(originals * sibling_rate), replace=False)
+    family = np.arange(originals)
+    family[siblings] = rng.choice(np.setdiff1d(family, siblings), size=len(siblings))
+    roles = {source: {(titles[source], levels[source])} for source in family[siblings]}
+    for i in siblings:
+        taken = roles[family[i]]
+        while (titles[i], levels[i]) in taken:
+            if rng.integers(2):
+                levels[i] = rng.integers(len(LEVELS))
+            else:
+                titles[i] = rng.integers(len(TITLES))
+        taken.add((titles[i], levels[i]))
+    companies, locations, lengths = companies[family], locations[family], lengths[family]
+    offsets = offsets[family]
+
+    postings = [
+        {
+            'title': LEVELS[levels[i]] + TITLES[titles[i]],
+            'company': f'{words[companies[i, 0]].title()} {words[companies[i, 1]].title()} Health',
+            'location': LOCATIONS[locations[i]],
+            'description': ' '.join(map(words.__getitem__, word_ids[offsets[i]:offsets[i] + lengths[i]])) + '.'
+        }
+        for i in range(originals)
+    ]
+    origin = list(range(originals))
+    title_edited = [False] * originals
+
+    for source in rng.integers(originals, size=n - originals):
+        posting = dict(postings[source])
+        description = posting['description'].split()
+        title = posting['title']
+        for _ in range(rng.integers(1, 4)):
+            edit = rng.integers(9)
+            position = rng.integers(len(description))
+            if edit == 0:
+                title = title.upper()
+            elif edit == 1:
+                posting['company'] += ', Inc.'
+            elif edit == 2:
+                description[position] = words[rng.integers(vocabulary)]
+            elif edit == 3 and len(description) > 1:
+                del description[position]
+            elif edit == 4:
+                description.insert(position, words[rng.integers(vocabulary)])
+            elif edit == 5:
+                for level, abbreviation in LEVEL_ABBREVIATIONS.items():
+                    title = title.replace(level, abbreviation)
+            elif edit == 6:
+                title += ' (Remote)'
+            elif edit == 7:
+                title += f" - {posting['location']}"
+            else:
+                first, _, rest = title.partition(' ')
+                title = f'{rest}, {first}' if rest else title
+        edited = title.lower().split() != posting['title'].lower().split()
+        posting['title'] = title
+        posting['description'] = ' '.join(description)
+        postings.append(posting)
+        origin.append(source)
+        title_edited.append(edited)
+
+    order = rng.permutation(n)
+    origin = np.asarray(origin)
+    return [postings[i] for i in order], origin[order], family[origin][order], np.asarray(title_edited)[order]
+
+
+def score(labels, origin, family=None, title_edited=None):
+    """
+    Precision and recall of the records flagged as duplicates against the planted ones
+
+    With family, also the precision over postings whose family has sibling
+    roles, where merging a sibling counts against it. With title_edited,
+    also the share of copies with edited title words that were merged with
+    another copy of their original.
+
+    Returns:
+        Dict with precision, recall and, when given the inputs, sibling_precision and title_recall
+    """
+    flagged = labels != np.arange(len(labels))
+    correct = flagged & (origin == origin[labels])
+    planted = len(origin) - len(np.unique(origin))
+    scores = {'precision': correct.sum() / max(flagged.sum(), 1), 'recall': correct.sum() / max(planted, 1)}
+
+    if family is not None:
+        roles = pd.DataFrame({'family': family, 'origin': origin}).groupby('family')['origin'].nunique()
+        hard = np.isin(family, roles.index[roles > 1])
+        scores['sibling_precision'] = correct[hard].sum() / max(flagged[hard].sum(), 1)
+    if title_edited is not None:
+        # An edited copy is found if it shares a cluster with another copy of its original,
+        # whichever of them the cluster kept
+        copies = pd.DataFrame({'label': labels, 'origin': origin}).groupby(['label', 'origin'])['origin']
+        found = copies.transform('size').to_numpy() > 1
+        scores['title_recall'] = found[title_edited].sum() / max(title_edited.sum(), 1)
+    return scores
+
+
+def exact_pairs_per_second(postings, detector, sample=2000):
+    """All-pairs Jaccard over shingle sets, the quadratic baseline LSH avoids"""
+    shingles = []
+    for posting in postings[:sample]:
+        words = TOKEN_PATTERN.findall(' '.join(posting[field] for field in DEDUP_FIELDS).lower())
+        size = detector.shingle_size
+        shingles.append({tuple(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))})
+
+    start = time.perf_counter()
+    pairs = 0
+    for a, b in combinations(shingles, 2):
+        len(a & b) / len(a | b)
+        pairs += 1
+    return pairs / (time.perf_counter() - start)
+
+
+def run(sizes=(10000, 100000, 1000000), duplicate_rate=0.2, sibling_rate=0.1, **detector_options):
+    """Deduplicate synthetic postings at each size and report time, candidates, precision and recall"""
+    detector = NearDuplicateDetector(**detector_options)
+    print(f"threshold={detector.threshold} name_threshold={detector.name_threshold} num_perm={detector.num_perm} "
+          f"shingle_size={detector.shingle_size} bands={detector.bands} rows={detector.rows}\n")
+
+    results = {}
+    for n in sizes:
+        postings, origin, family, title_edited = synthetic_postings(n, duplicate_rate, sibling_rate)
+        texts = [' '.join(posting[field] for field in DEDUP_FIELDS) for posting in postings]
+        keys = record_keys(postings, DEDUP_KEY_FIELDS)
+        names = record_names(postings, DEDUP_NAME_FIELD, DEDUP_NAME_IGNORE, DEDUP_NAME_IGNORE_FIELDS)
+        labels = detector.clusters(texts, keys, names)
+        stats = detector.stats
+        scores = score(labels, origin, family, title_edited)
+        seconds = stats['signature_seconds'] + stats['lsh_seconds']
+        results[n] = {**stats, **scores, 'seconds': seconds}
+        print(f"{n:>9,} postings  {stats['signature_seconds']:>7.1f}s minhash  {stats['lsh_seconds']:>6.1f}s lsh  "
+              f"{n / seconds:>9,.0f} postings/sec  {stats['candidates']:>9,} candidates  "
+              f"{stats['duplicates']:>8,} duplicates  precision {scores['precision']:.4f} "
+              f"({scores['sibling_precision']:.4f} on siblings)  recall {scores['recall']:.4f} "
+              f"({scores['title_recall']:.4f} on edited titles)")
+
+    pairs_per_second = exact_pairs_per_second(postings, detector)
+    largest = max(sizes)
+    print(f"\nExact all-pairs Jaccard: {pairs_per_second:,.0f} pairs/sec, "
+          f"~{largest * (largest - 1) / 2 / pairs_per_second / 3600:,.0f} hours for {largest:,} postings")
+    return results
+
+
+def main():
+    """Run the near-duplicate benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate detection on synthetic job postings")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000], help="Postings per run")
+    parser.add_argument('--duplicate-rate', type=float, default=0.2, help="Share of postings that are edited copies")
+    parser.add_argument('--sibling-rate', type=float, default=0.1,
+                        help="Share of originals that are other roles at another original's company, with its description")
+    parser.add_argument('--threshold', type=float, default=0.7, help="Jaccard similarity for a duplicate")
+    parser.add_argument('--name-threshold', type=float, default=DEDUP_NAME_THRESHOLD,
+                        help="Jaccard similarity of title words (besides seniority) for a duplicate")
+    parser.add_argument('--num-perm', type=int, default=128, help="MinHash permutations")
+    parser.add_argument('--shingle-size', type=int, default=2, help="Words per shingle")
+    parser.add_argument('--bands', type=int, help="LSH bands (default: chosen from the threshold)")
+    args = parser.parse_args()
+
+    run(args.sizes, args.duplicate_rate, args.sibling_rate, threshold=args.threshold,
+        name_threshold=args.name_threshold, num_perm=args.num_perm, shingle_size=args.shingle_size, bands=args.bands)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Startup Job Market Analysis - Extraction Benchmark
+Pages/sec for job card extraction over saved HTML fixtures, before and after
+"""
+
+import argparse
+import glob
+import os
+from html import escape
+
+from bs4 import BeautifulSoup
+
+from healthtech_shared.extraction import HAS_LXML, CardExtractor, benchmark
+
+from job_scraper import JOB_CARD, JOB_FIELDS, JobScraper
+
+
+def render_page(jobs):
+    """Render jobs as job board HTML using the selectors job_scraper.py expects"""
+    cards = ''.join(
+        '<div class="job-listing">'
+        f'<h3>{escape(job["title"])}</h3>'
+        f'<div class="company-name">{escape(job["company"])}</div>'
+        f'<span class="location">{escape(job["location"])}</span>'
+        f'<span class="job-type">{job["job_type"]}</span>'
+        f'<span class="experience">{job["experience_level"]}</span>'
+        f'<span class="salary">{job["salary_range"]}</span>'
+        f'<p class="description">{escape(job["description"])}</p>'
+        + ''.join(f'<span class="tag">{escape(tag)}</span>' for tag in job['tags'])
+        + f'<a href="{job["url"]}">Apply</a>'
+        '</div>'
+        for job in jobs
+    )
+    return f'<html><body><div class="jobs">{cards}</div></body></html>'
+
+
+def save_fixtures(fixture_dir='fixtures/html', num_pages=200, page_size=25):
+    """
+    Write job board pages built from sample jobs to disk if they are not there yet
+
+    Returns:
+        Sorted list of fixture file paths
+    """
+    os.makedirs(fixture_dir, exist_ok=True)
+    paths = sorted(glob.glob(os.path.join(fixture_dir, 'jobs_*.html')))
+    if len(paths) >= num_pages:
+        return paths[:num_pages]
+
+    scraper = JobScraper()
+    scraper.generate_sample_data(n_jobs=num_pages * page_size)
+    for page in range(num_pages):
+        path = os.path.join(fixture_dir, f'jobs_{page + 1:04d}.html')
+        with open(path, 'w') as f:
+            f.write(render_page(scraper.jobs[page * page_size:(page + 1) * page_size]))
+
+    return sorted(glob.glob(os.path.join(fixture_dir, 'jobs_*.html')))[:num_pages]
+
+
+def legacy_extract(html):
+    """The original extraction: html.parser and two find() calls per field"""
+    soup = BeautifulSoup(html, 'html.parser')
+    jobs = []
+    for card in soup.find_all('div', class_='job-listing'):
+        jobs.append({
+            'title': card.find('h3').text.strip() if card.find('h3') else None,
+            'company': card.find('div', class_='company-name').text.strip() if card.find('div', class_='company-name') else None,
+            'location': card.find('span', class_='location').text.strip() if card.find('span', class_='location') else None,
+            'job_type': card.find('span', class_='job-type').text.strip() if card.find('span', class_='job-type') else None,
+            'experience_level': card.find('span', class_='experience').text.strip() if card.find('span', class_='experience') else None,
+            'salary_range': card.find('span', class_='salary').text.strip() if card.find('span', class_='salary') else None,
+            'description': card.find('p', class_='description').text.strip() if card.find('p', class_='description') else None,
+            'tags': [tag.text.strip() for tag in card.find_all('span', class_='tag')],
+            'url': card.find('a')['href'] if card.find('a') else None
+        })
+    return jobs
+
+
+def run(fixture_dir='fixtures/html', num_pages=200, workers=4, repeats=3):
+    """Benchmark every extraction path over the same fixture pages"""
+    pages = []
+    for path in save_fixtures(fixture_dir, num_pages):
+        with open(path) as f:
+            pages.append(f.read())
+
+    cases = {
+        'legacy (html.parser, 2x find)': lambda p: [legacy_extract(html) for html in p],
+        'bs4 single lookup': CardExtractor(JOB_CARD, JOB_FIELDS, 'bs4').extract_many
+    }
+    if HAS_LXML:
+        lxml_extractor = CardExtractor(JOB_CARD, JOB_FIELDS, 'lxml')
+        cases['bs4 on lxml parser'] = CardExtractor(JOB_CARD, JOB_FIELDS, 'bs4-lxml').extract_many
+        cases['lxml compiled selectors'] = lxml_extractor.extract_many
+        if workers:
+            cases[f'lxml x {workers} processes'] = lambda p: lxml_extractor.extract_many(p, workers=workers)
+
+    expected = [legacy_extract(html) for html in pages]
+    for name, extract in cases.items():
+        if extract(pages) != expected:
+            raise AssertionError(f"{name} output differs from the legacy extraction")
+
+    print(f"Extracting {len(pages)} pages ({sum(map(len, expected)):,} job cards)\n")
+    return benchmark(pages, cases, repeats)
+
+
+def main():
+    """Run the extraction benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Benchmark job card extraction")
+    parser.add_argument('--fixtures', default='fixtures/html', help="Directory of saved HTML pages")
+    parser.add_argument('--pages', type=int, default=200, help="Pages to extract")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Processes for the pooled case")
+    parser.add_argument('--repeats', type=int, default=3, help="Timed runs per case")
+    args = parser.parse_args()
+
+    run(args.fixtures, args.pages, args.workers, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
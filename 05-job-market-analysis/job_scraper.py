@@ -3,21 +3,64 @@ Startup Job Market Analysis - Job Scraper
 Scrapes job postings from YC and healthtech startups
 """
 
+import argparse
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 from datetime import datetime
 import json
 
+from healthtech_shared.dedup import NearDuplicateDetector
+from healthtech_shared.extraction import BACKENDS, CardExtractor
+from healthtech_shared.http_cache import DEFAULT_CACHE_DIR, HTTPCache, cached_get
+
+
+# TODO: Update selectors based on actual website structure
+JOB_CARD = ('div', 'job-listing')
+
+# (field, tag, class, value) - see extraction.CardExtractor
+JOB_FIELDS = [
+    ('title', 'h3', None, 'text'),
+    ('company', 'div', 'company-name', 'text'),
+    ('location', 'span', 'location', 'text'),
+    ('job_type', 'span', 'job-type', 'text'),
+    ('experience_level', 'span', 'experience', 'text'),
+    ('salary_range', 'span', 'salary', 'text'),
+    ('description', 'p', 'description', 'text'),
+    ('tags', 'span', 'tag', 'texts'),
+    ('url', 'a', None, '@href')
+]
+
+# Near-duplicate postings - see dedup.NearDuplicateDetector.deduplicate. The company must
+# match; titles match fuzzily, ignoring work-mode words and the posting's own location
+DEDUP_FIELDS = ('title', 'company', 'location', 'description')
+DEDUP_KEY_FIELDS = ('company',)
+DEDUP_NAME_FIELD = 'title'
+DEDUP_NAME_IGNORE = ('remote', 'hybrid', 'onsite', 'office')
+DEDUP_NAME_IGNORE_FIELDS = ('location',)
+DEDUP_NAME_THRESHOLD = 0.7
+
 
 class JobScraper:
     """Scraper for startup job postings"""
 
-    def __init__(self):
+    def __init__(self, cache=None, parser='auto', dedup_threshold=0.7):
+        """
+        Initialize the scraper
+
+        Args:
+            cache: Optional HTTPCache shared with the YC startup tracker
+            parser: Extraction backend ('auto', 'lxml', 'bs4-lxml' or 'bs4')
+            dedup_threshold: Similarity at which scraped postings are near-duplicates (None keeps them all)
+        """
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.cache = cache
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.extractor = CardExtractor(JOB_CARD, JOB_FIELDS, backend=parser)
+        self.dedup = NearDuplicateDetector(dedup_threshold, name_threshold=DEDUP_NAME_THRESHOLD) if dedup_threshold else None
         self.jobs = []
 
     def scrape_yc_jobs(self, tags=None):
@@ -39,43 +82,40 @@ class JobScraper:
             params['tags'] = ','.join(tags)
 
         try:
-            response = requests.get(base_url, headers=self.headers, params=params)
-            response.raise_for_status()
+            html = cached_get(self.session, self.cache, base_url, params=params, timeout=30)
 
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # TODO: Update selectors based on actual website structure
-            job_cards = soup.find_all('div', class_='job-listing')
-
-            for card in job_cards:
-                job_data = self._extract_job_data(card)
-                if job_data:
-                    self.jobs.append(job_data)
+            posted_date = datetime.now().isoformat()
+            for job_data in self.extractor.extract(html):
+                job_data['posted_date'] = posted_date
+                self.jobs.append(job_data)
 
+            self.remove_near_duplicates()
             print(f"Scraped {len(self.jobs)} jobs")
 
         except Exception as e:
             print(f"Error scraping: {e}")
 
-    def _extract_job_data(self, card):
-        """Extract job information from listing card"""
-        try:
-            data = {
-                'title': card.find('h3').text.strip() if card.find('h3') else None,
-                'company': card.find('div', class_='company-name').text.strip() if card.find('div', class_='company-name') else None,
-                'location': card.find('span', class_='location').text.strip() if card.find('span', class_='location') else None,
-                'job_type': card.find('span', class_='job-type').text.strip() if card.find('span', class_='job-type') else None,
-                'experience_level': card.find('span', class_='experience').text.strip() if card.find('span', class_='experience') else None,
-                'salary_range': card.find('span', class_='salary').text.strip() if card.find('span', class_='salary') else None,
-                'description': card.find('p', class_='description').text.strip() if card.find('p', class_='description') else None,
-                'tags': [tag.text.strip() for tag in card.find_all('span', class_='tag')],
-                'posted_date': datetime.now().isoformat(),
-                'url': card.find('a')['href'] if card.find('a') else None
-            }
-            return data
-        except Exception as e:
-            print(f"Error extracting job data: {e}")
-            return None
+    def remove_near_duplicates(self):
+        """
+        Drop postings that near-duplicate an earlier one
+
+        Job boards repeat the same posting with small edits; keeping only the
+        first copy stops them inflating role, skill and salary counts.
+
+        Returns:
+            Number of postings dropped
+        """
+        if self.dedup is None or not self.jobs:
+            return 0
+
+        before = len(self.jobs)
+        self.jobs = self.dedup.deduplicate(
+            self.jobs, DEDUP_FIELDS, DEDUP_KEY_FIELDS,
+            DEDUP_NAME_FIELD, DEDUP_NAME_IGNORE, DEDUP_NAME_IGNORE_FIELDS
+        )
+        dropped = before - len(self.jobs)
+        print(f"Dropped {dropped} near-duplicate jobs ({self.dedup.stats['candidates']} candidate pairs)")
+        return dropped
 
     def generate_sample_data(self, n_jobs=200):
         """Generate sample job data for demonstration"""
@@ -156,10 +196,34 @@ class JobScraper:
 
 def main():
     """Main execution"""
-    scraper = JobScraper()
-
-    # Generate sample data (replace with actual scraping in production)
-    scraper.generate_sample_data(n_jobs=200)
+    parser = argparse.ArgumentParser(description="Scrape or generate startup job postings")
+    parser.add_argument('--scrape', action='store_true', help="Scrape YC jobs instead of generating sample data")
+    parser.add_argument('--tags', nargs='+', help="Job tags to filter by")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="HTTP cache directory")
+    parser.add_argument('--cache-ttl', type=float, default=3600, help="Seconds before cached pages are revalidated")
+    parser.add_argument('--offline', action='store_true', help="Serve pages from the cache only")
+    parser.add_argument('--no-cache', action='store_true', help="Bypass the HTTP cache")
+    parser.add_argument('--parser', choices=('auto',) + BACKENDS, default='auto', help="HTML extraction backend")
+    parser.add_argument('--dedup-threshold', type=float, default=0.7, help="Similarity at which scraped postings are near-duplicates")
+    parser.add_argument('--no-dedup', action='store_true', help="Keep near-duplicate postings")
+    args = parser.parse_args()
+
+    dedup_threshold = None if args.no_dedup else args.dedup_threshold
+
+    if args.scrape:
+        # Only a scrape touches the network, so only it opens the on-disk cache
+        cache = None if args.no_cache else HTTPCache(args.cache_dir, ttl=args.cache_ttl, offline=args.offline)
+        scraper = JobScraper(cache=cache, parser=args.parser, dedup_threshold=dedup_threshold)
+        try:
+            scraper.scrape_yc_jobs(tags=args.tags)
+        finally:
+            if cache is not None:
+                print(f"HTTP cache: {cache.stats}")
+                cache.close()
+    else:
+        # Generate sample data (replace with actual scraping in production)
+        scraper = JobScraper(parser=args.parser, dedup_threshold=dedup_threshold)
+        scraper.generate_sample_data(n_jobs=200)
 
     # Save data
     scraper.save_to_csv()
@@ -4,17 +4,74 @@ Analyzes funding data and creates visualizations
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
 import sqlite3
-from pathlib import Path
+
+from healthtech_shared.charts import ChartRenderer
+
+
+def draw_yearly_trends(fig, yearly):
+    """Draw total funding and deal count per year"""
+    axes = fig.subplots(1, 2)
+
+    # Total funding by year
+    axes[0].bar(yearly['year'], yearly['total_millions'], color='steelblue')
+    axes[0].set_title('Total Funding by Year', fontweight='bold')
+    axes[0].set_xlabel('Year')
+    axes[0].set_ylabel('Total Funding ($M)')
+    axes[0].grid(axis='y', alpha=0.3)
+
+    # Number of deals by year
+    axes[1].bar(yearly['year'], yearly['num_deals'], color='coral')
+    axes[1].set_title('Number of Deals by Year', fontweight='bold')
+    axes[1].set_xlabel('Year')
+    axes[1].set_ylabel('Number of Deals')
+    axes[1].grid(axis='y', alpha=0.3)
+
+
+def draw_category_funding(fig, category_stats):
+    """Draw total funding per category"""
+    ax = fig.subplots()
+    ax.barh(category_stats['category'], category_stats['total_millions'], color='teal')
+    ax.set_xlabel('Total Funding ($M)')
+    ax.set_title('Total Funding by Category', fontweight='bold', fontsize=14)
+    ax.invert_yaxis()
+
+
+def draw_stage_analysis(fig, stage_stats):
+    """Draw deal count and average deal size per stage"""
+    axes = fig.subplots(1, 2)
+
+    # Deal count by stage
+    axes[0].bar(stage_stats['stage'], stage_stats['num_deals'], color='skyblue')
+    axes[0].set_title('Deal Count by Stage', fontweight='bold')
+    axes[0].set_xlabel('Stage')
+    axes[0].set_ylabel('Number of Deals')
+    axes[0].tick_params(axis='x', rotation=45)
+
+    # Average deal size by stage
+    axes[1].bar(stage_stats['stage'], stage_stats['mean_millions'], color='orange')
+    axes[1].set_title('Average Deal Size by Stage', fontweight='bold')
+    axes[1].set_xlabel('Stage')
+    axes[1].set_ylabel('Average Deal Size ($M)')
+    axes[1].tick_params(axis='x', rotation=45)
+
+
+def draw_geography(fig, geo_stats):
+    """Draw total funding per location"""
+    ax = fig.subplots()
+    ax.barh(geo_stats['location'], geo_stats['total_millions'], color='purple')
+    ax.set_xlabel('Total Funding ($M)')
+    ax.set_title('Top 10 Locations by Funding', fontweight='bold', fontsize=14)
+    ax.invert_yaxis()
 
 
 class FundingAnalyzer:
     """Analyzer for healthcare startup funding data"""
 
-    def __init__(self, data_file='data/funding_data.csv'):
+    def __init__(self, data_file='data/funding_data.csv', renderer=None):
         self.data_file = data_file
+        self.renderer = renderer or ChartRenderer('visualizations')
         self.df = None
         self.load_data()
 
@@ -50,25 +107,9 @@ class FundingAnalyzer:
         print(yearly[['year', 'num_deals', 'total_millions', 'avg_millions']])
 
         # Visualization
-        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-        # Total funding by year
-        axes[0].bar(yearly['year'], yearly['total_millions'], color='steelblue')
-        axes[0].set_title('Total Funding by Year', fontweight='bold')
-        axes[0].set_xlabel('Year')
-        axes[0].set_ylabel('Total Funding ($M)')
-        axes[0].grid(axis='y', alpha=0.3)
-
-        # Number of deals by year
-        axes[1].bar(yearly['year'], yearly['num_deals'], color='coral')
-        axes[1].set_title('Number of Deals by Year', fontweight='bold')
-        axes[1].set_xlabel('Year')
-        axes[1].set_ylabel('Number of Deals')
-        axes[1].grid(axis='y', alpha=0.3)
-
-        plt.tight_layout()
-        plt.savefig('visualizations/yearly_trends.png', dpi=300)
-        print("Saved: visualizations/yearly_trends.png")
+        self.renderer.add(
+            'yearly_trends.png', draw_yearly_trends, yearly[['year', 'total_millions', 'num_deals']], figsize=(14, 5)
+        )
 
     def analyze_categories(self):
         """Analyze funding by category"""
@@ -84,14 +125,7 @@ class FundingAnalyzer:
         print(category_stats[['category', 'num_deals', 'total_millions']].head(10))
 
         # Visualization
-        plt.figure(figsize=(12, 6))
-        plt.barh(category_stats['category'], category_stats['total_millions'], color='teal')
-        plt.xlabel('Total Funding ($M)')
-        plt.title('Total Funding by Category', fontweight='bold', fontsize=14)
-        plt.gca().invert_yaxis()
-        plt.tight_layout()
-        plt.savefig('visualizations/category_funding.png', dpi=300)
-        print("Saved: visualizations/category_funding.png")
+        self.renderer.add('category_funding.png', draw_category_funding, category_stats[['category', 'total_millions']])
 
     def analyze_stages(self):
         """Analyze funding by stage"""
@@ -113,25 +147,10 @@ class FundingAnalyzer:
         print(stage_stats[['stage', 'num_deals', 'mean_millions', 'median_millions']])
 
         # Visualization
-        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-        # Deal count by stage
-        axes[0].bar(stage_stats['stage'], stage_stats['num_deals'], color='skyblue')
-        axes[0].set_title('Deal Count by Stage', fontweight='bold')
-        axes[0].set_xlabel('Stage')
-        axes[0].set_ylabel('Number of Deals')
-        axes[0].tick_params(axis='x', rotation=45)
-
-        # Average deal size by stage
-        axes[1].bar(stage_stats['stage'], stage_stats['mean_millions'], color='orange')
-        axes[1].set_title('Average Deal Size by Stage', fontweight='bold')
-        axes[1].set_xlabel('Stage')
-        axes[1].set_ylabel('Average Deal Size ($M)')
-        axes[1].tick_params(axis='x', rotation=45)
-
-        plt.tight_layout()
-        plt.savefig('visualizations/stage_analysis.png', dpi=300)
-        print("Saved: visualizations/stage_analysis.png")
+        self.renderer.add(
+            'stage_analysis.png', draw_stage_analysis, stage_stats[['stage', 'num_deals', 'mean_millions']],
+            figsize=(14, 5)
+        )
 
     def analyze_geography(self):
         """Analyze funding by location"""
@@ -147,14 +166,7 @@ class FundingAnalyzer:
         print(geo_stats[['location', 'num_deals', 'total_millions']])
 
         # Visualization
-        plt.figure(figsize=(12, 6))
-        plt.barh(geo_stats['location'], geo_stats['total_millions'], color='purple')
-        plt.xlabel('Total Funding ($M)')
-        plt.title('Top 10 Locations by Funding', fontweight='bold', fontsize=14)
-        plt.gca().invert_yaxis()
-        plt.tight_layout()
-        plt.savefig('visualizations/geography.png', dpi=300)
-        print("Saved: visualizations/geography.png")
+        self.renderer.add('geography.png', draw_geography, geo_stats[['location', 'total_millions']])
 
     def create_dashboard_summary(self):
         """Create summary statistics for dashboard"""
@@ -175,13 +187,13 @@ class FundingAnalyzer:
 
     def run_full_analysis(self):
         """Run complete analysis"""
-        Path('visualizations').mkdir(exist_ok=True)
-
         print("Running full funding analysis...")
-        self.analyze_yearly_trends()
-        self.analyze_categories()
-        self.analyze_stages()
-        self.analyze_geography()
+        # Charts are rendered together, in parallel, once every analysis has run
+        with self.renderer.batch():
+            self.analyze_yearly_trends()
+            self.analyze_categories()
+            self.analyze_stages()
+            self.analyze_geography()
         self.create_dashboard_summary()
         self.create_sql_database()
 
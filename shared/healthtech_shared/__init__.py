@@ -0,0 +1,7 @@
+"""
+Shared modules for the AI Healthtech Portfolio projects
+
+Each project installs this package from its requirements.txt and imports
+the modules it needs, e.g. `from healthtech_shared.charts import ChartRenderer`.
+Third-party dependencies are pinned by the projects that use each module.
+"""
@@ -0,0 +1,148 @@
+"""
+Chart Rendering Layer
+Object-oriented matplotlib rendering with a process pool and input-hash caching
+
+Shared by the YC tracker, the job market analyzer and the funding
+analyzer. A chart is a module-level draw function plus the aggregates
+it plots; a PNG is only redrawn when a hash of those inputs changes.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+
+
+MANIFEST = '.chart_hashes.json'
+
+
+def chart_hash(draw, data, figsize, dpi, options):
+    """Hash of a chart's draw code and inputs"""
+    digest = hashlib.sha256()
+    digest.update(draw.__qualname__.encode())
+    digest.update(marshal.dumps(draw.__code__))
+    digest.update(pickle.dumps((data, figsize, dpi, sorted(options.items())), protocol=4))
+    return digest.hexdigest()
+
+
+def render_chart(path, draw, data, figsize, dpi, options):
+    """
+    Draw one chart on a standalone Figure and save it
+
+    The Figure is never registered with pyplot, so nothing accumulates in
+    global state; it is cleared once saved.
+    """
+    fig = Figure(figsize=figsize)
+    try:
+        draw(fig, data, **options)
+        fig.tight_layout()
+        fig.savefig(path, dpi=dpi)
+    finally:
+        fig.clear()
+    return path
+
+
+class ChartRenderer:
+    """Renders charts to an output directory, skipping charts whose inputs are unchanged"""
+
+    def __init__(self, output_dir='visualizations', dpi=300, workers=None, force=False):
+        """
+        Args:
+            output_dir: Directory for PNGs and the hash manifest
+            dpi: Output resolution
+            workers: Processes for batched rendering (None uses every CPU, 0 or 1 renders serially)
+            force: Redraw every chart even if its inputs are unchanged
+        """
+        self.output_dir = output_dir
+        self.dpi = dpi
+        self.workers = os.cpu_count() if workers is None else workers
+        self.force = force
+        self.stats = {'rendered': 0, 'skipped': 0}
+        self._pending = None
+
+    def _manifest_path(self):
+        return os.path.join(self.output_dir, MANIFEST)
+
+    def _load_manifest(self):
+        try:
+            with open(self._manifest_path()) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @contextmanager
+    def batch(self):
+        """Collect charts added inside the block and render them together on exit"""
+        self._pending = []
+        try:
+            yield self
+            pending = self._pending
+        finally:
+            self._pending = None
+        self.render(pending)
+
+    def add(self, filename, draw, data, figsize=(12, 6), **options):
+        """
+        Render a chart, or queue it when inside batch()
+
+        Args:
+            filename: PNG name within output_dir
+            draw: Module-level function draw(fig, data, **options) that plots on a Figure
+            data: Aggregates the chart plots (must pickle)
+            figsize: Figure size in inches
+            **options: Passed to draw
+        """
+        chart = (filename, draw, data, figsize, options)
+        if self._pending is not None:
+            self._pending.append(chart)
+        else:
+            self.render([chart])
+
+    def render(self, charts):
+        """
+        Render charts whose input hash differs from the last render
+
+        Returns:
+            Dict of filename -> 'rendered' or 'skipped'
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = self._load_manifest()
+
+        results, jobs, hashes = {}, [], {}
+        for filename, draw, data, figsize, options in charts:
+            path = os.path.join(self.output_dir, filename)
+            digest = chart_hash(draw, data, figsize, self.dpi, options)
+            if not self.force and manifest.get(filename) == digest and os.path.exists(path):
+                results[filename] = 'skipped'
+                print(f"Unchanged visualization: {path}")
+                continue
+            hashes[filename] = digest
+            jobs.append((path, draw, data, figsize, self.dpi, options))
+
+        if self.workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+                paths = list(pool.map(render_chart, *zip(*jobs)))
+        else:
+            paths = [render_chart(*job) for job in jobs]
+
+        for path in paths:
+            filename = os.path.basename(path)
+            results[filename] = 'rendered'
+            print(f"Saved visualization: {path}")
+
+        if jobs:
+            # Re-read so concurrent renderers sharing the directory keep each other's entries
+            merged = {**self._load_manifest(), **hashes}
+            with open(self._manifest_path(), 'w') as f:
+                json.dump(merged, f, indent=2, sort_keys=True)
+
+        self.stats['rendered'] += len(jobs)
+        self.stats['skipped'] += len(results) - len(jobs)
+        return results
@@ -0,0 +1,332 @@
+"""
+Near-Duplicate Detection
+MinHash signatures with LSH banding, so near-duplicates are found without comparing every pair
+
+Shared by the YC tracker and the job market scraper. Directory pages and
+job boards list the same entity several times with small text changes
+(casing, punctuation, an edited word), which inflates every count
+downstream. Each record is reduced to a MinHash signature of its word
+shingles. Records that agree on every row of at least one LSH band become
+candidates, and a candidate is kept as a duplicate only when its estimated
+Jaccard similarity reaches the threshold.
+
+Two optional checks guard against distinct records that share most of
+their text. Key fields are stable fields that must match exactly, such as
+a posting's company. A name field (a job title or startup name) is compared
+fuzzily: seniority words must match, so a "Senior" and a "Staff" opening
+with the same boilerplate description stay apart, while the other words
+only need to overlap. "Sr. Data Analyst (Remote)" still matches
+"Senior Data Analyst".
+"""
+
+import re
+import time
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+LEGAL_SUFFIXES = {'inc', 'incorporated', 'llc', 'ltd', 'corp', 'corporation'}
+LEVEL_WORDS = frozenset({
+    'intern', 'junior', 'associate', 'mid', 'senior', 'staff', 'lead', 'principal',
+    'distinguished', 'head', 'director', 'ii', 'iii', 'iv'
+})
+ABBREVIATIONS = {'sr': 'senior', 'snr': 'senior', 'jr': 'junior', 'mgr': 'manager', 'eng': 'engineer', 'engr': 'engineer'}
+MAX_U32 = np.iinfo(np.uint32).max
+SHINGLE_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def shingle_hashes(texts, shingle_size=2):
+    """
+    64-bit hashes of every text's word shingles
+
+    Text is lowercased and split on anything that is not a letter or digit.
+    A text shorter than shingle_size words is a single shingle; a text with
+    no words has none.
+
+    Returns:
+        (hashes, counts): shingle hashes of all texts in order, and the number per text
+    """
+    tokens = [TOKEN_PATTERN.findall(text.lower()) if isinstance(text, str) else [] for text in texts]
+    lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+    words = pd.util.hash_array(np.array(list(chain.from_iterable(tokens)), dtype=object))
+    words = np.append(words, np.zeros(shingle_size, dtype=np.uint64))
+
+    counts = np.where(lengths > 0, np.maximum(lengths - shingle_size + 1, 1), 0)
+    doc = np.repeat(np.arange(len(lengths)), counts)
+    position = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    first_word = np.repeat(np.cumsum(lengths) - lengths, counts) + position
+
+    hashes = np.zeros(len(doc), dtype=np.uint64)
+    for offset in range(shingle_size):
+        word = np.where(position + offset < lengths[doc], words[first_word + offset], np.uint64(0))
+        hashes = hashes * SHINGLE_MULTIPLIER + word
+    return hashes, counts
+
+
+def normalize_key(value):
+    """Lowercased words of a key field without a trailing legal suffix ('Acme Health, Inc.' -> 'acme health')"""
+    words = TOKEN_PATTERN.findall(str(value or '').lower())
+    while words and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+def record_keys(records, key_fields):
+    """Normalized key of every record: its key field values joined, so records can only merge when all of them match"""
+    return ['\x1f'.join(normalize_key(record.get(field)) for field in key_fields) for record in records]
+
+
+def name_words(name, ignore=()):
+    """
+    Seniority and other words of a title or name, for comparing edited names
+
+    Words are lowercased, abbreviations are expanded ('Sr.' -> 'senior'), and
+    legal suffixes and words in ignore are dropped, so "Data Analyst, Sr. (Remote)" with
+    'remote' ignored gives ({'senior'}, {'data', 'analyst'}).
+
+    Returns:
+        (levels, words): frozensets of seniority words and of the remaining words
+    """
+    words = {ABBREVIATIONS.get(word, word) for word in TOKEN_PATTERN.findall(str(name or '').lower())}
+    words.difference_update(LEGAL_SUFFIXES, ignore)
+    return frozenset(words & LEVEL_WORDS), frozenset(words - LEVEL_WORDS)
+
+
+def record_names(records, name_field, ignore=(), ignore_fields=()):
+    """name_words of every record's name, also ignoring the words of its ignore_fields (e.g. its location)"""
+    return [
+        name_words(record.get(name_field), set(ignore).union(
+            *(TOKEN_PATTERN.findall(str(record.get(field) or '').lower()) for field in ignore_fields)
+        ))
+        for record in records
+    ]
+
+
+def name_similarity(a, b):
+    """Jaccard similarity of two word sets from name_words (1.0 when both are empty)"""
+    union = len(a | b)
+    return len(a & b) / union if union else 1.0
+
+
+def lsh_params(threshold, num_perm, false_positive_weight=0.5):
+    """
+    Bands and rows per band for a similarity threshold
+
+    Picks the split of num_perm signature rows whose candidate probability
+    curve, 1 - (1 - s^rows)^bands, has the smallest weighted area of false
+    positives below the threshold and false negatives above it.
+    """
+    similarity = np.linspace(0, 1, 1001)
+    step = similarity[1]
+    below = similarity < threshold
+    best, best_error = (1, num_perm), float('inf')
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            candidate = 1 - (1 - similarity ** rows) ** bands
+            false_positives = candidate[below].sum() * step
+            false_negatives = (1 - candidate[~below]).sum() * step
+            error = false_positive_weight * false_positives + (1 - false_positive_weight) * false_negatives
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+def connected_components(n, left, right):
+    """
+    Component labels of an undirected graph on n nodes, each labelled by its lowest node
+
+    Roots are hooked onto the lower root of every edge and paths are then
+    compressed, repeated until every edge joins two nodes with the same label.
+    """
+    labels = np.arange(n)
+    while len(left):
+        low = np.minimum(labels[left], labels[right])
+        np.minimum.at(labels, labels[left], low)
+        np.minimum.at(labels, labels[right], low)
+        while True:
+            parents = labels[labels]
+            if np.array_equal(parents, labels):
+                break
+            labels = parents
+        if np.array_equal(labels[left], labels[right]):
+            break
+    return labels
+
+
+class NearDuplicateDetector:
+    """Clusters near-duplicate texts with MinHash and LSH"""
+
+    def __init__(self, threshold=0.7, num_perm=128, shingle_size=2, bands=None, seed=1, chunk_size=50000,
+                 name_threshold=0.5):
+        """
+        Args:
+            threshold: Estimated Jaccard similarity of word shingles at which two texts are duplicates
+            name_threshold: Jaccard similarity of non-seniority name words at which two names match
+            num_perm: MinHash permutations (signature length); more is more accurate and slower
+            shingle_size: Words per shingle (smaller is more tolerant of edits in short texts)
+            bands: LSH bands (rows per band is num_perm // bands); chosen from threshold if None
+            seed: Seed for the permutation hashes, so signatures are reproducible
+            chunk_size: Texts hashed at a time, bounding memory on large inputs
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        if bands is None:
+            self.bands, self.rows = lsh_params(threshold, num_perm)
+        else:
+            self.bands, self.rows = bands, num_perm // bands
+        if not self.rows:
+            raise ValueError("bands must not exceed num_perm")
+        self.chunk_size = chunk_size
+        self.name_threshold = name_threshold
+
+        # Multiply-shift hashes: the top 32 bits of a * x + b, wrapping at 64 bits
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self._band_multipliers = rng.integers(0, 2 ** 63, self.rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.stats = {}
+
+    def signatures(self, texts):
+        """
+        MinHash signature of every text
+
+        Returns:
+            uint32 array of shape (len(texts), num_perm); texts without words are all MAX_U32
+        """
+        texts = list(texts)
+        signatures = np.full((len(texts), self.num_perm), MAX_U32, dtype=np.uint32)
+        for start in range(0, len(texts), self.chunk_size):
+            hashes, counts = shingle_hashes(texts[start:start + self.chunk_size], self.shingle_size)
+            if not len(hashes):
+                continue
+            nonempty = np.flatnonzero(counts)
+            offsets = (np.cumsum(counts) - counts)[nonempty]
+            block = np.empty((self.num_perm, len(nonempty)), dtype=np.uint32)
+            for perm in range(self.num_perm):
+                permuted = ((self._a[perm] * hashes + self._b[perm]) >> np.uint64(32)).astype(np.uint32)
+                block[perm] = np.minimum.reduceat(permuted, offsets)
+            signatures[start + nonempty] = block.T
+        return signatures
+
+    def candidate_pairs(self, signatures, key_codes=None):
+        """
+        Index pairs (first, other) sharing at least one LSH band
+
+        Within each band, texts with identical rows are paired with the
+        first of them, so the pair count grows with the number of
+        duplicates rather than with the square of their group size. With
+        key_codes, the code is hashed into every band, so texts are only
+        paired with texts of the same key.
+        """
+        indexes = np.flatnonzero(signatures[:, 0] != MAX_U32)
+        left, right = [], []
+        for band in range(self.bands):
+            rows = signatures[indexes, band * self.rows:(band + 1) * self.rows].astype(np.uint64)
+            keys = rows[:, 0]
+            for row in range(1, self.rows):
+                keys = keys * self._band_multipliers[row] + rows[:, row]
+            if key_codes is not None:
+                keys = keys * self._band_multipliers[0] + key_codes[indexes].astype(np.uint64)
+
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            starts = np.empty(len(order), dtype=bool)
+            starts[:1] = True
+            np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=starts[1:])
+            first = order[starts][np.cumsum(starts) - 1]
+            left.append(indexes[first[~starts]])
+            right.append(indexes[order[~starts]])
+
+        if not left:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        pairs = np.unique(np.concatenate(left) * len(signatures) + np.concatenate(right))
+        return pairs // len(signatures), pairs % len(signatures)
+
+    def similarity(self, signatures, left, right, batch_size=100000):
+        """Estimated Jaccard similarity of each (left, right) pair: the fraction of equal signature rows"""
+        similarity = np.empty(len(left))
+        for start in range(0, len(left), batch_size):
+            end = start + batch_size
+            similarity[start:end] = (signatures[left[start:end]] == signatures[right[start:end]]).mean(axis=1)
+        return similarity
+
+    def clusters(self, texts, keys=None, names=None):
+        """
+        Near-duplicate cluster of every text
+
+        Args:
+            texts: Texts to cluster
+            keys: Optional key per text; a candidate pair is only merged when both keys are equal
+            names: Optional (levels, words) per text from name_words; a candidate pair is only
+                merged when the levels are equal and the words reach name_threshold
+
+        Returns:
+            Array where element i is the index of the first text in i's cluster
+            (i itself when text i has no earlier near-duplicate)
+        """
+        started = time.perf_counter()
+        signatures = self.signatures(texts)
+        hashed = time.perf_counter()
+        if keys is None and names is None:
+            left, right = self.candidate_pairs(signatures)
+        else:
+            # Keys and seniority must match exactly, so they partition the LSH buckets
+            groups = [''] * len(signatures) if keys is None else list(keys)
+            if names is not None:
+                groups = [f"{group}\x1e{' '.join(sorted(levels))}" for group, (levels, _) in zip(groups, names)]
+            codes = pd.factorize(np.asarray(groups, dtype=object))[0]
+            left, right = self.candidate_pairs(signatures, codes)
+            # Band hashes of different groups can still collide
+            same_group = codes[left] == codes[right]
+            left, right = left[same_group], right[same_group]
+
+        candidates = len(left)
+        similar = self.similarity(signatures, left, right) >= self.threshold
+        left, right = left[similar], right[similar]
+        if names is not None and len(left):
+            similar_names = np.fromiter(
+                (name_similarity(names[a][1], names[b][1]) >= self.name_threshold
+                 for a, b in zip(left.tolist(), right.tolist())),
+                dtype=bool,
+                count=len(left)
+            )
+            left, right = left[similar_names], right[similar_names]
+        labels = connected_components(len(signatures), left, right)
+        finished = time.perf_counter()
+
+        self.stats = {
+            'texts': len(signatures),
+            'candidates': candidates,
+            'duplicates': int((labels != np.arange(len(labels))).sum()),
+            'signature_seconds': hashed - started,
+            'lsh_seconds': finished - hashed
+        }
+        return labels
+
+    def deduplicate(self, records, fields, key_fields=(), name_field=None, name_ignore=(), name_ignore_fields=()):
+        """
+        Drop records that near-duplicate an earlier record
+
+        Args:
+            records: List of dicts
+            fields: Keys whose values are joined into each record's text
+            key_fields: Stable keys that must match (after normalize_key) before two records can merge
+            name_field: Key of a title or name that must match fuzzily (see name_words)
+            name_ignore: Words dropped from every name, e.g. ('remote',)
+            name_ignore_fields: Keys whose words are dropped from the record's own name,
+                e.g. ('location',) so "Data Analyst - Boston, MA" matches "Data Analyst"
+
+        Returns:
+            The first record of every cluster, in the original order
+        """
+        texts = [' '.join(str(record.get(field) or '') for field in fields) for record in records]
+        keys = record_keys(records, key_fields) if key_fields else None
+        names = record_names(records, name_field, name_ignore, name_ignore_fields) if name_field else None
+        labels = self.clusters(texts, keys, names)
+        return [record for index, (record, label) in enumerate(zip(records, labels)) if index == label]
@@ -0,0 +1,180 @@
+"""
+Card Extraction Layer
+Compiled per-field selectors for listing cards, with an lxml backend and process-pool extraction
+
+Shared by the YC tracker and the job market scraper; each scraper declares
+its card and field specs and shares this extraction path.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+BACKENDS = ('lxml', 'bs4-lxml', 'bs4')
+
+
+def _class_predicate(css_class):
+    """XPath predicate matching one class in a space-separated class attribute"""
+    if not css_class:
+        return ''
+    return f"[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]"
+
+
+def resolve_backend(backend='auto'):
+    """Pick the fastest available backend for 'auto'"""
+    if backend == 'auto':
+        return 'lxml' if HAS_LXML else 'bs4'
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown extraction backend {backend!r}; expected one of {BACKENDS}")
+    if backend != 'bs4' and not HAS_LXML:
+        raise ImportError(f"Backend {backend!r} requires lxml")
+    return backend
+
+
+class CardExtractor:
+    """Extracts one dict per card from listing HTML with a single lookup per field"""
+
+    def __init__(self, card, fields, backend='auto'):
+        """
+        Compile the selectors
+
+        Args:
+            card: (tag, class) of the card element
+            fields: List of (field, tag, class, value) where value is 'text'
+                (first match's text), 'texts' (text of every match) or
+                '@attr' (attribute of the first match); class may be None
+            backend: 'lxml' (compiled card XPath and a per-tag field dispatch
+                table), 'bs4-lxml' (BeautifulSoup on the lxml parser), 'bs4'
+                (BeautifulSoup on html.parser) or 'auto'
+        """
+        self.card = card
+        self.fields = fields
+        self.backend = resolve_backend(backend)
+
+        if self.backend == 'lxml':
+            tag, css_class = card
+            self._card_xpath = etree.XPath(f"//{tag}{_class_predicate(css_class)}")
+
+            # Fields keyed by tag, so one walk over a card's descendants fills every field
+            self._fields_by_tag = {}
+            for field, tag, css_class, value in fields:
+                self._fields_by_tag.setdefault(tag, []).append((field, css_class, value))
+
+    def __getstate__(self):
+        # Compiled XPath objects do not pickle; worker processes recompile
+        return {'card': self.card, 'fields': self.fields, 'backend': self.backend}
+
+    def __setstate__(self, state):
+        self.__init__(state['card'], state['fields'], state['backend'])
+
+    def extract(self, html):
+        """
+        Extract every card on a page
+
+        Args:
+            html: Page HTML as str or bytes
+
+        Returns:
+            List of dicts, one per card, keyed by field name (missing fields are
+            None, or [] for 'texts' fields)
+        """
+        if self.backend == 'lxml':
+            return self._extract_lxml(html)
+        return self._extract_bs4(html)
+
+    def _extract_lxml(self, html):
+        if not html or not html.strip():
+            return []
+        root = lxml.html.fromstring(html)
+
+        records = []
+        for card in self._card_xpath(root):
+            record = {field: [] if value == 'texts' else None for field, _, _, value in self.fields}
+            found = set()
+            for element in card.iterdescendants():
+                specs = self._fields_by_tag.get(element.tag)
+                if specs is None:
+                    continue
+                classes = element.get('class', '').split()
+                for field, css_class, value in specs:
+                    if css_class is not None and css_class not in classes:
+                        continue
+                    if value == 'texts':
+                        record[field].append(element.text_content().strip())
+                    elif field not in found:
+                        found.add(field)
+                        record[field] = element.text_content().strip() if value == 'text' else element.get(value[1:])
+            records.append(record)
+        return records
+
+    def _extract_bs4(self, html):
+        soup = BeautifulSoup(html, 'lxml' if self.backend == 'bs4-lxml' else 'html.parser')
+        tag, css_class = self.card
+
+        records = []
+        for card in soup.find_all(tag, class_=css_class):
+            record = {}
+            for field, tag, css_class, value in self.fields:
+                if value == 'texts':
+                    record[field] = [match.text.strip() for match in card.find_all(tag, class_=css_class)]
+                    continue
+                match = card.find(tag, class_=css_class)
+                if match is None:
+                    record[field] = None
+                elif value == 'text':
+                    record[field] = match.text.strip()
+                else:
+                    record[field] = match.get(value[1:])
+            records.append(record)
+        return records
+
+    def extract_many(self, pages, workers=None, chunksize=8):
+        """
+        Extract cards from many pages, optionally across processes
+
+        Args:
+            pages: Iterable of page HTML
+            workers: Worker processes (None or 0 extracts in this process)
+            chunksize: Pages sent to a worker per task
+
+        Returns:
+            List with one list of records per page, in input order
+        """
+        if not workers:
+            return [self.extract(html) for html in pages]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.extract, pages, chunksize=chunksize))
+
+
+def benchmark(pages, cases, repeats=3):
+    """
+    Time extraction functions over the same pages
+
+    Args:
+        pages: List of page HTML
+        cases: Dict of name -> function taking the page list
+        repeats: Timed runs per case (best is reported)
+
+    Returns:
+        Dict of name -> {'seconds', 'pages_per_second', 'cards'}
+    """
+    results = {}
+    for name, run in cases.items():
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            output = run(pages)
+            best = min(best, time.perf_counter() - start)
+        cards = sum(len(page) for page in output)
+        results[name] = {'seconds': best, 'pages_per_second': len(pages) / best, 'cards': cards}
+        print(f"{name:<28} {best * 1000:>9.1f} ms  {len(pages) / best:>9.1f} pages/sec  {cards:>7,} cards")
+    return results
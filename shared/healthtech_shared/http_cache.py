@@ -0,0 +1,269 @@
+"""
+On-Disk HTTP Response Cache
+Compressed, size-bounded SQLite cache with conditional revalidation (ETag / Last-Modified)
+
+Shared by the YC tracker and the job market scraper; both default to one
+cache directory so a page fetched by either is reused by both.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'HTTP_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'ai-healthtech-scrapers')
+)
+
+# Response headers kept with a cached body
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control')
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a URL is not cached"""
+
+
+class CachedResponse:
+    """A cached response body and its validators"""
+
+    def __init__(self, key, url, status, headers, body, stored_at):
+        self.key = key
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+
+    @property
+    def text(self):
+        return self.body.decode('utf-8', errors='replace')
+
+    @property
+    def etag(self):
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self):
+        return self.headers.get('Last-Modified')
+
+
+class HTTPCache:
+    """SQLite-backed response cache with TTL, LRU eviction and zlib-compressed bodies"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=3600, max_bytes=512 * 1024 ** 2,
+                 offline=False, compression_level=6):
+        """
+        Open (or create) the cache
+
+        Args:
+            cache_dir: Directory holding http_cache.db
+            ttl: Seconds a response is served without revalidation
+            max_bytes: Bound on compressed body bytes; least recently used entries go first
+            offline: Serve only from the cache and never touch the network
+            compression_level: zlib level for stored bodies
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'http_cache.db')
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.compression_level = compression_level
+
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self.conn.commit()
+
+        # Upper bound on stored bytes; the exact total is only summed when this exceeds max_bytes
+        self._total = self.size()[1]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def key(url, params=None):
+        """Canonical cache key: the URL with params merged in and the query sorted"""
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if params:
+            for name, value in params.items():
+                values = value if isinstance(value, (list, tuple)) else [value]
+                query.extend((name, str(v)) for v in values)
+        return urlunsplit(parts._replace(query=urlencode(sorted(query)), fragment=''))
+
+    def get(self, url, params=None):
+        """Return the cached response for a URL (fresh or stale), or None"""
+        key = self.key(url, params)
+        row = self.conn.execute(
+            "SELECT url, status, headers, body, stored_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        url, status, headers, body, stored_at = row
+        return CachedResponse(key, url, status, json.loads(headers), zlib.decompress(body), stored_at)
+
+    def is_fresh(self, entry):
+        """True if the entry is younger than the TTL"""
+        return time.time() - entry.stored_at < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        """If-None-Match / If-Modified-Since headers for revalidating an entry"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url, params, status, headers, body):
+        """
+        Cache a 200 response body
+
+        Responses marked Cache-Control: no-store are skipped.
+
+        Returns:
+            The CachedResponse, or None if it was not cacheable
+        """
+        headers = {name: headers[name] for name in STORED_HEADERS if headers.get(name) is not None}
+        if status != 200 or 'no-store' in headers.get('Cache-Control', ''):
+            return None
+
+        key = self.key(url, params)
+        compressed = zlib.compress(body, self.compression_level)
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, url, status, headers, body, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, url, status, json.dumps(headers), compressed, len(compressed), now, now)
+        )
+        self.conn.commit()
+        self.stats['stored'] += 1
+        self._total += len(compressed)
+        if self._total > self.max_bytes:
+            self.evict()
+        return CachedResponse(key, url, status, headers, body, now)
+
+    def revalidated(self, entry, headers=None):
+        """Restart an entry's TTL after a 304, taking any updated validators"""
+        for name in STORED_HEADERS:
+            if headers and headers.get(name) is not None:
+                entry.headers[name] = headers[name]
+        entry.stored_at = time.time()
+        self.conn.execute(
+            "UPDATE responses SET headers = ?, stored_at = ?, accessed_at = ? WHERE key = ?",
+            (json.dumps(entry.headers), entry.stored_at, entry.stored_at, entry.key)
+        )
+        self.conn.commit()
+        self.stats['revalidated'] += 1
+        return entry
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self.size()[1]
+        if total <= self.max_bytes:
+            self._total = total
+            return 0
+
+        evicted = 0
+        rows = self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+
+        self.conn.commit()
+        self._total = total
+        self.stats['evicted'] += evicted
+        return evicted
+
+    def size(self):
+        """Tuple of (entries, compressed bytes)"""
+        return self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    def lookup(self, url, params=None):
+        """
+        Check the cache before a request
+
+        Returns:
+            Tuple of (entry, fresh). A fresh entry can be served as is; a
+            stale one should be revalidated with conditional_headers(entry).
+
+        Raises:
+            CacheMiss: In offline mode when the URL is not cached
+        """
+        entry = self.get(url, params)
+        if entry is None:
+            if self.offline:
+                raise CacheMiss(f"Not cached (offline mode): {self.key(url, params)}")
+            self.stats['misses'] += 1
+            return None, False
+
+        fresh = self.offline or self.is_fresh(entry)
+        if fresh:
+            self.stats['hits'] += 1
+        return entry, fresh
+
+
+def cached_get(session, cache, url, params=None, **kwargs):
+    """
+    GET through the cache with a requests.Session
+
+    Args:
+        session: requests.Session
+        cache: HTTPCache, or None to bypass caching
+        url: URL to fetch
+        params: Query parameters
+        **kwargs: Passed to session.get (headers, timeout, ...)
+
+    Returns:
+        Response body as text
+    """
+    if cache is None:
+        response = session.get(url, params=params, **kwargs)
+        response.raise_for_status()
+        return response.text
+
+    entry, fresh = cache.lookup(url, params)
+    if fresh:
+        return entry.text
+
+    headers = {**kwargs.pop('headers', {}), **cache.conditional_headers(entry)}
+    response = session.get(url, params=params, headers=headers, **kwargs)
+    if response.status_code == 304 and entry is not None:
+        return cache.revalidated(entry, response.headers).text
+
+    response.raise_for_status()
+    cache.store(url, params, response.status_code, response.headers, response.content)
+    return response.text